@@ -3,19 +3,14 @@ from __future__ import annotations
 import pandas as pd
 import streamlit as st
 
-from infralens.commands import ExecutionConfig, build_execution_templates
+from infralens.commands import ExecutionConfig
 from infralens.data import Workload, default_workloads, sample_scenarios, workloads_for_scenario
-from infralens.i18n import localize_findings, localize_recommendation, localize_severity
-from infralens.llm import (
-    generate_bottleneck_analysis,
-    generate_recommendation_narrative,
-    list_provider_models,
-)
-from infralens.parsers import parse_uploaded_telemetry
-from infralens.report import build_pdf_report
-from infralens.rules import build_placement_recommendation, detect_bottlenecks
-from infralens.scoring import calculate_efficiency_score, infer_workload_profile
+from infralens.i18n import localize_severity
+from infralens.llm import list_provider_models
+from infralens.parse_cache import parse_uploaded_telemetry_cached
+from infralens.pipeline import AnalysisPipeline
 from infralens.metrics import collect_success_metrics, load_recent_metrics
+from infralens.tracing import disable_tracing, enable_tracing, reset_trace, trace_breakdown, tracing_enabled
 from infralens.validation import validate_execution_settings
 
 
@@ -54,7 +49,7 @@ I18N = {
         "analysis_help_ui": "LLM 또는 fallback으로 생성된 원인 설명입니다.",
         "placement": "최적 배치 제안",
         "placement_help": "추천은 작업을 어떤 GPU/NUMA에 배치하면 더 효율적인지 제시합니다.",
-        "expected": "예상 개선: 활용률 {before}% -> {after}%, 학습 +{train}%, 추론 레이턴시 -{lat}%",
+        "expected": "예상 개선: 활용률 {before}% -> {after}%, 학습 {train}%, 추론 레이턴시 {lat}%",
         "narrative": "추천 설명",
         "narrative_help": "추천 배치를 왜 제안했는지 자연어로 설명합니다.",
         "exec_title": "실행 가능한 명령어 템플릿",
@@ -100,6 +95,10 @@ I18N = {
         "metrics_log_path": "로그 파일",
         "metrics_compare": "전/후 비교 요약",
         "metrics_no_compare": "전/후 데이터가 아직 부족합니다.",
+        "metrics_trace_title": "단계별 실행 시간 (트레이스)",
+        "metrics_trace_enable": "실행 시간 트레이스 수집",
+        "metrics_trace_empty": "아직 수집된 트레이스가 없습니다. 분석을 실행하면 단계별 시간이 표시됩니다.",
+        "metrics_trace_reset": "트레이스 초기화",
         "metrics_report_download": "전/후 비교 리포트 다운로드(.md)",
         "metrics_report_title": "성공지표 전/후 비교 리포트",
         "metrics_desc_response": "응답시간: 낮을수록 좋습니다. score는 점수 계산 시간, analysis_pipeline은 병목탐지+추천 생성 시간입니다.",
@@ -167,7 +166,7 @@ I18N = {
         "analysis_help_ui": "Cause explanation generated by LLM or fallback.",
         "placement": "Optimal Placement Recommendation",
         "placement_help": "Recommendations suggest where to place each task for better efficiency.",
-        "expected": "Expected improvement: Utilization {before}% -> {after}%, Training +{train}%, Inference Latency -{lat}%",
+        "expected": "Expected improvement: Utilization {before}% -> {after}%, Training {train}%, Inference Latency {lat}%",
         "narrative": "Recommendation Narrative",
         "narrative_help": "Natural-language explanation of why the placement was recommended.",
         "exec_title": "Executable Command Templates",
@@ -213,6 +212,10 @@ I18N = {
         "metrics_log_path": "Log file",
         "metrics_compare": "Before/After Summary",
         "metrics_no_compare": "Not enough before/after records yet.",
+        "metrics_trace_title": "Per-stage Timing (Trace)",
+        "metrics_trace_enable": "Collect timing traces",
+        "metrics_trace_empty": "No spans recorded yet. Run an analysis to see per-stage timings.",
+        "metrics_trace_reset": "Reset trace",
         "metrics_report_download": "Download Before/After Report (.md)",
         "metrics_report_title": "Success Metrics Before/After Report",
         "metrics_desc_response": "Response time: lower is better. score is score-calculation time, analysis_pipeline is bottleneck+recommendation generation time.",
@@ -280,7 +283,7 @@ I18N = {
         "analysis_help_ui": "由 LLM 或 fallback 生成的原因说明。",
         "placement": "最优部署建议",
         "placement_help": "推荐会给出任务应放在哪些 GPU/NUMA 上更高效。",
-        "expected": "预期改善：利用率 {before}% -> {after}%，训练 +{train}%，推理时延 -{lat}%",
+        "expected": "预期改善：利用率 {before}% -> {after}%，训练 {train}%，推理时延 {lat}%",
         "narrative": "建议说明",
         "narrative_help": "对推荐部署方案给出自然语言解释。",
         "exec_title": "可执行命令模板",
@@ -326,6 +329,10 @@ I18N = {
         "metrics_log_path": "日志文件",
         "metrics_compare": "前后对比摘要",
         "metrics_no_compare": "前后记录不足，无法比较。",
+        "metrics_trace_title": "分阶段耗时（追踪）",
+        "metrics_trace_enable": "采集耗时追踪",
+        "metrics_trace_empty": "尚无追踪记录。运行分析后将显示各阶段耗时。",
+        "metrics_trace_reset": "重置追踪",
         "metrics_report_download": "下载前后对比报告(.md)",
         "metrics_report_title": "成功指标前后对比报告",
         "metrics_desc_response": "响应时间：越低越好。score 是评分计算时间，analysis_pipeline 是瓶颈检测+推荐生成时间。",
@@ -437,7 +444,7 @@ with st.sidebar:
             try:
                 topo_text = topo_upload.getvalue().decode("utf-8", errors="ignore") if topo_upload else None
                 numa_text = numa_upload.getvalue().decode("utf-8", errors="ignore") if numa_upload else None
-                scenario = parse_uploaded_telemetry(
+                scenario = parse_uploaded_telemetry_cached(
                     upload.name,
                     upload.getvalue(),
                     topo_text=topo_text,
@@ -624,6 +631,8 @@ if SHOW_SUCCESS_METRICS:
                         f"- score_p95: {b['response_time_sec']['score_p95']:.6f} -> {a['response_time_sec']['score_p95']:.6f}",
                         f"- analysis_pipeline_avg: {b['response_time_sec']['analysis_pipeline_avg']:.6f} -> {a['response_time_sec']['analysis_pipeline_avg']:.6f}",
                         f"- analysis_pipeline_p95: {b['response_time_sec']['analysis_pipeline_p95']:.6f} -> {a['response_time_sec']['analysis_pipeline_p95']:.6f}",
+                        f"- score_p99: {b['response_time_sec'].get('score_p99', 0.0):.6f} -> {a['response_time_sec'].get('score_p99', 0.0):.6f}",
+                        f"- analysis_pipeline_p99: {b['response_time_sec'].get('analysis_pipeline_p99', 0.0):.6f} -> {a['response_time_sec'].get('analysis_pipeline_p99', 0.0):.6f}",
                         "",
                         "## Test Pass Rate",
                         f"- pass_rate: {b['test_pass_rate']['pass_rate']:.6f} -> {a['test_pass_rate']['pass_rate']:.6f}",
@@ -646,6 +655,25 @@ if SHOW_SUCCESS_METRICS:
             else:
                 st.info(t.get("metrics_no_compare", "Not enough before/after records yet."))
 
+        st.markdown(f"**{t.get('metrics_trace_title', 'Per-stage Timing (Trace)')}**")
+        trace_on = st.checkbox(
+            t.get("metrics_trace_enable", "Collect timing traces"),
+            value=tracing_enabled(),
+            key="metrics_trace_enable_chk",
+        )
+        if trace_on and not tracing_enabled():
+            enable_tracing()
+        elif not trace_on and tracing_enabled():
+            disable_tracing()
+        breakdown = trace_breakdown()
+        if breakdown:
+            st.dataframe(pd.DataFrame(breakdown), use_container_width=True)
+            if st.button(t.get("metrics_trace_reset", "Reset trace"), key="metrics_trace_reset_btn"):
+                reset_trace()
+                st.rerun()
+        else:
+            st.caption(t.get("metrics_trace_empty", "No spans recorded yet."))
+
 st.subheader(t["workload"])
 st.caption(t.get("workload_help", ""))
 if "workloads" not in st.session_state:
@@ -702,14 +730,11 @@ if exec_validation_errors:
     st.warning(t.get("exec_validation_prefix", "Execution settings check") + ": " + " | ".join(exec_validation_errors))
 
 analyze_clicked = st.button(t["analyze"], type="primary", disabled=(scenario is None or bool(exec_validation_errors)))
-if analyze_clicked:
-    profile = infer_workload_profile(workloads)
-    score = calculate_efficiency_score(scenario, profile=profile)
-    findings_raw = detect_bottlenecks(scenario, workloads, profile=profile)
-    recommendation_raw = build_placement_recommendation(scenario, workloads, score.score, profile=profile)
-    findings = localize_findings(findings_raw, lang)
-    recommendation = localize_recommendation(recommendation_raw, lang)
+if "analysis_pipeline" not in st.session_state:
+    st.session_state.analysis_pipeline = AnalysisPipeline()
+pipeline = st.session_state.analysis_pipeline
 
+if analyze_clicked:
     llm_api_key = llm_api_key_input.strip() if llm_enabled else None
     llm_model = llm_model_input.strip() if llm_enabled else None
     llm_loading_placeholder = st.empty()
@@ -718,17 +743,9 @@ if analyze_clicked:
             render_llm_loading(t["llm_working"], t["llm_working_detail"]),
             unsafe_allow_html=True,
         )
-    analysis_text, analysis_source = generate_bottleneck_analysis(
-        findings,
-        score.score,
-        score.grade,
-        language=lang,
-        provider=llm_provider,
-        api_key=llm_api_key or None,
-        model=llm_model or None,
-    )
-    rec_text, rec_source = generate_recommendation_narrative(
-        recommendation,
+    result = pipeline.run(
+        scenario,
+        workloads,
         language=lang,
         provider=llm_provider,
         api_key=llm_api_key or None,
@@ -740,26 +757,19 @@ if analyze_clicked:
         "scenario_name": selected_name,
         "scenario": scenario,
         "workloads": workloads,
-        "score": score,
-        "findings": findings,
-        "analysis_text": analysis_text,
-        "analysis_source": analysis_source,
-        "recommendation": recommendation,
-        "recommendation_raw": recommendation_raw,
-        "rec_text": rec_text,
-        "rec_source": rec_source,
+        "result": result,
     }
 
 payload = st.session_state.get("analysis_payload")
 if payload:
-    score = payload["score"]
-    findings = payload["findings"]
-    analysis_text = payload["analysis_text"]
-    analysis_source = payload["analysis_source"]
-    recommendation = payload["recommendation"]
-    recommendation_raw = payload["recommendation_raw"]
-    rec_text = payload["rec_text"]
-    rec_source = payload["rec_source"]
+    result = payload["result"]
+    score = result.score
+    findings = result.findings
+    analysis_text = result.analysis_text
+    analysis_source = result.analysis_source
+    recommendation = result.recommendation
+    rec_text = result.rec_text
+    rec_source = result.rec_source
     analyzed_scenario = payload["scenario"]
     analyzed_workloads = payload["workloads"]
     analyzed_scenario_name = payload["scenario_name"]
@@ -796,8 +806,8 @@ if payload:
         t["expected"].format(
             before=recommendation.expected_util_before,
             after=recommendation.expected_util_after,
-            train=recommendation.expected_training_gain_pct,
-            lat=recommendation.expected_latency_drop_pct,
+            train=f"{recommendation.expected_training_gain_pct:+d}",
+            lat=f"{-recommendation.expected_latency_drop_pct:+d}",
         )
     )
 
@@ -822,10 +832,10 @@ if payload:
             else "docker_gpus_device"
         ),
     )
-    cmd_templates = build_execution_templates(
+    cmd_templates = pipeline.templates(
         analyzed_scenario,
         analyzed_workloads,
-        recommendation_raw,
+        result,
         exec_cfg=exec_cfg,
     )
     if cmd_templates:
@@ -857,19 +867,15 @@ if payload:
 
     st.download_button(
         label=t["pdf"],
-        data=build_pdf_report(
+        data=pipeline.pdf_report(
             scenario_name=analyzed_scenario_name,
-            score=score,
-            findings=findings,
-            analysis_text=analysis_text,
-            recommendation=recommendation,
-            recommendation_text=rec_text,
+            result=result,
             labels=t["report_labels"],
             expected_line=t["expected"].format(
                 before=recommendation.expected_util_before,
                 after=recommendation.expected_util_after,
-                train=recommendation.expected_training_gain_pct,
-                lat=recommendation.expected_latency_drop_pct,
+                train=f"{recommendation.expected_training_gain_pct:+d}",
+                lat=f"{-recommendation.expected_latency_drop_pct:+d}",
             ),
         ),
         file_name="infralens_report.pdf",
@@ -0,0 +1,3 @@
+from infralens.cli import main
+
+raise SystemExit(main())
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from infralens.commands import CommandTemplate, ExecutionConfig, build_execution_templates
+from infralens.data import Workload, default_workloads
+from infralens.parsers import parse_uploaded_telemetry
+from infralens.rules import Finding, RecommendationResult, build_placement_recommendation, detect_bottlenecks
+from infralens.scoring import ScoreResult, calculate_efficiency_score, infer_workload_profile
+
+TELEMETRY_SUFFIXES = (".csv", ".json")
+SIDE_FILE_SUFFIXES = (".txt", ".csv", ".json")
+SIDE_FILE_KINDS = {"topo": "topo", "numactl": "numactl"}
+
+
+@dataclass
+class HostBundle:
+    host: str
+    telemetry_path: str
+    topo_path: str | None = None
+    numactl_path: str | None = None
+
+
+@dataclass
+class HostAnalysis:
+    host: str
+    profile: str = "default"
+    score: ScoreResult | None = None
+    findings: list[Finding] = field(default_factory=list)
+    recommendation: RecommendationResult | None = None
+    templates: list[CommandTemplate] = field(default_factory=list)
+    gpu_count: int = 0
+    elapsed_sec: float = 0.0
+    error: str | None = None
+
+
+def _file_kind(path: Path, host_dir: bool = False) -> tuple[str, str] | None:
+    # Returns (host, kind). Flat files carry the kind as the last dotted part
+    # of the stem (<host>.topo.txt, <host>.numactl.txt); inside a host
+    # directory any "_"/"." token names it (nvidia_smi_topo_m.txt).
+    suffix = path.suffix.lower()
+    if suffix not in SIDE_FILE_SUFFIXES:
+        return None
+    stem = path.stem
+    head, _, marker = stem.rpartition(".")
+    if head and marker.lower() in SIDE_FILE_KINDS:
+        return head, SIDE_FILE_KINDS[marker.lower()]
+    if host_dir:
+        for token in re.split(r"[._]", stem.lower()):
+            if token in SIDE_FILE_KINDS:
+                return stem, SIDE_FILE_KINDS[token]
+    if suffix in TELEMETRY_SUFFIXES:
+        return stem, "telemetry"
+    return None
+
+
+def _bundle_from_dir(host_dir: Path) -> HostBundle | None:
+    found: dict[str, str] = {}
+    for path in sorted(host_dir.iterdir()):
+        if not path.is_file():
+            continue
+        match = _file_kind(path, host_dir=True)
+        if match and match[1] not in found:
+            found[match[1]] = str(path)
+    if "telemetry" not in found:
+        return None
+    return HostBundle(
+        host=host_dir.name,
+        telemetry_path=found["telemetry"],
+        topo_path=found.get("topo"),
+        numactl_path=found.get("numactl"),
+    )
+
+
+def host_for_file(path: str | os.PathLike[str]) -> str:
+    match = _file_kind(Path(path))
+    return match[0] if match else Path(path).stem
+
+
+def discover_host_bundles(directory: str | os.PathLike[str]) -> list[HostBundle]:
+    # Either one subdirectory per host, or flat <host>.csv files with optional
+    # <host>.topo.txt / <host>.numactl.txt siblings.
+    root = Path(directory)
+    if not root.is_dir():
+        raise ValueError(f"Not a directory: {root}")
+
+    bundles: list[HostBundle] = []
+    flat: dict[str, dict[str, str]] = {}
+    for path in sorted(root.iterdir()):
+        if path.is_dir():
+            bundle = _bundle_from_dir(path)
+            if bundle:
+                bundles.append(bundle)
+            continue
+        match = _file_kind(path)
+        if match is None:
+            continue
+        host, kind = match
+        flat.setdefault(host, {}).setdefault(kind, str(path))
+
+    for host, files in flat.items():
+        if "telemetry" not in files:
+            continue
+        bundles.append(
+            HostBundle(
+                host=host,
+                telemetry_path=files["telemetry"],
+                topo_path=files.get("topo"),
+                numactl_path=files.get("numactl"),
+            )
+        )
+    return sorted(bundles, key=lambda b: b.host)
+
+
+def _read_text(path: str | None) -> str | None:
+    if not path:
+        return None
+    return Path(path).read_text(encoding="utf-8", errors="ignore")
+
+
+def analyze_telemetry(
+    host: str,
+    filename: str,
+    raw_bytes: bytes,
+    topo_text: str | None = None,
+    numactl_text: str | None = None,
+    workloads: list[Workload] | None = None,
+    exec_cfg: ExecutionConfig | None = None,
+) -> HostAnalysis:
+    t0 = time.perf_counter()
+    jobs = workloads if workloads is not None else default_workloads()
+    try:
+        scenario = parse_uploaded_telemetry(filename, raw_bytes, topo_text=topo_text, numactl_text=numactl_text)
+        scenario["name"] = host
+        profile = infer_workload_profile(jobs)
+        score = calculate_efficiency_score(scenario, profile=profile)
+        findings = detect_bottlenecks(scenario, jobs, profile=profile)
+        recommendation = build_placement_recommendation(scenario, jobs, score.score, profile=profile)
+        templates = build_execution_templates(scenario, jobs, recommendation, exec_cfg=exec_cfg)
+    except Exception as exc:
+        return HostAnalysis(
+            host=host,
+            elapsed_sec=time.perf_counter() - t0,
+            error=f"{exc.__class__.__name__}: {exc}",
+        )
+
+    return HostAnalysis(
+        host=host,
+        profile=profile,
+        score=score,
+        findings=findings,
+        recommendation=recommendation,
+        templates=templates,
+        gpu_count=len(scenario["gpus"]),
+        elapsed_sec=time.perf_counter() - t0,
+    )
+
+
+def analyze_host_bundle(
+    bundle: HostBundle,
+    workloads: list[Workload] | None = None,
+    exec_cfg: ExecutionConfig | None = None,
+) -> HostAnalysis:
+    t0 = time.perf_counter()
+    try:
+        telemetry = Path(bundle.telemetry_path)
+        raw = telemetry.read_bytes()
+        topo_text = _read_text(bundle.topo_path)
+        numactl_text = _read_text(bundle.numactl_path)
+    except OSError as exc:
+        return HostAnalysis(
+            host=bundle.host,
+            elapsed_sec=time.perf_counter() - t0,
+            error=f"{exc.__class__.__name__}: {exc}",
+        )
+    result = analyze_telemetry(
+        bundle.host,
+        telemetry.name,
+        raw,
+        topo_text=topo_text,
+        numactl_text=numactl_text,
+        workloads=workloads,
+        exec_cfg=exec_cfg,
+    )
+    result.elapsed_sec = time.perf_counter() - t0
+    return result
+
+
+def analyze_host_bundles(
+    bundles: list[HostBundle],
+    workloads: list[Workload] | None = None,
+    exec_cfg: ExecutionConfig | None = None,
+    jobs: int | None = None,
+) -> list[HostAnalysis]:
+    worker = partial(analyze_host_bundle, workloads=workloads, exec_cfg=exec_cfg)
+    max_workers = min(len(bundles), jobs or os.cpu_count() or 1)
+    if max_workers <= 1:
+        return [worker(b) for b in bundles]
+
+    # Several bundles per task amortize pickling; map() keeps input order.
+    chunksize = max(1, len(bundles) // (max_workers * 4))
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(worker, bundles, chunksize=chunksize))
+
+
+def host_analysis_to_dict(result: HostAnalysis) -> dict[str, Any]:
+    return asdict(result)
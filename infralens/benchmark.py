@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import json
+import math
+import platform
+import statistics
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+from infralens.commands import build_execution_templates
+from infralens.parsers import parse_uploaded_telemetry
+from infralens.placement import solve_fleet_placement
+from infralens.report import build_pdf_report
+from infralens.rules import Finding, PlacementItem, RecommendationResult, build_placement_recommendation, detect_bottlenecks
+from infralens.scoring import calculate_efficiency_score, infer_workload_profile
+from infralens.synthetic import host_workloads, scenario_to_nvidia_smi_csv, synthetic_fleet, synthetic_workloads
+
+BENCHMARK_STAGES = ("parse", "score", "rules", "placement", "templates", "pdf")
+DEFAULT_SIZES = (64, 512, 4096)
+DEFAULT_OUT_PATH = "logs/benchmarks.jsonl"
+
+
+@dataclass
+class BenchmarkResult:
+    stage: str
+    gpus: int
+    hosts: int
+    iterations: int
+    mean_sec: float
+    p50_sec: float
+    p95_sec: float
+    p99_sec: float
+    throughput_gpus_per_sec: float
+    peak_mem_bytes: int
+    samples_sec: list[float] = field(default_factory=list)
+
+
+def percentile(values: list[float], q: float) -> float:
+    # Nearest-rank percentile.
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+@dataclass
+class _Fixture:
+    fleet: dict[str, dict[str, Any]]
+    workloads: list[Any]
+    per_host: dict[str, list[Any]]
+    csv_by_host: dict[str, bytes]
+    profiles: dict[str, str]
+    recommendations: dict[str, RecommendationResult]
+
+
+def _build_fixture(gpu_count: int, seed: int) -> _Fixture:
+    fleet = synthetic_fleet(gpu_count, seed=seed)
+    workloads = synthetic_workloads(fleet, seed=seed)
+    per_host = host_workloads(workloads, fleet)
+    profiles = {h: infer_workload_profile(per_host[h]) for h in fleet}
+    recommendations = {}
+    for host, scenario in fleet.items():
+        score = calculate_efficiency_score(scenario, profile=profiles[host])
+        recommendations[host] = build_placement_recommendation(
+            scenario, per_host[host], score.score, profile=profiles[host]
+        )
+    return _Fixture(
+        fleet=fleet,
+        workloads=workloads,
+        per_host=per_host,
+        csv_by_host={h: scenario_to_nvidia_smi_csv(s).encode("utf-8") for h, s in fleet.items()},
+        profiles=profiles,
+        recommendations=recommendations,
+    )
+
+
+def _stage_fn(stage: str, fx: _Fixture) -> Callable[[], Any]:
+    if stage == "parse":
+        return lambda: [parse_uploaded_telemetry(f"{h}.csv", raw) for h, raw in fx.csv_by_host.items()]
+    if stage == "score":
+        return lambda: [
+            calculate_efficiency_score(s, profile=fx.profiles[h]) for h, s in fx.fleet.items()
+        ]
+    if stage == "rules":
+        return lambda: [
+            detect_bottlenecks(s, fx.per_host[h], profile=fx.profiles[h]) for h, s in fx.fleet.items()
+        ]
+    if stage == "placement":
+        return lambda: solve_fleet_placement(fx.fleet, fx.workloads)
+    if stage == "templates":
+        return lambda: [
+            build_execution_templates(s, fx.per_host[h], fx.recommendations[h]) for h, s in fx.fleet.items()
+        ]
+    if stage == "pdf":
+        return lambda: _fleet_pdf(fx)
+    raise ValueError(f"Unknown benchmark stage: {stage}")
+
+
+def _fleet_pdf(fx: _Fixture) -> bytes:
+    # One fleet-wide report, so its size grows with the fleet like a real export.
+    findings: list[Finding] = []
+    items: list[PlacementItem] = []
+    for host, scenario in fx.fleet.items():
+        for f in detect_bottlenecks(scenario, fx.per_host[host], profile=fx.profiles[host]):
+            findings.append(Finding(f.category, f.severity, f"[{host}] {f.message}", f.code, f.data))
+        items.extend(fx.recommendations[host].items)
+    first = next(iter(fx.recommendations.values()))
+    recommendation = RecommendationResult(
+        items=items,
+        expected_util_before=first.expected_util_before,
+        expected_util_after=first.expected_util_after,
+        expected_training_gain_pct=first.expected_training_gain_pct,
+        expected_latency_drop_pct=first.expected_latency_drop_pct,
+    )
+    host, scenario = next(iter(fx.fleet.items()))
+    return build_pdf_report(
+        scenario_name=f"Synthetic fleet ({sum(len(s['gpus']) for s in fx.fleet.values())} GPUs)",
+        score=calculate_efficiency_score(scenario, profile=fx.profiles[host]),
+        findings=findings,
+        analysis_text="Synthetic benchmark report.",
+        recommendation=recommendation,
+        recommendation_text="",
+    )
+
+
+def _measure(fn: Callable[[], Any], iterations: int, warmup: int) -> tuple[list[float], int]:
+    for _ in range(warmup):
+        fn()
+    samples: list[float] = []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    # Peak memory comes from one extra traced call; tracing would skew timings.
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return samples, peak
+
+
+def run_benchmarks(
+    sizes: tuple[int, ...] | list[int] = DEFAULT_SIZES,
+    stages: tuple[str, ...] | list[str] = BENCHMARK_STAGES,
+    iterations: int = 5,
+    warmup: int = 1,
+    seed: int = 0,
+    progress: Callable[[BenchmarkResult], None] | None = None,
+) -> list[BenchmarkResult]:
+    unknown = [s for s in stages if s not in BENCHMARK_STAGES]
+    if unknown:
+        raise ValueError(f"Unknown benchmark stage(s): {', '.join(unknown)}")
+    iterations = max(1, int(iterations))
+
+    results: list[BenchmarkResult] = []
+    for size in sizes:
+        fx = _build_fixture(size, seed)
+        gpus = sum(len(s["gpus"]) for s in fx.fleet.values())
+        for stage in stages:
+            samples, peak = _measure(_stage_fn(stage, fx), iterations, max(0, int(warmup)))
+            mean = statistics.mean(samples)
+            result = BenchmarkResult(
+                stage=stage,
+                gpus=gpus,
+                hosts=len(fx.fleet),
+                iterations=iterations,
+                mean_sec=round(mean, 6),
+                p50_sec=round(percentile(samples, 0.50), 6),
+                p95_sec=round(percentile(samples, 0.95), 6),
+                p99_sec=round(percentile(samples, 0.99), 6),
+                throughput_gpus_per_sec=round(gpus / mean, 2) if mean > 0 else 0.0,
+                peak_mem_bytes=peak,
+                samples_sec=[round(s, 6) for s in samples],
+            )
+            results.append(result)
+            if progress is not None:
+                progress(result)
+    return results
+
+
+def write_benchmark_records(
+    results: list[BenchmarkResult],
+    out_path: str = DEFAULT_OUT_PATH,
+    phase: str = "",
+    seed: int = 0,
+) -> tuple[dict, Path]:
+    record = {
+        "timestamp_utc": datetime.now(timezone.utc).isoformat(),
+        "kind": "benchmark",
+        "phase": phase.strip() if phase else "",
+        "seed": seed,
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+        },
+        "results": [asdict(r) for r in results],
+    }
+    output = Path(out_path)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with output.open("a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    return record, output
+
+
+def format_results_table(results: list[BenchmarkResult]) -> str:
+    header = f"{'stage':<10} {'gpus':>6} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'GPU/s':>12} {'peak MiB':>9}"
+    lines = [header, "-" * len(header)]
+    for r in results:
+        lines.append(
+            f"{r.stage:<10} {r.gpus:>6} {r.p50_sec * 1000:>10.2f} {r.p95_sec * 1000:>10.2f} "
+            f"{r.p99_sec * 1000:>10.2f} {r.throughput_gpus_per_sec:>12.1f} {r.peak_mem_bytes / 2**20:>9.1f}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Iterable, TextIO
+
+# Only stdlib at module level: `python -m infralens --help` must not pay for
+# pandas/numpy/fpdf. Analysis modules are imported inside the command handlers.
+
+STDIN_TOKEN = "-"
+
+
+def _stdin_filename(raw: bytes, name: str) -> str:
+    if Path(name).suffix:
+        return name
+    head = raw.lstrip()[:1]
+    return f"{name}.json" if head in (b"{", b"[") else f"{name}.csv"
+
+
+def _load_workloads(path: str) -> list[Any] | None:
+    if not path:
+        return None
+    from infralens.data import Workload
+
+    payload = json.loads(Path(path).read_text(encoding="utf-8"))
+    if isinstance(payload, dict):
+        payload = payload.get("workloads", [])
+    return [Workload(**w) for w in payload]
+
+
+def _collect_bundles(inputs: list[str]) -> tuple[list[Any], list[str]]:
+    from infralens.batch import HostBundle, discover_host_bundles, host_for_file
+
+    bundles: list[Any] = []
+    missing: list[str] = []
+    for item in inputs:
+        if item == STDIN_TOKEN:
+            continue
+        path = Path(item)
+        if path.is_dir():
+            bundles.extend(discover_host_bundles(path))
+        elif path.is_file():
+            bundles.append(HostBundle(host=host_for_file(path), telemetry_path=str(path)))
+        else:
+            missing.append(item)
+    return bundles, missing
+
+
+def _write_results(records: Iterable[dict[str, Any]], fmt: str, out: TextIO, indent: int | None) -> None:
+    if fmt == "ndjson":
+        for record in records:
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        return
+    json.dump(list(records), out, ensure_ascii=False, indent=indent)
+    out.write("\n")
+
+
+def cmd_analyze(args: argparse.Namespace) -> int:
+    from infralens.batch import analyze_host_bundles, analyze_telemetry, host_analysis_to_dict
+
+    inputs = args.inputs or [STDIN_TOKEN]
+    try:
+        workloads = _load_workloads(args.workloads)
+    except (OSError, ValueError, TypeError) as exc:
+        print(f"invalid workloads file: {exc}", file=sys.stderr)
+        return 2
+
+    bundles, missing = _collect_bundles(inputs)
+    if missing:
+        print(f"no such file or directory: {', '.join(missing)}", file=sys.stderr)
+        return 2
+
+    t0 = time.perf_counter()
+    results = []
+    if STDIN_TOKEN in inputs:
+        raw = sys.stdin.buffer.read()
+        results.append(
+            analyze_telemetry(args.stdin_name, _stdin_filename(raw, args.stdin_name), raw, workloads=workloads)
+        )
+    results.extend(analyze_host_bundles(bundles, workloads=workloads, jobs=args.jobs or None))
+    elapsed = time.perf_counter() - t0
+
+    records = (host_analysis_to_dict(r) for r in results)
+    indent = None if args.compact else 2
+    if args.out:
+        output = Path(args.out)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with output.open("w", encoding="utf-8") as f:
+            _write_results(records, args.format, f, indent)
+    else:
+        _write_results(records, args.format, sys.stdout, indent)
+
+    failed = [r for r in results if r.error]
+    if not args.quiet:
+        print(f"analyzed {len(results)} host(s) in {elapsed:.3f}s, {len(failed)} failed", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="infralens", description="Headless InfraLens GPU infrastructure analysis.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    analyze = sub.add_parser(
+        "analyze",
+        help="Run parse -> score -> rules -> recommend -> templates over telemetry files.",
+        description=(
+            "Analyze telemetry files, per-host bundle directories (CSV plus optional topo/numactl), "
+            "or stdin ('-'). Results are written as JSON or NDJSON, one record per host."
+        ),
+    )
+    analyze.add_argument("inputs", nargs="*", help="Files, directories, or '-' for stdin (default: stdin).")
+    analyze.add_argument("--format", choices=("json", "ndjson"), default="json")
+    analyze.add_argument("--jobs", type=int, default=1, help="Worker processes (0 = CPU count).")
+    analyze.add_argument("--workloads", type=str, default="", help="JSON file with a list of workloads.")
+    analyze.add_argument("--out", type=str, default="", help="Output path (default: stdout).")
+    analyze.add_argument("--stdin-name", type=str, default="stdin", help="Host name used for stdin input.")
+    analyze.add_argument("--compact", action="store_true", help="Single-line JSON output.")
+    analyze.add_argument("--quiet", action="store_true", help="Do not print the summary line to stderr.")
+    analyze.set_defaults(handler=cmd_analyze)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    if getattr(args, "jobs", 1) == 0:
+        args.jobs = os.cpu_count() or 1
+    try:
+        return args.handler(args)
+    except BrokenPipeError:
+        # Downstream closed early (e.g. `| head`); silence the flush at exit.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
@@ -0,0 +1,344 @@
+from __future__ import annotations
+
+import os
+import re
+import subprocess
+import threading
+import time
+import urllib.request
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Protocol
+
+from infralens.parsers import (
+    TelemetryAggregator,
+    _normalize_col,
+    apply_host_topology,
+    iter_telemetry_chunks,
+)
+
+NVIDIA_SMI_QUERY_FIELDS = ("index", "utilization.gpu", "memory.used", "memory.total", "name")
+
+# DCGM exporter metric -> parser row column. Framebuffer values are MiB.
+DCGM_METRIC_COLUMNS = {
+    "DCGM_FI_DEV_GPU_UTIL": "utilization_gpu",
+    "DCGM_FI_DEV_FB_USED": "memory_used",
+    "DCGM_FI_DEV_FB_FREE": "memory_free",
+    "DCGM_FI_DEV_FB_TOTAL": "memory_total",
+}
+
+_PROM_LINE = re.compile(r"^([A-Za-z_:][A-Za-z0-9_:]*)(?:\{(.*)\})?\s+(\S+)")
+_PROM_LABEL = re.compile(r'([A-Za-z_][A-Za-z0-9_]*)="((?:[^"\\]|\\.)*)"')
+
+
+class TelemetrySource(Protocol):
+    name: str
+
+    def poll(self) -> list[dict[str, Any]]: ...
+
+
+def parse_nvidia_smi_query_output(
+    text: str, fields: tuple[str, ...] = NVIDIA_SMI_QUERY_FIELDS
+) -> list[dict[str, Any]]:
+    columns = [_normalize_col(f) for f in fields]
+    rows: list[dict[str, Any]] = []
+    for line in text.splitlines():
+        cells = [c.strip() for c in line.split(",")]
+        if not any(cells):
+            continue
+        if len(cells) < len(columns):
+            cells += [""] * (len(columns) - len(cells))
+        rows.append(dict(zip(columns, cells)))
+    return rows
+
+
+def parse_prometheus_text(text: str) -> list[dict[str, Any]]:
+    by_gpu: dict[str, dict[str, Any]] = {}
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        match = _PROM_LINE.match(line)
+        if not match:
+            continue
+        metric, labels_text, value = match.groups()
+        column = DCGM_METRIC_COLUMNS.get(metric)
+        if column is None:
+            continue
+        labels = dict(_PROM_LABEL.findall(labels_text or ""))
+        gpu = labels.get("gpu", labels.get("minor_number"))
+        if gpu is None:
+            continue
+        row = by_gpu.setdefault(gpu, {"index": gpu})
+        if "Hostname" in labels or "hostname" in labels:
+            row["host"] = labels.get("Hostname", labels.get("hostname"))
+        if labels.get("modelName"):
+            row["model_name"] = labels["modelName"]
+        row[column] = value
+
+    rows: list[dict[str, Any]] = []
+    for gpu in sorted(by_gpu, key=lambda g: int(g) if g.isdigit() else g):
+        row = by_gpu[gpu]
+        free = row.pop("memory_free", None)
+        if "memory_total" not in row and free is not None and "memory_used" in row:
+            try:
+                row["memory_total"] = float(row["memory_used"]) + float(free)
+            except ValueError:
+                pass
+        rows.append(row)
+    return rows
+
+
+class NvidiaSmiSource:
+    name = "nvidia-smi"
+
+    def __init__(self, binary: str = "nvidia-smi", timeout_sec: float = 5.0) -> None:
+        self.binary = binary
+        self.timeout_sec = timeout_sec
+        self._cmd = [
+            binary,
+            f"--query-gpu={','.join(NVIDIA_SMI_QUERY_FIELDS)}",
+            "--format=csv,noheader,nounits",
+        ]
+
+    def poll(self) -> list[dict[str, Any]]:
+        completed = subprocess.run(
+            self._cmd,
+            capture_output=True,
+            text=True,
+            timeout=self.timeout_sec,
+            check=True,
+        )
+        return parse_nvidia_smi_query_output(completed.stdout)
+
+
+class PrometheusSource:
+    name = "prometheus"
+
+    def __init__(self, url: str, timeout_sec: float = 5.0) -> None:
+        self.url = url
+        self.timeout_sec = timeout_sec
+
+    def poll(self) -> list[dict[str, Any]]:
+        with urllib.request.urlopen(self.url, timeout=self.timeout_sec) as resp:
+            text = resp.read().decode("utf-8", errors="ignore")
+        return parse_prometheus_text(text)
+
+
+class ReplaySource:
+    # Replays a captured telemetry file one frame per poll. A frame ends when
+    # the timestamp changes or a GPU index repeats.
+    name = "replay"
+
+    def __init__(self, path: str | os.PathLike[str], loop: bool = True) -> None:
+        self.path = path
+        self.loop = loop
+        self.frames = self._load_frames()
+        self._pos = 0
+        if not self.frames:
+            raise ValueError(f"Replay file has no telemetry rows: {path}")
+
+    def _load_frames(self) -> list[list[dict[str, Any]]]:
+        frames: list[list[dict[str, Any]]] = []
+        current: list[dict[str, Any]] = []
+        seen: set[str] = set()
+        current_ts: Any = None
+        for chunk in iter_telemetry_chunks(self.path):
+            for row in chunk:
+                gpu = str(row.get("index", row.get("gpu", len(current))))
+                ts = row.get("timestamp")
+                if current and (gpu in seen or ts != current_ts):
+                    frames.append(current)
+                    current, seen = [], set()
+                current.append(row)
+                seen.add(gpu)
+                current_ts = ts
+        if current:
+            frames.append(current)
+        return frames
+
+    @property
+    def exhausted(self) -> bool:
+        return not self.loop and self._pos >= len(self.frames)
+
+    def poll(self) -> list[dict[str, Any]]:
+        if self._pos >= len(self.frames):
+            if not self.loop:
+                return []
+            self._pos = 0
+        frame = self.frames[self._pos]
+        self._pos += 1
+        # Drop recorded timestamps: the collector stamps each poll itself.
+        return [{k: v for k, v in row.items() if k != "timestamp"} for row in frame]
+
+
+@dataclass
+class SampleBatch:
+    timestamp: float
+    host: str
+    rows: list[dict[str, Any]]
+
+
+class SampleRing:
+    def __init__(self, capacity: int = 3600) -> None:
+        self.capacity = max(1, int(capacity))
+        self._batches: deque[SampleBatch] = deque(maxlen=self.capacity)
+        self._lock = threading.Lock()
+        self.total_batches = 0
+
+    def __len__(self) -> int:
+        return len(self._batches)
+
+    def push(self, batch: SampleBatch) -> None:
+        with self._lock:
+            self._batches.append(batch)
+            self.total_batches += 1
+
+    def snapshot(self, window_sec: float | None = None, host: str | None = None) -> list[SampleBatch]:
+        with self._lock:
+            batches = list(self._batches)
+        if host is not None:
+            batches = [b for b in batches if b.host == host]
+        if window_sec is not None and batches:
+            cutoff = batches[-1].timestamp - float(window_sec)
+            batches = [b for b in batches if b.timestamp >= cutoff]
+        return batches
+
+    def to_scenario(
+        self,
+        name: str | None = None,
+        window_sec: float | None = None,
+        host: str | None = None,
+        topo_text: str | None = None,
+        numactl_text: str | None = None,
+    ) -> dict[str, Any]:
+        batches = self.snapshot(window_sec=window_sec, host=host)
+        aggregator = TelemetryAggregator()
+        for batch in batches:
+            aggregator.add_rows(batch.rows)
+        if not aggregator.rows_seen:
+            raise ValueError("Collector has not received any GPU samples yet.")
+        scenario = aggregator.to_scenario(name or f"Live ({host or batches[-1].host})")
+        return apply_host_topology(scenario, topo_text, numactl_text)
+
+
+@dataclass
+class CollectorStats:
+    polls: int = 0
+    samples: int = 0
+    errors: int = 0
+    missed_ticks: int = 0
+    last_error: str | None = None
+    last_poll_sec: float = 0.0
+    poll_sec_total: float = 0.0
+    started_at: float | None = None
+
+
+class Collector:
+    def __init__(
+        self,
+        source: TelemetrySource,
+        ring: SampleRing | None = None,
+        interval_sec: float = 1.0,
+        host: str = "local",
+        on_batch: Callable[[SampleBatch], None] | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if interval_sec <= 0:
+            raise ValueError("interval_sec must be positive.")
+        self.source = source
+        self.ring = ring if ring is not None else SampleRing()
+        self.interval_sec = float(interval_sec)
+        self.host = host
+        self.on_batch = on_batch
+        self.clock = clock
+        self.stats = CollectorStats()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def run_once(self) -> SampleBatch | None:
+        t0 = time.perf_counter()
+        now = self.clock()
+        try:
+            rows = self.source.poll()
+        except Exception as exc:
+            self.stats.errors += 1
+            self.stats.last_error = f"{exc.__class__.__name__}: {exc}"
+            return None
+        finally:
+            elapsed = time.perf_counter() - t0
+            self.stats.polls += 1
+            self.stats.last_poll_sec = elapsed
+            self.stats.poll_sec_total += elapsed
+
+        if not rows:
+            return None
+        for row in rows:
+            row["timestamp"] = now
+            row.setdefault("host", self.host)
+        batch = SampleBatch(timestamp=now, host=self.host, rows=rows)
+        self.ring.push(batch)
+        self.stats.samples += len(rows)
+        if self.on_batch is not None:
+            self.on_batch(batch)
+        return batch
+
+    def _loop(self) -> None:
+        # Fixed-rate schedule on the monotonic clock; ticks that fall behind are
+        # skipped rather than run back-to-back.
+        next_tick = time.monotonic()
+        while not self._stop.is_set():
+            self.run_once()
+            if getattr(self.source, "exhausted", False):
+                break
+            next_tick += self.interval_sec
+            now = time.monotonic()
+            if now > next_tick:
+                missed = int((now - next_tick) // self.interval_sec) + 1
+                self.stats.missed_ticks += missed
+                next_tick += missed * self.interval_sec
+            self._stop.wait(next_tick - now)
+
+    def start(self) -> Collector:
+        if self.running:
+            return self
+        self._stop.clear()
+        self.stats.started_at = self.clock()
+        self._thread = threading.Thread(target=self._loop, name="infralens-collector", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def __enter__(self) -> Collector:
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+
+def source_from_spec(
+    kind: str,
+    target: str | None = None,
+    timeout_sec: float = 5.0,
+    loop: bool = True,
+) -> TelemetrySource:
+    if kind == "nvidia-smi":
+        return NvidiaSmiSource(binary=target or "nvidia-smi", timeout_sec=timeout_sec)
+    if kind == "prometheus":
+        if not target:
+            raise ValueError("Prometheus source needs a metrics URL.")
+        return PrometheusSource(target, timeout_sec=timeout_sec)
+    if kind == "replay":
+        if not target:
+            raise ValueError("Replay source needs a telemetry file path.")
+        return ReplaySource(target, loop=loop)
+    raise ValueError(f"Unknown telemetry source: {kind}")
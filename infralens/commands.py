@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+from collections import Counter
 from dataclasses import dataclass
 from typing import Any
 
 from infralens.data import Workload
+from infralens.mig import compute_fraction_of
 from infralens.rules import RecommendationResult
 
 
@@ -19,6 +21,7 @@ class ExecutionConfig:
     cpu_set_mode: str = "auto"  # auto | manual
     manual_cpu_set: str = ""
     gpu_visibility_style: str = "cuda_visible_devices"  # cuda_visible_devices | docker_gpus_device
+    cpus_per_gpu: int = 0  # 0 = split each NUMA node's CPUs evenly across its GPUs
 
 
 @dataclass
@@ -30,10 +33,66 @@ class CommandTemplate:
 
 
 def _cpu_set_for_socket(socket_id: int) -> str:
-    # Generic template ranges for dual-socket hosts; adjust in production.
+    # Generic template ranges for dual-socket hosts, used when no
+    # `numactl --hardware` output was provided.
     return "0-23,48-71" if socket_id == 0 else "24-47,72-95"
 
 
+def format_cpu_list(cpus: list[int]) -> str:
+    parts: list[str] = []
+    ordered = sorted(set(cpus))
+    i = 0
+    while i < len(ordered):
+        j = i
+        while j + 1 < len(ordered) and ordered[j + 1] == ordered[j] + 1:
+            j += 1
+        parts.append(str(ordered[i]) if i == j else f"{ordered[i]}-{ordered[j]}")
+        i = j + 1
+    return ",".join(parts)
+
+
+def _sibling_order(cpus: list[int]) -> tuple[list[int], int]:
+    # numactl lists a node's physical cores first and their SMT siblings after
+    # (0-23,48-71). Hand them out as core+sibling pairs so no job gets half a
+    # core shared with its neighbour.
+    half = len(cpus) // 2
+    if not half or len(cpus) % 2:
+        return cpus, 1
+    offset = cpus[half] - cpus[0]
+    if offset < half or any(cpus[i + half] - cpus[i] != offset for i in range(half)):
+        return cpus, 1
+    return [c for i in range(half) for c in (cpus[i], cpus[i + half])], 2
+
+
+class CpuSetAllocator:
+    def __init__(self, node_cpus: dict[int, list[int]]) -> None:
+        self._free: dict[int, list[int]] = {}
+        self._step: dict[int, int] = {}
+        for node, cpus in node_cpus.items():
+            self._free[node], self._step[node] = _sibling_order(sorted(cpus))
+
+    def take(self, node: int, count: int) -> list[int]:
+        free = self._free.get(node, [])
+        step = self._step.get(node, 1)
+        count = -(-max(1, count) // step) * step
+        grant = free[:count]
+        del free[:count]
+        return grant
+
+
+def scenario_node_cpus(scenario: dict[str, Any]) -> dict[int, list[int]]:
+    raw = scenario.get("node_cpus") or {}
+    return {int(node): sorted(int(c) for c in cpus) for node, cpus in raw.items() if cpus}
+
+
+def _mig_uuid_lookup(gpu_id: int, mig_index: int) -> str:
+    # MIG devices are only addressable by UUID outside containers.
+    return (
+        f"$(nvidia-smi -L | awk '/^GPU {gpu_id}:/{{f=1;next}} /^GPU/{{f=0}} "
+        f"f && /Device *{mig_index}:/{{print $NF}}' | tr -d ')')"
+    )
+
+
 def _socket_for_gpu(scenario: dict[str, Any], gpu_id: int) -> int:
     for g in scenario.get("gpus", []):
         if int(g.get("id", -1)) == gpu_id:
@@ -51,10 +110,50 @@ def build_execution_templates(
     workload_map = {w.name: w for w in workloads}
     templates: list[CommandTemplate] = []
 
-    def _effective_cpu_set(socket_id: int) -> str:
-        if cfg.cpu_set_mode == "manual" and cfg.manual_cpu_set.strip():
-            return cfg.manual_cpu_set.strip()
-        return _cpu_set_for_socket(socket_id)
+    node_cpus = scenario_node_cpus(scenario)
+    allocator = CpuSetAllocator(node_cpus)
+    numa_of = {int(g["id"]): int(g.get("numa_node", 0)) for g in scenario.get("gpus", [])}
+    gpus_per_node = Counter(numa_of.values())
+    shared_jobs = Counter(
+        int((item.data or {}).get("host_gpu", 0))
+        for item in recommendation.items
+        if item.code == "consolidate_inference_mig" and not (item.data or {}).get("profile")
+    )
+
+    def _pinning(gpu_ids: list[int], fraction: float = 1.0) -> tuple[str, str, str]:
+        # -> (numactl node list, taskset/cpuset list, warning header). With
+        # numactl topology each job gets its own slice of the CPUs local to its
+        # GPUs, sized by its share of those GPUs; jobs placed earlier keep theirs.
+        manual = cfg.manual_cpu_set.strip() if cfg.cpu_set_mode == "manual" else ""
+        if not node_cpus or any(numa_of.get(g) not in node_cpus for g in gpu_ids):
+            socket_id = _socket_for_gpu(scenario, gpu_ids[0])
+            return str(socket_id), manual or _cpu_set_for_socket(socket_id), ""
+        nodes = sorted({numa_of[g] for g in gpu_ids})
+        node_list = ",".join(map(str, nodes))
+        if manual:
+            return node_list, manual, ""
+        cpus: list[int] = []
+        wanted = 0
+        short: set[int] = set()
+        for g in gpu_ids:
+            node = numa_of[g]
+            share = cfg.cpus_per_gpu or len(node_cpus[node]) // max(1, gpus_per_node[node])
+            want = max(1, int(share * fraction))
+            grant = allocator.take(node, want)
+            if len(grant) < want:
+                short.add(node)
+            wanted += want
+            cpus.extend(grant)
+        if not short:
+            return node_list, format_cpu_list(cpus), ""
+        # Node oversubscribed: rather than under-pin, stay NUMA-local on every
+        # CPU of the node(s) and say that the set is shared.
+        warning = (
+            f"# WARNING: NUMA node {','.join(map(str, sorted(short)))} had {len(cpus)} of the {wanted} CPUs "
+            f"this job needs free; pinned to all CPUs of node {node_list}, shared with other jobs\n"
+        )
+        cpus = [c for node in nodes for c in node_cpus[node]]
+        return node_list, format_cpu_list(cpus), warning
 
     def _env_prefix(extra_cuda: str | None = None) -> str:
         envs = dict(cfg.env_vars or {})
@@ -68,12 +167,15 @@ def build_execution_templates(
         extra = cfg.extra_args.strip()
         return f" --workload {workload_name}" + (f" {extra}" if extra else "")
 
-    def _docker_run_prefix(workload_name: str, gpu_csv: str, cpu_set: str) -> str:
+    def _docker_run_prefix(workload_name: str, gpu_csv: str, cpu_set: str, mig_device: str | None = None) -> str:
         image = cfg.image_name.strip() or "your-image:latest"
         name = f"{cfg.container_prefix}-{workload_name}".replace("_", "-")
         wd = f" -w {cfg.workdir.strip()}" if cfg.workdir.strip() else ""
         env_flags = " ".join([f"-e {k}={v}" for k, v in (cfg.env_vars or {}).items()])
-        if cfg.gpu_visibility_style == "cuda_visible_devices":
+        if mig_device is not None:
+            # The container runtime exposes exactly this MIG device as device 0.
+            gpus_flag = f'--gpus "device={mig_device}"'
+        elif cfg.gpu_visibility_style == "cuda_visible_devices":
             env_flags = (env_flags + f" -e CUDA_VISIBLE_DEVICES={gpu_csv}").strip()
             gpus_flag = f'--gpus "device={gpu_csv}"'
         else:
@@ -86,14 +188,14 @@ def build_execution_templates(
         if not w:
             continue
 
-        if item.code == "move_training_nvlink":
+        if item.code in ("move_training_nvlink", "place_inference_multi_gpu"):
             target_gpus = [int(x) for x in (item.data or {}).get("target_gpus", [])]
             if not target_gpus:
                 continue
             gpu_csv = ",".join(str(g) for g in target_gpus)
-            socket_id = _socket_for_gpu(scenario, target_gpus[0])
-            cpu_set = _effective_cpu_set(socket_id)
-            cmd = cfg.entry_command.strip() or "python train.py"
+            nodes, cpu_set, header = _pinning(target_gpus)
+            default_cmd = "python train.py" if item.code == "move_training_nvlink" else "python serve.py"
+            cmd = cfg.entry_command.strip() or default_cmd
             tail = _tail_args(w.name)
             env_prefix = _env_prefix(gpu_csv)
 
@@ -101,14 +203,14 @@ def build_execution_templates(
                 CommandTemplate(
                     workload=w.name,
                     numactl_cmd=(
-                        f"{env_prefix}numactl --cpunodebind={socket_id} "
-                        f"--membind={socket_id} {cmd}{tail}"
+                        f"{header}{env_prefix}numactl --cpunodebind={nodes} "
+                        f"--membind={nodes} {cmd}{tail}"
                     ),
                     taskset_cmd=(
-                        f"{env_prefix}taskset -c {cpu_set} {cmd}{tail}"
+                        f"{header}{env_prefix}taskset -c {cpu_set} {cmd}{tail}"
                     ),
                     docker_cmd=(
-                        f"{_docker_run_prefix(w.name, gpu_csv, cpu_set)} "
+                        f"{header}{_docker_run_prefix(w.name, gpu_csv, cpu_set)} "
                         f"{cmd}{tail}"
                     ),
                 )
@@ -116,29 +218,37 @@ def build_execution_templates(
             continue
 
         if item.code == "consolidate_inference_mig":
-            host_gpu = int((item.data or {}).get("host_gpu", 0))
-            mig_profile = str((item.data or {}).get("profile", "1g.20gb"))
-            socket_id = _socket_for_gpu(scenario, host_gpu)
-            cpu_set = _effective_cpu_set(socket_id)
+            data = item.data or {}
+            host_gpu = int(data.get("host_gpu", 0))
+            mig_profile = data.get("profile")
+            if mig_profile:
+                fraction = compute_fraction_of(str(mig_profile), data.get("gpu_model"))
+            else:
+                fraction = 1.0 / max(1, shared_jobs[host_gpu])
+            nodes, cpu_set, header = _pinning([host_gpu], fraction)
             cmd = cfg.entry_command.strip() or "python serve.py"
             tail = _tail_args(w.name)
             env_prefix = _env_prefix(str(host_gpu))
+            mig_device = None
+            if mig_profile:
+                mig_index = int(data.get("mig_index", 0))
+                mig_device = f"{host_gpu}:{mig_index}"
+                layout = ",".join(data.get("layout") or [str(mig_profile)])
+                header += f"# MIG profile: {mig_profile} on GPU {host_gpu} (device {mig_device}, layout {layout})\n"
+                env_prefix = _env_prefix(_mig_uuid_lookup(host_gpu, mig_index))
 
             templates.append(
                 CommandTemplate(
                     workload=w.name,
                     numactl_cmd=(
-                        f"# MIG profile: {mig_profile} on GPU {host_gpu}\n"
-                        f"{env_prefix}numactl --cpunodebind={socket_id} "
-                        f"--membind={socket_id} {cmd}{tail}"
+                        f"{header}{env_prefix}numactl --cpunodebind={nodes} "
+                        f"--membind={nodes} {cmd}{tail}"
                     ),
                     taskset_cmd=(
-                        f"# MIG profile: {mig_profile} on GPU {host_gpu}\n"
-                        f"{env_prefix}taskset -c {cpu_set} {cmd}{tail}"
+                        f"{header}{env_prefix}taskset -c {cpu_set} {cmd}{tail}"
                     ),
                     docker_cmd=(
-                        f"# MIG profile: {mig_profile} on GPU {host_gpu}\n"
-                        f"{_docker_run_prefix(w.name, str(host_gpu), cpu_set)} "
+                        f"{header}{_docker_run_prefix(w.name, str(host_gpu), cpu_set, mig_device)} "
                         f"{cmd}{tail}"
                     ),
                 )
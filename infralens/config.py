@@ -41,6 +41,63 @@ DEFAULT_CONFIG = {
             "expected_util_gain": 32,
         },
     },
+    "bottleneck_rules": [
+        {
+            "code": "numa_mismatch",
+            "category": "NUMA",
+            "severity": "high",
+            "scope": "gpu",
+            "when": [["numa_node", "!=", "cpu_socket"]],
+            "message": "GPU {id} has NUMA mismatch (GPU NUMA {numa_node} vs CPU socket {cpu_socket}).",
+            "data": {"gpu_id": "id", "numa_node": "numa_node", "cpu_socket": "cpu_socket"},
+        },
+        {
+            "code": "low_gpu_util",
+            "category": "GPU_UTIL",
+            "severity": "medium",
+            "scope": "count",
+            "params": {
+                "low_util_threshold": {"default": 45, "type": "int"},
+                "low_util_fraction": {"default": 0.25, "type": "float"},
+            },
+            "when": [["gpu_util", "<", "$low_util_threshold"]],
+            "min_count": 1,
+            "min_fraction": "$low_util_fraction",
+            "message": "{count} GPU(s) show low utilization (<{low_util_threshold}%), indicating potential under-allocation.",
+            "data": {"count": "count", "threshold": "low_util_threshold"},
+        },
+        {
+            "code": "mig_opportunity",
+            "category": "MIG",
+            "severity": "medium",
+            "scope": "any",
+            "params": {
+                "mig_underused_util_threshold": {"default": 65, "type": "int"},
+                "mig_underused_vram_threshold_gb": {"default": 90, "type": "float"},
+            },
+            "workloads": {"kind": "inference"},
+            "when": [
+                ["gpu_util", "<", "$mig_underused_util_threshold"],
+                ["vram_used_gb", "<", "$mig_underused_vram_threshold_gb"],
+            ],
+            "message": "Inference workloads are running on underused full GPUs; MIG partitioning can improve density.",
+            "data": {
+                "gpu_util_threshold": "mig_underused_util_threshold",
+                "vram_used_threshold_gb": "mig_underused_vram_threshold_gb",
+            },
+        },
+        {
+            "code": "nvlink_spread_training",
+            "category": "NVLINK",
+            "severity": "high",
+            "scope": "any",
+            "params": {"requires_training_gpus": {"default": 4, "type": "int"}},
+            "workloads": {"kind": "training", "min_gpu_demand": "$requires_training_gpus"},
+            "min_distinct": {"nvlink_group": 2},
+            "message": "Multi-GPU training workload detected. Keeping GPUs within one NVLink group is recommended.",
+        },
+    ],
+    "column_aliases": {},
 }
 
 
@@ -67,3 +124,27 @@ def get_profile_map(section: str) -> dict[str, dict[str, Any]]:
     merged = dict(DEFAULT_CONFIG.get(section, {}))
     merged.update(section_map)
     return merged
+
+
+def get_rule_specs() -> list[dict[str, Any]]:
+    rules = load_config().get("bottleneck_rules")
+    if not isinstance(rules, list):
+        return DEFAULT_CONFIG["bottleneck_rules"]
+    return rules
+
+
+def config_signature() -> dict[str, Any]:
+    # Everything scoring and the rule engine read, merged the same way they
+    # read it, for callers that key caches on the active configuration.
+    return {
+        "score_weights": get_profile_map("score_weights"),
+        "rule_thresholds": get_profile_map("rule_thresholds"),
+        "bottleneck_rules": get_rule_specs(),
+    }
+
+
+def get_column_aliases() -> dict[str, list[str]]:
+    aliases = load_config().get("column_aliases")
+    if not isinstance(aliases, dict):
+        return DEFAULT_CONFIG["column_aliases"]
+    return {field: list(names) for field, names in aliases.items() if isinstance(names, list)}
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from math import floor
+from statistics import mean
+from typing import Any, Mapping
+
+import numpy as np
+
+from infralens.config import get_profile_map
+from infralens.scoring import ScoreResult, grade_from_score
+
+GPU_TABLE_COLUMNS = [
+    "host",
+    "gpu_id",
+    "gpu_util",
+    "vram_used_gb",
+    "total_vram_gb",
+    "network_io_score",
+    "numa_node",
+    "cpu_socket",
+    "nvlink_group",
+]
+
+
+@dataclass
+class FleetScoreResult:
+    hosts: dict[str, ScoreResult]
+    fleet: ScoreResult
+
+
+def build_gpu_table(scenarios: Mapping[str, dict[str, Any]]) -> dict[str, np.ndarray]:
+    hosts: list[str] = []
+    gpu_ids: list[int] = []
+    gpu_util: list[float] = []
+    vram_used: list[float] = []
+    vram_total: list[float] = []
+    network: list[float] = []
+    numa: list[int] = []
+    socket: list[int] = []
+    nvlink: list[str] = []
+
+    for host, scenario in scenarios.items():
+        total = float(scenario["total_vram_gb"])
+        for g in scenario["gpus"]:
+            hosts.append(str(host))
+            gpu_ids.append(int(g["id"]))
+            gpu_util.append(float(g["gpu_util"]))
+            vram_used.append(float(g["vram_used_gb"]))
+            vram_total.append(total)
+            network.append(float(g["network_io_score"]))
+            numa.append(int(g["numa_node"]))
+            socket.append(int(g["cpu_socket"]))
+            nvlink.append(str(g["nvlink_group"]))
+
+    return {
+        "host": np.asarray(hosts, dtype=object),
+        "gpu_id": np.asarray(gpu_ids, dtype=np.int64),
+        "gpu_util": np.asarray(gpu_util, dtype=np.float64),
+        "vram_used_gb": np.asarray(vram_used, dtype=np.float64),
+        "total_vram_gb": np.asarray(vram_total, dtype=np.float64),
+        "network_io_score": np.asarray(network, dtype=np.float64),
+        "numa_node": np.asarray(numa, dtype=np.int64),
+        "cpu_socket": np.asarray(socket, dtype=np.int64),
+        "nvlink_group": np.asarray(nvlink, dtype=object),
+    }
+
+
+def _column(table: Any, name: str, dtype: Any = np.float64) -> np.ndarray:
+    try:
+        values = table[name]
+    except KeyError as exc:
+        raise ValueError(f"GPU table is missing required column '{name}'.") from exc
+    if hasattr(values, "to_numpy"):
+        values = values.to_numpy()
+    return np.asarray(values, dtype=dtype)
+
+
+def _profile_weights(profile: str) -> tuple[float, float, float]:
+    weights = get_profile_map("score_weights")
+    w = weights.get(profile, weights.get("default", {"gpu": 0.6, "numa": 0.2, "network": 0.2}))
+    return float(w["gpu"]), float(w["numa"]), float(w["network"])
+
+
+def _weighted_total(gpu_score: float, numa_score: float, network_score: float, profile: str) -> float:
+    w_gpu, w_numa, w_network = _profile_weights(profile)
+    return gpu_score * w_gpu + numa_score * w_numa + network_score * w_network
+
+
+def _near_half(total: float) -> bool:
+    scaled = total * 100
+    return abs(scaled - floor(scaled) - 0.5) < 1e-6
+
+
+def _score_result(
+    gpu_score: float, numa_score: float, network_score: float, profile: str
+) -> ScoreResult:
+    total = _weighted_total(gpu_score, numa_score, network_score, profile)
+    score = round(total * 100)
+    return ScoreResult(
+        score=score,
+        grade=grade_from_score(score),
+        gpu_score=gpu_score,
+        numa_score=numa_score,
+        network_score=network_score,
+        profile=profile,
+    )
+
+
+def calculate_fleet_scores(
+    table: Any,
+    profile: str = "default",
+    host_profiles: Mapping[str, str] | None = None,
+) -> FleetScoreResult:
+    host_col = _column(table, "host", dtype=object)
+    if host_col.size == 0:
+        raise ValueError("GPU table is empty.")
+
+    gpu_util = _column(table, "gpu_util")
+    vram_used = _column(table, "vram_used_gb")
+    vram_total = _column(table, "total_vram_gb")
+    network = _column(table, "network_io_score")
+    numa = _column(table, "numa_node", dtype=np.int64)
+    socket = _column(table, "cpu_socket", dtype=np.int64)
+
+    # Same element-wise formulas as scoring._gpu_component / _numa_component.
+    gpu_components = (gpu_util / 100.0) * 0.4 + (vram_used / vram_total) * 0.3
+    numa_components = np.where(numa == socket, 1.0, 0.5)
+
+    labels, first_idx, inverse = np.unique(
+        host_col.astype(str), return_index=True, return_inverse=True
+    )
+    order = np.argsort(first_idx, kind="stable")
+    counts = np.bincount(inverse, minlength=len(labels)).astype(np.float64)
+    gpu_means = np.bincount(inverse, weights=gpu_components, minlength=len(labels)) / counts
+    numa_means = np.bincount(inverse, weights=numa_components, minlength=len(labels)) / counts
+    network_means = np.bincount(inverse, weights=network, minlength=len(labels)) / counts
+
+    def exact(rows: Any, means: tuple[float, float, float], host_profile: str) -> tuple[float, float, float]:
+        # bincount/np.mean sum in a different order than statistics.mean, so a
+        # score sitting on a .5 boundary is re-averaged exactly before rounding.
+        if not _near_half(_weighted_total(*means, host_profile)):
+            return means
+        return (
+            mean(gpu_components[rows].tolist()),
+            mean(numa_components[rows].tolist()),
+            mean(network[rows].tolist()),
+        )
+
+    profiles = host_profiles or {}
+    hosts: dict[str, ScoreResult] = {}
+    for pos in order:
+        host = str(labels[pos])
+        host_profile = profiles.get(host, profile)
+        means = (float(gpu_means[pos]), float(numa_means[pos]), float(network_means[pos]))
+        hosts[host] = _score_result(*exact(inverse == pos, means, host_profile), host_profile)
+
+    fleet_means = (float(gpu_components.mean()), float(numa_components.mean()), float(network.mean()))
+    fleet = _score_result(*exact(slice(None), fleet_means, profile), profile)
+    return FleetScoreResult(hosts=hosts, fleet=fleet)
@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from math import comb
+from typing import Sequence
+
+DEFAULT_SUBSET_TIME_BUDGET_SEC = 0.01
+SUBSET_MEMO_SIZE = 4096
+# Above this many k-subsets the search is seeded with a multi-start greedy plus
+# swap refinement, which is also what is returned if the deadline hits.
+HEURISTIC_SEED_THRESHOLD = 5000
+_DEADLINE_CHECK_EVERY = 16
+
+
+@dataclass(frozen=True)
+class SubsetResult:
+    members: tuple[int, ...]
+    cost: float
+    optimal: bool
+    nodes_explored: int
+
+
+class GpuSubsetSearch:
+    # Picks k of a host's GPUs minimizing
+    #   span_weight * 2/k * sum(pairwise link penalty)
+    #   + numa_weight * (NUMA nodes touched - 1)
+    #   + util_weight * mean(util) / 100 + mismatch_weight * NUMA-mismatched GPUs
+    # which is the placement solver's set cost. GPUs are local indices 0..n-1.
+    def __init__(
+        self,
+        penalty: Sequence[Sequence[float]],
+        numa: Sequence[int],
+        util: Sequence[float],
+        mismatch: Sequence[bool],
+        span_weight: float,
+        numa_weight: float,
+        util_weight: float,
+        mismatch_weight: float,
+    ) -> None:
+        n = len(numa)
+        pen = [list(map(float, row)) for row in penalty]
+        # Pairs are only ever counted once, so make the matrix symmetric.
+        self.penalty = [[max(pen[i][j], pen[j][i]) for j in range(n)] for i in range(n)]
+        self.numa = list(numa)
+        self.util = [float(u) for u in util]
+        self.mismatch = [bool(m) for m in mismatch]
+        self.span_weight = span_weight
+        self.numa_weight = numa_weight
+        self.util_weight = util_weight
+        self.mismatch_weight = mismatch_weight
+        self.twin = self._twin_classes(n)
+        self._memo: dict[tuple[int, tuple[int, ...]], SubsetResult] = {}
+
+    def _twin_classes(self, n: int) -> list[int]:
+        # GPUs that are interchangeable in every cost term (same util, NUMA,
+        # mismatch and identical links to all other GPUs) share a class, so the
+        # search only ever tries them in one canonical order.
+        reps: list[int] = []
+        twin = [0] * n
+        for i in range(n):
+            for cls, r in enumerate(reps):
+                if (self.util[i], self.numa[i], self.mismatch[i]) != (self.util[r], self.numa[r], self.mismatch[r]):
+                    continue
+                row_i, row_r = self.penalty[i], self.penalty[r]
+                if all(row_i[x] == row_r[x] for x in range(n) if x != i and x != r):
+                    twin[i] = cls
+                    break
+            else:
+                twin[i] = len(reps)
+                reps.append(i)
+        return twin
+
+    def cost(self, members: Sequence[int]) -> float:
+        k = len(members)
+        if not k:
+            return 0.0
+        pen = self.penalty
+        pair_sum = sum(pen[a][b] for pos, a in enumerate(members) for b in members[pos + 1 :])
+        return (
+            self.span_weight * 2.0 * pair_sum / k
+            + self.numa_weight * (len({self.numa[i] for i in members}) - 1)
+            + self.util_weight * sum(self.util[i] for i in members) / (100.0 * k)
+            + self.mismatch_weight * sum(1 for i in members if self.mismatch[i])
+        )
+
+    def solve(
+        self, k: int, candidates: Sequence[int], time_budget_sec: float = DEFAULT_SUBSET_TIME_BUDGET_SEC
+    ) -> SubsetResult | None:
+        pool = tuple(sorted(candidates))
+        if k <= 0 or k > len(pool):
+            return None
+        key = (k, pool)
+        cached = self._memo.get(key)
+        if cached is not None:
+            return cached
+        result = self._search(k, pool, time.perf_counter() + max(0.0, time_budget_sec))
+        if result.optimal:
+            if len(self._memo) >= SUBSET_MEMO_SIZE:
+                self._memo.clear()
+            self._memo[key] = result
+        return result
+
+    def _unary(self, k: int) -> list[float]:
+        scale = self.util_weight / (100.0 * k)
+        mw = self.mismatch_weight
+        return [scale * u + (mw if m else 0.0) for u, m in zip(self.util, self.mismatch)]
+
+    def _search(self, k: int, pool: tuple[int, ...], deadline: float) -> SubsetResult:
+        # Work in positions of `order` (cheapest first, twins adjacent so the
+        # duplicate skip below is valid) with the penalty already scaled.
+        unary_all = self._unary(k)
+        order = sorted(pool, key=lambda i: (unary_all[i], self.twin[i], i))
+        n = len(order)
+        coef = self.span_weight * 2.0 / k
+        unary = [unary_all[c] for c in order]
+        node = [self.numa[c] for c in order]
+        twin = [self.twin[c] for c in order]
+        pen = [[coef * self.penalty[a][b] for b in order] for a in order]
+        numa_weight = self.numa_weight
+        links_matter = any(any(row) for row in pen)
+        # Each position's scaled links to the other positions, cheapest first.
+        near = [sorted((pen[a][b], b) for b in range(n) if b != a) for a in range(n)] if links_matter else []
+
+        thorough = comb(n, k) > HEURISTIC_SEED_THRESHOLD
+        heuristic_deadline = time.perf_counter() + (deadline - time.perf_counter()) / 2.0
+        best_cost, best = _greedy_with_swaps(k, unary, node, pen, numa_weight, heuristic_deadline, thorough)
+
+        nodes = 0
+        complete = True
+        chosen: list[int] = []
+        add = [0.0] * n  # span cost each position would add against `chosen`
+        numas: dict[int, int] = {}
+
+        def dfs(start: int, partial: float) -> None:
+            nonlocal best_cost, best, nodes, complete
+            nodes += 1
+            if nodes % _DEADLINE_CHECK_EVERY == 0 and time.perf_counter() > deadline:
+                complete = False
+                return
+            need = k - len(chosen)
+            base = partial + numa_weight * (len(numas) - 1)
+            if need == 0:
+                if base < best_cost - 1e-12:
+                    best_cost, best = base, list(chosen)
+                return
+            if n - start < need:
+                return
+            # Admissible bound, cheap form first: each GPU still to pick pays its
+            # unary cost and its links to the chosen set. If that does not prune,
+            # add half of its cheapest links to other GPUs still available (each
+            # such pair is shared by two picks).
+            values = [(unary[c] + add[c], node[c], c) for c in range(start, n)]
+            values.sort()
+            if base + _numa_aware_floor(values, need, numas, numa_weight) >= best_cost - 1e-12:
+                return
+            if need > 1 and links_matter:
+                refined = []
+                for v, nd, c in values:
+                    total, m = 0.0, need - 1
+                    for p, b in near[c]:
+                        if b >= start:
+                            total += p
+                            m -= 1
+                            if not m:
+                                break
+                    refined.append((v + total / 2.0, nd, c))
+                refined.sort()
+                if base + _numa_aware_floor(refined, need, numas, numa_weight) >= best_cost - 1e-12:
+                    return
+            prev_twin = -1
+            for c in range(start, n - need + 1):
+                if twin[c] == prev_twin:
+                    continue  # an identical twin was already tried at this depth
+                prev_twin = twin[c]
+                step = unary[c] + add[c]
+                row = pen[c]
+                for other in range(c + 1, n):
+                    add[other] += row[other]
+                chosen.append(c)
+                numas[node[c]] = numas.get(node[c], 0) + 1
+                dfs(c + 1, partial + step)
+                numas[node[c]] -= 1
+                if not numas[node[c]]:
+                    del numas[node[c]]
+                chosen.pop()
+                for other in range(c + 1, n):
+                    add[other] -= row[other]
+                if not complete:
+                    return
+
+        dfs(0, 0.0)
+        members = tuple(sorted(order[c] for c in best))
+        return SubsetResult(members=members, cost=self.cost(members), optimal=complete, nodes_explored=nodes)
+
+
+def _set_cost(members: list[int], unary: list[float], node: list[int], pen: list[list[float]], numa_weight: float) -> float:
+    pair = sum(pen[a][b] for pos, a in enumerate(members) for b in members[pos + 1 :])
+    return pair + sum(unary[c] for c in members) + numa_weight * (len({node[c] for c in members}) - 1)
+
+
+def _greedy_with_swaps(
+    k: int,
+    unary: list[float],
+    node: list[int],
+    pen: list[list[float]],
+    numa_weight: float,
+    deadline: float,
+    thorough: bool,
+) -> tuple[float, list[int]]:
+    # Greedy growth from the cheapest seed (a few seeds when the space is large),
+    # then first-improvement swaps using per-GPU link sums to the current set.
+    n = len(unary)
+    best_cost, best = float("inf"), list(range(k))
+    for seed in range(min(n, 8) if thorough else 1):
+        members = [seed]
+        add = list(pen[seed])
+        counts = {node[seed]: 1}
+        free = set(range(n)) - {seed}
+        while len(members) < k:
+            nxt = min(free, key=lambda c: (unary[c] + add[c] + (0.0 if node[c] in counts else numa_weight), c))
+            members.append(nxt)
+            counts[node[nxt]] = counts.get(node[nxt], 0) + 1
+            free.discard(nxt)
+            row = pen[nxt]
+            for c in range(n):
+                add[c] += row[c]
+        cost = _set_cost(members, unary, node, pen, numa_weight)
+        if cost < best_cost:
+            best_cost, best = cost, members
+        if time.perf_counter() > deadline:
+            break
+    if not thorough:
+        return best_cost, best
+
+    members = list(best)
+    inside = set(members)
+    link = [sum(pen[c][m] for m in members) for c in range(n)]
+    counts: dict[int, int] = {}
+    for m in members:
+        counts[node[m]] = counts.get(node[m], 0) + 1
+    improved = True
+    while improved and time.perf_counter() <= deadline:
+        improved = False
+        for pos, a in enumerate(members):
+            leaving_numa = -numa_weight if counts[node[a]] == 1 else 0.0
+            for c in range(n):
+                if c in inside:
+                    continue
+                entering_numa = 0.0 if counts.get(node[c], 0) - (node[c] == node[a]) > 0 else numa_weight
+                delta = unary[c] - unary[a] + link[c] - pen[c][a] - link[a] + leaving_numa + entering_numa
+                if delta < -1e-12:
+                    members[pos] = c
+                    inside.discard(a)
+                    inside.add(c)
+                    counts[node[a]] -= 1
+                    if not counts[node[a]]:
+                        del counts[node[a]]
+                    counts[node[c]] = counts.get(node[c], 0) + 1
+                    for x in range(n):
+                        link[x] += pen[x][c] - pen[x][a]
+                    best_cost += delta
+                    improved = True
+                    break
+            if improved:
+                break
+    return _set_cost(members, unary, node, pen, numa_weight), members
+
+
+def _numa_aware_floor(
+    values: list[tuple[float, int, int]], need: int, numas: dict[int, int], numa_weight: float
+) -> float:
+    # `values` is sorted. Either the remaining picks stay on the NUMA nodes
+    # already touched (any single node when nothing is chosen yet), or they
+    # touch at least one more node.
+    floor_any = sum(v for v, _, _ in values[:need])
+    if numa_weight <= 0:
+        return floor_any
+    best = floor_any + numa_weight
+    if numas:
+        acc, left = 0.0, need
+        for v, nd, _ in values:
+            if nd in numas:
+                acc += v
+                left -= 1
+                if not left:
+                    return min(best, acc)
+        return best
+    per_node: dict[int, list[float]] = {}
+    for v, nd, _ in values:
+        slot = per_node.setdefault(nd, [0.0, 0])
+        if slot[1] < need:
+            slot[0] += v
+            slot[1] += 1
+            if slot[1] == need:
+                best = min(best, slot[0])
+    return best
@@ -105,15 +105,38 @@ def localize_placement_action(item: PlacementItem, language: str) -> str:
             return f"迁移到 NVLink 组 GPU {target}，并将 CPU 绑核调整为 NUMA 对齐。"
         return f"Move to NVLink group GPUs {target} with NUMA-aligned CPU pinning."
 
+    if item.code == "place_inference_multi_gpu":
+        target = d.get("target_gpus", [])
+        if l == "ko":
+            return f"추론 워크로드를 GPU {target}에 하나의 분할 레플리카로 배치하고 CPU 핀닝을 NUMA 정합으로 맞추세요."
+        if l == "zh":
+            return f"将推理负载作为一个分片副本部署在 GPU {target} 上，并将 CPU 绑核调整为 NUMA 对齐。"
+        return f"Serve across GPUs {target} as one sharded replica with NUMA-aligned CPU pinning."
+
     if item.code == "consolidate_inference_mig":
         host = d.get("host_gpu")
-        profile = d.get("profile", "1g.20gb")
+        profile = d.get("profile")
+        if profile is None:
+            if l == "ko":
+                return f"추론 워크로드를 공유 GPU {host}에 통합 배치하세요 (이 GPU 모델은 MIG 미지원)."
+            if l == "zh":
+                return f"将推理负载整合到共享 GPU {host}（该 GPU 型号不支持 MIG）。"
+            return f"Consolidate on shared GPU {host} (no MIG on this GPU model) for higher inference density."
         if l == "ko":
             return f"추론 워크로드를 GPU {host}에 {profile} MIG 프로파일로 통합 배치하세요."
         if l == "zh":
             return f"将推理负载整合到 GPU {host}，使用 {profile} MIG 配置。"
         return f"Consolidate on GPU {host} via MIG profile {profile} for higher inference density."
 
+    if item.code == "defer_unplaced":
+        demand = d.get("gpu_demand", 1)
+        vram = d.get("vram_gb", 0)
+        if l == "ko":
+            return f"보류: GPU {demand}개 / VRAM {vram:g}GB를 충돌 없이 배치할 여유 용량이 없습니다."
+        if l == "zh":
+            return f"暂缓：没有可无冲突分配 {demand} 个 GPU / {vram:g}GB 显存的剩余容量。"
+        return f"Defer: no conflict-free GPU capacity left for {demand} GPU(s) / {vram:g}GB VRAM."
+
     return item.action
 
 
@@ -146,4 +169,5 @@ def localize_recommendation(rec: RecommendationResult, language: str) -> Recomme
         expected_util_after=rec.expected_util_after,
         expected_training_gain_pct=rec.expected_training_gain_pct,
         expected_latency_drop_pct=rec.expected_latency_drop_pct,
+        mig_layouts=rec.mig_layouts,
     )
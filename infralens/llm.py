@@ -1,9 +1,19 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
 import os
-from typing import Iterable
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Iterable
 
 from infralens.rules import Finding, RecommendationResult
+from infralens.tracing import traced
 
 DEFAULT_MODELS: dict[str, list[str]] = {
     "openai": [
@@ -31,6 +41,19 @@ DEFAULT_MODELS: dict[str, list[str]] = {
 }
 
 
+DEFAULT_LLM_TIMEOUT_SEC = 20.0
+DEFAULT_NARRATIVE_CACHE_TTL_SEC = 7 * 24 * 3600.0
+DEFAULT_NARRATIVE_CACHE_MAX_ENTRIES = 2000
+NARRATIVE_CACHE_VERSION = 2
+
+_CLIENT_POOL: dict[tuple[str, str], Any] = {}
+_CLIENT_POOL_LOCK = threading.Lock()
+# Shared worker threads for blocking SDK calls. Using a module-level pool (not the
+# loop's default executor) lets asyncio.run() return at the deadline instead of
+# waiting for abandoned calls to finish.
+_LLM_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="infralens-llm")
+
+
 def _normalize_provider(provider: str | None) -> str:
     p = (provider or "openai").strip().lower()
     if p in {"openai", "anthropic", "google"}:
@@ -60,9 +83,7 @@ def list_provider_models(provider: str, api_key: str | None) -> tuple[list[str],
 
     try:
         if p == "openai":
-            from openai import OpenAI
-
-            client = OpenAI(api_key=effective_api_key)
+            client = _get_client(p, effective_api_key)
             response = client.models.list()
             ids: list[str] = []
             try:
@@ -85,16 +106,12 @@ def list_provider_models(provider: str, api_key: str | None) -> tuple[list[str],
                 }
             )
         elif p == "anthropic":
-            from anthropic import Anthropic
-
-            client = Anthropic(api_key=effective_api_key)
+            client = _get_client(p, effective_api_key)
             response = client.models.list()
             candidate_ids = sorted({m.id for m in response.data if isinstance(getattr(m, "id", None), str)})
         else:
-            import google.generativeai as genai
-
-            genai.configure(api_key=effective_api_key)
-            models = genai.list_models()
+            client = _get_client(p, effective_api_key)
+            models = client.list_models()
             candidate_ids = sorted(
                 {
                     m.name.split("models/")[-1]
@@ -158,35 +175,95 @@ def _fallback_recommendation_text(rec: RecommendationResult, language: str) -> s
     if language.startswith("ko"):
         lines.append(
             f"예상 효과: GPU 활용률 {rec.expected_util_before}% -> {rec.expected_util_after}%, "
-            f"학습 처리량 +{rec.expected_training_gain_pct}%, 추론 레이턴시 -{rec.expected_latency_drop_pct}%."
+            f"학습 처리량 {rec.expected_training_gain_pct:+d}%, 추론 레이턴시 {-rec.expected_latency_drop_pct:+d}%."
         )
     elif language.startswith("zh"):
         lines.append(
             f"预期效果：GPU 利用率 {rec.expected_util_before}% -> {rec.expected_util_after}%，"
-            f"训练吞吐 +{rec.expected_training_gain_pct}%，推理时延 -{rec.expected_latency_drop_pct}%。"
+            f"训练吞吐 {rec.expected_training_gain_pct:+d}%，推理时延 {-rec.expected_latency_drop_pct:+d}%。"
         )
     else:
         lines.append(
             f"Expected impact: GPU utilization {rec.expected_util_before}% -> {rec.expected_util_after}%, "
-            f"training throughput +{rec.expected_training_gain_pct}%, inference latency -{rec.expected_latency_drop_pct}%."
+            f"training throughput {rec.expected_training_gain_pct:+d}%, inference latency {-rec.expected_latency_drop_pct:+d}%."
         )
     return "\n".join(lines)
 
 
+def _build_client(provider: str, api_key: str) -> Any:
+    if provider == "openai":
+        from openai import OpenAI
+
+        return OpenAI(api_key=api_key)
+
+    if provider == "anthropic":
+        from anthropic import Anthropic
+
+        return Anthropic(api_key=api_key)
+
+    return _GoogleClient(api_key)
+
+
+class _GoogleClient:
+    # google.generativeai keeps one process-wide API key, so each call sets this
+    # client's key and runs under a lock; otherwise a pooled entry would send
+    # requests on whichever key was configured last.
+    _lock = threading.Lock()
+
+    def __init__(self, api_key: str) -> None:
+        self.api_key = api_key
+
+    def _call(self, fn: Any) -> Any:
+        import google.generativeai as genai
+
+        with self._lock:
+            genai.configure(api_key=self.api_key)
+            return fn(genai)
+
+    def list_models(self) -> list[Any]:
+        return self._call(lambda genai: list(genai.list_models()))
+
+    def GenerativeModel(self, model: str) -> "_GoogleModel":
+        return _GoogleModel(self, model)
+
+
+class _GoogleModel:
+    def __init__(self, client: _GoogleClient, model: str) -> None:
+        self.client = client
+        self.model = model
+
+    def generate_content(self, prompt: str) -> Any:
+        return self.client._call(lambda genai: genai.GenerativeModel(self.model).generate_content(prompt))
+
+
+def _get_client(provider: str, api_key: str) -> Any:
+    key = (provider, api_key)
+    client = _CLIENT_POOL.get(key)
+    if client is not None:
+        return client
+    with _CLIENT_POOL_LOCK:
+        client = _CLIENT_POOL.get(key)
+        if client is None:
+            client = _build_client(provider, api_key)
+            _CLIENT_POOL[key] = client
+    return client
+
+
+def clear_client_pool() -> None:
+    with _CLIENT_POOL_LOCK:
+        _CLIENT_POOL.clear()
+
+
+@traced("llm")
 def _invoke_model(provider: str, api_key: str, model: str, prompt: str) -> str:
     p = _normalize_provider(provider)
+    client = _get_client(p, api_key)
 
     if p == "openai":
-        from openai import OpenAI
-
-        client = OpenAI(api_key=api_key)
         response = client.responses.create(model=model, input=prompt, max_output_tokens=700)
         return (response.output_text or "").strip()
 
     if p == "anthropic":
-        from anthropic import Anthropic
-
-        client = Anthropic(api_key=api_key)
         response = client.messages.create(
             model=model,
             max_tokens=700,
@@ -199,15 +276,162 @@ def _invoke_model(provider: str, api_key: str, model: str, prompt: str) -> str:
                 parts.append(txt)
         return "\n".join(parts).strip()
 
-    import google.generativeai as genai
-
-    genai.configure(api_key=api_key)
-    gen_model = genai.GenerativeModel(model)
+    gen_model = client.GenerativeModel(model)
     response = gen_model.generate_content(prompt)
     text = getattr(response, "text", None)
     return text.strip() if isinstance(text, str) else ""
 
 
+def _analysis_prompt(findings: list[Finding], score: int, grade: str, language: str) -> str:
+    prompt_language_en, prompt_language_native = _lang_spec(language)
+    return (
+        "You are a GPU infrastructure optimization expert. "
+        f"Explain bottlenecks clearly for non-expert infra engineers in {prompt_language_en} ({prompt_language_native}).\n\n"
+        f"Efficiency: {score}/100 ({grade})\n"
+        + "\n".join([f"- {f.category}: {f.message}" for f in findings])
+    )
+
+
+def _recommendation_prompt(rec: RecommendationResult, language: str) -> str:
+    prompt_language_en, prompt_language_native = _lang_spec(language)
+    bullet_plan = "\n".join([f"- {i.workload}: {i.action}" for i in rec.items])
+    return (
+        "You are a GPU infra architect. "
+        f"Produce concise actionable recommendations in {prompt_language_en} ({prompt_language_native}).\n\n"
+        f"Placement candidates:\n{bullet_plan}\n"
+        f"Expected util: {rec.expected_util_before}->{rec.expected_util_after}\n"
+        f"Expected training gain: {rec.expected_training_gain_pct:+d}%\n"
+        f"Expected latency change: {-rec.expected_latency_drop_pct:+d}%"
+    )
+
+
+class NarrativeCache:
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        ttl_sec: float = DEFAULT_NARRATIVE_CACHE_TTL_SEC,
+        max_entries: int = DEFAULT_NARRATIVE_CACHE_MAX_ENTRIES,
+    ) -> None:
+        self.path = Path(path)
+        self.ttl_sec = float(ttl_sec)
+        self.max_entries = max(1, int(max_entries))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS narratives ("
+                "key TEXT PRIMARY KEY, text TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS narratives_accessed ON narratives (accessed)")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=5.0)
+
+    def get(self, key: str) -> str | None:
+        now = time.time()
+        try:
+            with closing(self._connect()) as conn, conn:
+                row = conn.execute("SELECT text, created FROM narratives WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return None
+                if now - row[1] > self.ttl_sec:
+                    conn.execute("DELETE FROM narratives WHERE key = ?", (key,))
+                    return None
+                conn.execute("UPDATE narratives SET accessed = ? WHERE key = ?", (now, key))
+                return row[0]
+        except sqlite3.Error:
+            return None
+
+    def put(self, key: str, text: str) -> None:
+        now = time.time()
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO narratives (key, text, created, accessed) VALUES (?, ?, ?, ?)",
+                    (key, text, now, now),
+                )
+                conn.execute("DELETE FROM narratives WHERE created < ?", (now - self.ttl_sec,))
+                conn.execute(
+                    "DELETE FROM narratives WHERE key NOT IN "
+                    "(SELECT key FROM narratives ORDER BY accessed DESC LIMIT ?)",
+                    (self.max_entries,),
+                )
+        except sqlite3.Error:
+            pass
+
+    def clear(self) -> None:
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM narratives")
+
+    def __len__(self) -> int:
+        with closing(self._connect()) as conn:
+            return int(conn.execute("SELECT COUNT(*) FROM narratives").fetchone()[0])
+
+
+_DEFAULT_CACHE: NarrativeCache | None = None
+_DEFAULT_CACHE_PATH: str | None = None
+
+
+def default_narrative_cache() -> NarrativeCache | None:
+    global _DEFAULT_CACHE, _DEFAULT_CACHE_PATH
+    path = os.getenv("INFRALENS_NARRATIVE_CACHE", "").strip()
+    if path.lower() in {"off", "0", "false", "none"}:
+        return None
+    path = path or str(Path.home() / ".cache" / "infralens" / "narratives.sqlite3")
+    if _DEFAULT_CACHE is None or _DEFAULT_CACHE_PATH != path:
+        try:
+            _DEFAULT_CACHE = NarrativeCache(path)
+        except (OSError, sqlite3.Error):
+            return None
+        _DEFAULT_CACHE_PATH = path
+    return _DEFAULT_CACHE
+
+
+def narrative_cache_key(kind: str, inputs: dict[str, Any], provider: str, model: str) -> str:
+    payload = {
+        "version": NARRATIVE_CACHE_VERSION,
+        "kind": kind,
+        "provider": provider,
+        "model": model,
+        "inputs": inputs,
+    }
+    blob = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def _prompt_cache_inputs(prompt: str) -> dict[str, Any]:
+    # The rendered prompt is exactly what the model sees: rule messages and
+    # actions can carry values (e.g. "{count} GPUs ...") that no data field does.
+    return {"prompt": prompt}
+
+
+def _resolve_cache(cache: NarrativeCache | None, use_cache: bool) -> NarrativeCache | None:
+    if not use_cache:
+        return None
+    return cache if cache is not None else default_narrative_cache()
+
+
+def _cached_invoke(
+    provider: str,
+    api_key: str,
+    model: str,
+    prompt: str,
+    fallback_text: str,
+    cache: NarrativeCache | None,
+    key: str | None,
+) -> tuple[str, str]:
+    if cache is not None and key is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached, f"{provider}:cache_hit"
+    text = _invoke_model(provider, api_key, model, prompt)
+    if not text:
+        return fallback_text, provider
+    if cache is not None and key is not None:
+        cache.put(key, text)
+        return text, f"{provider}:cache_miss"
+    return text, provider
+
+
 def generate_bottleneck_analysis(
     findings: list[Finding],
     score: int,
@@ -216,26 +440,25 @@ def generate_bottleneck_analysis(
     provider: str = "openai",
     api_key: str | None = None,
     model: str | None = None,
+    cache: NarrativeCache | None = None,
+    use_cache: bool = True,
 ) -> tuple[str, str]:
     p = _normalize_provider(provider)
     effective_api_key = (api_key or "").strip() or os.getenv(_api_key_env(p))
     effective_model = (model or "").strip() or _default_model(p)
 
     fallback_text = _fallback_analysis_text(findings, score, grade, language)
-    prompt_language_en, prompt_language_native = _lang_spec(language)
 
     if not effective_api_key:
         return fallback_text, f"fallback:{p}:missing_api_key"
 
+    narrative_cache = _resolve_cache(cache, use_cache)
     try:
-        prompt = (
-            "You are a GPU infrastructure optimization expert. "
-            f"Explain bottlenecks clearly for non-expert infra engineers in {prompt_language_en} ({prompt_language_native}).\n\n"
-            f"Efficiency: {score}/100 ({grade})\n"
-            + "\n".join([f"- {f.category}: {f.message}" for f in findings])
-        )
-        text = _invoke_model(p, effective_api_key, effective_model, prompt)
-        return (text or fallback_text), p
+        prompt = _analysis_prompt(findings, score, grade, language)
+        key = None
+        if narrative_cache is not None:
+            key = narrative_cache_key("analysis", _prompt_cache_inputs(prompt), p, effective_model)
+        return _cached_invoke(p, effective_api_key, effective_model, prompt, fallback_text, narrative_cache, key)
     except Exception as exc:
         return fallback_text, f"fallback:{p}:{exc.__class__.__name__}"
 
@@ -246,29 +469,25 @@ def _generate_recommendation_narrative(
     provider: str = "openai",
     api_key: str | None = None,
     model: str | None = None,
+    cache: NarrativeCache | None = None,
+    use_cache: bool = True,
 ) -> tuple[str, str]:
     p = _normalize_provider(provider)
     effective_api_key = (api_key or "").strip() or os.getenv(_api_key_env(p))
     effective_model = (model or "").strip() or _default_model(p)
 
     fallback_text = _fallback_recommendation_text(rec, language)
-    prompt_language_en, prompt_language_native = _lang_spec(language)
 
     if not effective_api_key:
         return fallback_text, f"fallback:{p}:missing_api_key"
 
+    narrative_cache = _resolve_cache(cache, use_cache)
     try:
-        bullet_plan = "\n".join([f"- {i.workload}: {i.action}" for i in rec.items])
-        prompt = (
-            "You are a GPU infra architect. "
-            f"Produce concise actionable recommendations in {prompt_language_en} ({prompt_language_native}).\n\n"
-            f"Placement candidates:\n{bullet_plan}\n"
-            f"Expected util: {rec.expected_util_before}->{rec.expected_util_after}\n"
-            f"Expected training gain: +{rec.expected_training_gain_pct}%\n"
-            f"Expected latency drop: -{rec.expected_latency_drop_pct}%"
-        )
-        text = _invoke_model(p, effective_api_key, effective_model, prompt)
-        return (text or fallback_text), p
+        prompt = _recommendation_prompt(rec, language)
+        key = None
+        if narrative_cache is not None:
+            key = narrative_cache_key("recommendation", _prompt_cache_inputs(prompt), p, effective_model)
+        return _cached_invoke(p, effective_api_key, effective_model, prompt, fallback_text, narrative_cache, key)
     except Exception as exc:
         return fallback_text, f"fallback:{p}:{exc.__class__.__name__}"
 
@@ -279,6 +498,8 @@ def generate_recommendation_narrative(
     provider: str = "openai",
     api_key: str | None = None,
     model: str | None = None,
+    cache: NarrativeCache | None = None,
+    use_cache: bool = True,
 ) -> tuple[str, str]:
     return _generate_recommendation_narrative(
         rec,
@@ -286,4 +507,125 @@ def generate_recommendation_narrative(
         provider=provider,
         api_key=api_key,
         model=model,
+        cache=cache,
+        use_cache=use_cache,
     )
+
+
+async def _invoke_with_deadline(
+    provider: str,
+    api_key: str | None,
+    model: str,
+    prompt: str,
+    fallback_text: str,
+    timeout_sec: float,
+    cache: NarrativeCache | None = None,
+    key: str | None = None,
+) -> tuple[str, str]:
+    if not api_key:
+        return fallback_text, f"fallback:{provider}:missing_api_key"
+    if cache is not None and key is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached, f"{provider}:cache_hit"
+    try:
+        loop = asyncio.get_running_loop()
+        text = await asyncio.wait_for(
+            loop.run_in_executor(_LLM_EXECUTOR, _invoke_model, provider, api_key, model, prompt),
+            timeout=timeout_sec,
+        )
+    except asyncio.TimeoutError:
+        return fallback_text, f"fallback:{provider}:timeout"
+    except Exception as exc:
+        return fallback_text, f"fallback:{provider}:{exc.__class__.__name__}"
+    if not text:
+        return fallback_text, provider
+    if cache is not None and key is not None:
+        cache.put(key, text)
+        return text, f"{provider}:cache_miss"
+    return text, provider
+
+
+async def agenerate_narratives(
+    findings: list[Finding],
+    score: int,
+    grade: str,
+    rec: RecommendationResult,
+    language: str = "ko",
+    provider: str = "openai",
+    api_key: str | None = None,
+    model: str | None = None,
+    timeout_sec: float = DEFAULT_LLM_TIMEOUT_SEC,
+    cache: NarrativeCache | None = None,
+    use_cache: bool = True,
+) -> tuple[tuple[str, str], tuple[str, str]]:
+    p = _normalize_provider(provider)
+    effective_api_key = (api_key or "").strip() or os.getenv(_api_key_env(p))
+    effective_model = (model or "").strip() or _default_model(p)
+
+    narrative_cache = _resolve_cache(cache, use_cache) if effective_api_key else None
+    analysis_prompt = _analysis_prompt(findings, score, grade, language)
+    rec_prompt = _recommendation_prompt(rec, language)
+    analysis_key = rec_key = None
+    if narrative_cache is not None:
+        analysis_key = narrative_cache_key("analysis", _prompt_cache_inputs(analysis_prompt), p, effective_model)
+        rec_key = narrative_cache_key("recommendation", _prompt_cache_inputs(rec_prompt), p, effective_model)
+
+    analysis, recommendation = await asyncio.gather(
+        _invoke_with_deadline(
+            p,
+            effective_api_key,
+            effective_model,
+            analysis_prompt,
+            _fallback_analysis_text(findings, score, grade, language),
+            timeout_sec,
+            narrative_cache,
+            analysis_key,
+        ),
+        _invoke_with_deadline(
+            p,
+            effective_api_key,
+            effective_model,
+            rec_prompt,
+            _fallback_recommendation_text(rec, language),
+            timeout_sec,
+            narrative_cache,
+            rec_key,
+        ),
+    )
+    return analysis, recommendation
+
+
+def generate_narratives(
+    findings: list[Finding],
+    score: int,
+    grade: str,
+    rec: RecommendationResult,
+    language: str = "ko",
+    provider: str = "openai",
+    api_key: str | None = None,
+    model: str | None = None,
+    timeout_sec: float = DEFAULT_LLM_TIMEOUT_SEC,
+    cache: NarrativeCache | None = None,
+    use_cache: bool = True,
+) -> tuple[tuple[str, str], tuple[str, str]]:
+    coro = agenerate_narratives(
+        findings,
+        score,
+        grade,
+        rec,
+        language=language,
+        provider=provider,
+        api_key=api_key,
+        model=model,
+        timeout_sec=timeout_sec,
+        cache=cache,
+        use_cache=use_cache,
+    )
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    # Called from inside an event loop: run on a private loop in a helper thread.
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import json
 import re
-import statistics
 import subprocess
 import sys
 import time
@@ -11,6 +10,7 @@ from datetime import datetime, timezone
 from pathlib import Path
 
 from infralens.data import sample_scenarios, workloads_for_scenario
+from infralens.quantiles import LatencyHistogram
 from infralens.rules import build_placement_recommendation, detect_bottlenecks
 from infralens.scoring import calculate_efficiency_score, infer_workload_profile
 
@@ -49,18 +49,19 @@ def measure_test_pass_rate() -> TestSummary:
     return _parse_test_summary(output, proc.returncode)
 
 
-def _p95(values: list[float]) -> float:
-    if not values:
-        return 0.0
-    sorted_vals = sorted(values)
-    idx = min(len(sorted_vals) - 1, int(0.95 * (len(sorted_vals) - 1)))
-    return sorted_vals[idx]
+def response_time_summary(histograms: dict[str, LatencyHistogram]) -> dict[str, float]:
+    out: dict[str, float] = {}
+    for stage, hist in histograms.items():
+        summary = hist.summary()
+        out[f"{stage}_avg"] = summary["mean"]
+        for key in ("p50", "p95", "p99", "max"):
+            out[f"{stage}_{key}"] = summary[key]
+    return out
 
 
 def measure_response_and_recommendation(iterations: int) -> dict:
     scenarios = sample_scenarios()
-    score_times: list[float] = []
-    pipeline_times: list[float] = []
+    histograms = {"score": LatencyHistogram(), "analysis_pipeline": LatencyHistogram()}
     recommendation_attempts = 0
     bottleneck_scenarios = 0
     recommended_scenarios = 0
@@ -73,12 +74,12 @@ def measure_response_and_recommendation(iterations: int) -> dict:
 
             t0 = time.perf_counter()
             score = calculate_efficiency_score(scenario, profile=profile)
-            score_times.append(time.perf_counter() - t0)
+            histograms["score"].record(time.perf_counter() - t0)
 
             t1 = time.perf_counter()
             findings = detect_bottlenecks(scenario, workloads, profile=profile)
             rec = build_placement_recommendation(scenario, workloads, score.score, profile=profile)
-            pipeline_times.append(time.perf_counter() - t1)
+            histograms["analysis_pipeline"].record(time.perf_counter() - t1)
 
             recommendation_attempts += 1
             has_bottleneck = len(findings) > 0
@@ -94,12 +95,8 @@ def measure_response_and_recommendation(iterations: int) -> dict:
                 consistency_successes += 1
 
     return {
-        "response_time_sec": {
-            "score_avg": round(statistics.mean(score_times), 6) if score_times else 0.0,
-            "score_p95": round(_p95(score_times), 6),
-            "analysis_pipeline_avg": round(statistics.mean(pipeline_times), 6) if pipeline_times else 0.0,
-            "analysis_pipeline_p95": round(_p95(pipeline_times), 6),
-        },
+        "response_time_sec": response_time_summary(histograms),
+        "latency_histograms": {stage: hist.to_dict() for stage, hist in histograms.items()},
         "recommendation_consistency": {
             "attempts": recommendation_attempts,
             "bottleneck_scenarios": bottleneck_scenarios,
@@ -0,0 +1,298 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from math import ceil
+from typing import Any, Collection, Mapping
+
+from infralens.data import Workload
+
+MEMORY_SLICES = 8
+COMPUTE_SLICES = 7
+
+
+@dataclass(frozen=True)
+class MigProfile:
+    name: str
+    compute_slices: int
+    memory_gb: int
+    # Legal placements as bitmasks over the GPU's eight memory slices; the
+    # lowest set bit is the placement start index `nvidia-smi mig -cgi` takes.
+    placements: tuple[int, ...]
+
+    @property
+    def memory_slices(self) -> int:
+        return bin(self.placements[0]).count("1")
+
+
+def _profile(compute: int, memory_gb: int, width: int, starts: tuple[int, ...]) -> MigProfile:
+    mask = (1 << width) - 1
+    return MigProfile(f"{compute}g.{memory_gb}gb", compute, memory_gb, tuple(mask << s for s in starts))
+
+
+def _catalog(one: int, one_wide: int, two: int, three: int, four: int, seven: int) -> tuple[MigProfile, ...]:
+    # Same placement grid on every MIG-capable part, only the memory per
+    # slice differs. 1g at start 6 leaves memory slice 7 unusable, as on the
+    # real hardware.
+    return (
+        _profile(1, one, 1, (0, 1, 2, 3, 4, 5, 6)),
+        _profile(1, one_wide, 2, (0, 2, 4, 6)),
+        _profile(2, two, 2, (0, 2, 4)),
+        _profile(3, three, 4, (0, 4)),
+        _profile(4, four, 4, (0,)),
+        _profile(7, seven, 8, (0,)),
+    )
+
+
+MIG_PROFILES: dict[str, tuple[MigProfile, ...]] = {
+    "A100-40GB": _catalog(5, 10, 10, 20, 20, 40),
+    "A100-80GB": _catalog(10, 20, 20, 40, 40, 80),
+    "H100-80GB": _catalog(10, 20, 20, 40, 40, 80),
+    "H100-94GB": _catalog(12, 24, 24, 47, 47, 94),
+    "H200-141GB": _catalog(18, 35, 35, 71, 71, 141),
+}
+
+
+@dataclass
+class MigInstance:
+    workload: str
+    host: str
+    gpu_id: int
+    profile: str
+    start: int
+    index: int = 0  # MIG device index on the GPU (instances ordered by start)
+
+
+@dataclass
+class MigLayout:
+    host: str
+    gpu_id: int
+    model: str
+    used_mask: int
+    instances: list[MigInstance] = field(default_factory=list)
+
+    @property
+    def profiles(self) -> list[str]:
+        return [inst.profile for inst in self.instances]
+
+    @property
+    def free_slices(self) -> int:
+        return MEMORY_SLICES - bin(self.used_mask).count("1")
+
+
+@dataclass
+class MigPlan:
+    layouts: list[MigLayout]
+    instances: dict[str, MigInstance]
+    unplaced: list[str]
+    gpus_used: int
+    lower_bound: int
+    optimal: bool
+    elapsed_sec: float
+
+
+def mig_model_for(scenario: dict[str, Any]) -> str | None:
+    label = f"{scenario.get('model') or ''} {scenario.get('name') or ''}".upper()
+    total = float(scenario.get("total_vram_gb", 0) or 0)
+    if "H200" in label:
+        return "H200-141GB"
+    if "H100" in label:
+        return "H100-94GB" if total > 88 else "H100-80GB"
+    if "A100" in label:
+        return "A100-40GB" if 0 < total <= 48 else "A100-80GB"
+    return None
+
+
+def profile_for(model: str, vram_gb: float) -> MigProfile | None:
+    # Smallest memory that fits, then the fewest compute slices so more
+    # instances share the GPU.
+    fits = [p for p in MIG_PROFILES[model] if p.memory_gb >= vram_gb]
+    return min(fits, key=lambda p: (p.memory_gb, p.compute_slices)) if fits else None
+
+
+@lru_cache(maxsize=None)
+def _fit_table(model: str) -> tuple[tuple[int, ...], ...]:
+    # best[profile][used_mask] -> placement to use (0 when nothing fits). Among
+    # legal placements pick the one leaving the most placements of any
+    # profile open, so small instances do not fragment the grid.
+    profiles = MIG_PROFILES[model]
+    all_placements = [pl for p in profiles for pl in p.placements]
+    flex = [sum(1 for pl in all_placements if not pl & mask) for mask in range(1 << MEMORY_SLICES)]
+    table = []
+    for p in profiles:
+        row = []
+        for mask in range(1 << MEMORY_SLICES):
+            legal = [pl for pl in p.placements if not pl & mask]
+            row.append(max(legal, key=lambda pl: (flex[mask | pl], -pl)) if legal else 0)
+        table.append(tuple(row))
+    return tuple(table)
+
+
+def _start(placement: int) -> int:
+    return (placement & -placement).bit_length() - 1
+
+
+def _reindex(layout: MigLayout) -> None:
+    layout.instances.sort(key=lambda inst: inst.start)
+    for idx, inst in enumerate(layout.instances):
+        inst.index = idx
+
+
+def instance_upgrades(layout: MigLayout) -> list[tuple[MigInstance, MigProfile, int]]:
+    # Bigger profiles (more compute, at least as much memory) each instance
+    # could move to using slices nobody else on the GPU holds.
+    profiles = MIG_PROFILES[layout.model]
+    by_name = {p.name: p for p in profiles}
+    out: list[tuple[MigInstance, MigProfile, int]] = []
+    for inst in layout.instances:
+        current = by_name[inst.profile]
+        own = next(pl for pl in current.placements if _start(pl) == inst.start)
+        others = layout.used_mask & ~own
+        for p in profiles:
+            if p.compute_slices <= current.compute_slices or p.memory_gb < current.memory_gb:
+                continue
+            legal = [pl for pl in p.placements if not pl & others]
+            if legal:
+                out.append((inst, p, legal[0]))
+    return out
+
+
+def apply_upgrade(layout: MigLayout, inst: MigInstance, profile: MigProfile, placement: int) -> None:
+    current = next(p for p in MIG_PROFILES[layout.model] if p.name == inst.profile)
+    own = next(pl for pl in current.placements if _start(pl) == inst.start)
+    layout.used_mask = (layout.used_mask & ~own) | placement
+    inst.profile = profile.name
+    inst.start = _start(placement)
+    _reindex(layout)
+
+
+def compute_slices_of(profile: str) -> int:
+    return int(profile.split("g.", 1)[0])
+
+
+def compute_fraction_of(profile: str, model: str | None = None) -> float:
+    # Share of the GPU's SMs, measured against the model's full-GPU profile.
+    profiles = MIG_PROFILES.get(model or "")
+    total = max(p.compute_slices for p in profiles) if profiles else COMPUTE_SLICES
+    return compute_slices_of(profile) / total
+
+
+def mig_setup_commands(layout: MigLayout) -> list[str]:
+    tuples = ",".join(f"{inst.profile}:{inst.start}" for inst in layout.instances)
+    g = layout.gpu_id
+    return [
+        f"nvidia-smi -i {g} -mig 1",
+        f"nvidia-smi mig -i {g} -dci && nvidia-smi mig -i {g} -dgi",
+        f"nvidia-smi mig -i {g} -cgi {tuples} -C",
+    ]
+
+
+def plan_mig_partitions(
+    scenarios: Mapping[str, dict[str, Any]],
+    workloads: list[Workload],
+    reserved: Collection[tuple[str, int]] = (),
+) -> MigPlan:
+    # Best-fit decreasing over GPUs bucketed by (model, occupied slices): a
+    # fleet has at most 256 distinct states per model, so each workload only
+    # looks at states, never at individual GPUs.
+    t0 = time.perf_counter()
+    reserved_set = set(reserved)
+    free: dict[str, list[tuple[float, int, str, int]]] = {}
+    for order, (host, scenario) in enumerate(scenarios.items()):
+        model = mig_model_for(scenario)
+        if model is None:
+            continue
+        for g in scenario.get("gpus", []):
+            if (str(host), int(g["id"])) in reserved_set:
+                continue
+            free.setdefault(model, []).append((float(g.get("gpu_util", 0.0)), order, str(host), int(g["id"])))
+    for queue in free.values():
+        queue.sort(reverse=True)  # pop() yields the least busy GPU
+
+    models = sorted(free)
+    jobs: list[tuple[Workload, dict[str, int]]] = []
+    unplaced: list[str] = []
+    for w in workloads:
+        choice = {}
+        for m in models:
+            p = profile_for(m, float(w.vram_gb))
+            if p is not None:
+                choice[m] = MIG_PROFILES[m].index(p)
+        if choice:
+            jobs.append((w, choice))
+        else:
+            unplaced.append(w.name)
+
+    def _size(choice: dict[str, int]) -> tuple[int, int]:
+        return min((MIG_PROFILES[m][i].memory_slices, MIG_PROFILES[m][i].compute_slices) for m, i in choice.items())
+
+    jobs.sort(key=lambda j: (_size(j[1]), j[0].vram_gb), reverse=True)
+    need_mem = sum(_size(c)[0] for _, c in jobs)
+    need_compute = sum(_size(c)[1] for _, c in jobs)
+
+    layouts: list[MigLayout] = []
+    states: dict[str, dict[int, list[int]]] = {m: {} for m in models}
+    tables = {m: _fit_table(m) for m in models}
+    instances: dict[str, MigInstance] = {}
+
+    for w, choice in jobs:
+        best: tuple[Any, ...] | None = None
+        for m, pi in choice.items():
+            row = tables[m][pi]
+            for mask, open_gpus in states[m].items():
+                pl = row[mask] if open_gpus else 0
+                if not pl:
+                    continue
+                # Fewest slices for this job, then the tightest fit.
+                key = (MIG_PROFILES[m][pi].memory_slices, -bin(mask | pl).count("1"), m, mask)
+                if best is None or key < best[0]:
+                    best = (key, m, pi, mask, pl)
+        if best is not None:
+            _, m, pi, mask, pl = best
+            lid = states[m][mask].pop()
+        else:
+            opened = None
+            for m, pi in choice.items():
+                if not free[m]:
+                    continue
+                p = MIG_PROFILES[m][pi]
+                key = (p.memory_slices, p.memory_gb - float(w.vram_gb), free[m][-1][0], m)
+                if opened is None or key < opened[0]:
+                    opened = (key, m, pi)
+            if opened is None:
+                unplaced.append(w.name)
+                continue
+            _, m, pi = opened
+            _, _, host, gpu_id = free[m].pop()
+            lid = len(layouts)
+            layouts.append(MigLayout(host=host, gpu_id=gpu_id, model=m, used_mask=0))
+            mask, pl = 0, tables[m][pi][0]
+        layout = layouts[lid]
+        layout.used_mask = mask | pl
+        inst = MigInstance(w.name, layout.host, layout.gpu_id, MIG_PROFILES[m][pi].name, _start(pl))
+        layout.instances.append(inst)
+        instances[w.name] = inst
+        states[m].setdefault(layout.used_mask, []).append(lid)
+
+    for layout in layouts:
+        _reindex(layout)
+
+    lower_bound = max(ceil(need_mem / MEMORY_SLICES), ceil(need_compute / COMPUTE_SLICES)) if jobs else 0
+    placed_all = len(instances) == len(jobs)
+    return MigPlan(
+        layouts=layouts,
+        instances=instances,
+        unplaced=unplaced,
+        gpus_used=len(layouts),
+        lower_bound=lower_bound,
+        optimal=placed_all and len(layouts) == lower_bound,
+        elapsed_sec=time.perf_counter() - t0,
+    )
+
+
+def plan_mig(
+    scenario: dict[str, Any], workloads: list[Workload], reserved_gpus: Collection[int] = ()
+) -> MigPlan:
+    host = str(scenario.get("name", "local"))
+    return plan_mig_partitions({host: scenario}, workloads, [(host, int(g)) for g in reserved_gpus])
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+from infralens.parsers import parse_uploaded_telemetry
+from infralens.schema import default_registry
+from infralens.tracing import span
+
+DEFAULT_PARSE_CACHE_MAX_BYTES = 256 * 1024 * 1024
+PARSE_CACHE_VERSION = 4
+
+
+def _column_dtype(values: list[Any]) -> str | None:
+    kinds = set(map(type, values))
+    if kinds == {int}:
+        return "<i8"
+    if kinds == {float}:
+        return "<f8"
+    if kinds == {str}:
+        if any(v.endswith("\x00") for v in values):
+            return None  # numpy strips trailing NULs from fixed-width strings
+        return f"<U{max(1, max(map(len, values)))}"
+    return None
+
+
+def _encode_gpus(gpus: list[dict[str, Any]]) -> Any:
+    import numpy as np
+
+    if not gpus:
+        return None
+    names = list(gpus[0])
+    if any(list(g) != names for g in gpus):
+        return None
+    fields = []
+    for name in names:
+        dtype = _column_dtype([g[name] for g in gpus])
+        if dtype is None:
+            return None
+        fields.append((name, dtype))
+    table = np.empty(len(gpus), dtype=fields)
+    try:
+        for name in names:
+            table[name] = [g[name] for g in gpus]
+    except OverflowError:
+        return None
+    return table
+
+
+def _decode_gpus(table: Any) -> list[dict[str, Any]]:
+    names = list(table.dtype.names)
+    columns = [table[name].tolist() for name in names]
+    return [dict(zip(names, row)) for row in zip(*columns)]
+
+
+class TelemetryParseCache:
+    def __init__(self, path: str | os.PathLike[str], max_bytes: int = DEFAULT_PARSE_CACHE_MAX_BYTES) -> None:
+        self.path = Path(path)
+        self.max_bytes = max(0, int(max_bytes))
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+    def _files(self, key: str) -> tuple[Path, Path]:
+        return self.path / f"{key}.npy", self.path / f"{key}.json"
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        import numpy as np
+
+        table_path, meta_path = self._files(key)
+        # Every column is decoded to Python objects anyway, so the table is read
+        # whole rather than memory-mapped. A truncated or hand-edited sidecar is
+        # a miss, never an error.
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            if meta["version"] != PARSE_CACHE_VERSION:
+                return None
+            scenario = dict(meta["scenario"])
+            gpus = _decode_gpus(np.load(table_path, allow_pickle=False))
+            if len(gpus) != meta["rows"]:
+                return None
+            os.utime(meta_path)
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None
+        scenario["gpus"] = gpus
+        return scenario
+
+    def put(self, key: str, scenario: dict[str, Any]) -> bool:
+        import numpy as np
+
+        table = _encode_gpus(scenario.get("gpus") or [])
+        if table is None:
+            return False
+        header = {k: v for k, v in scenario.items() if k != "gpus"}
+        meta = {"version": PARSE_CACHE_VERSION, "rows": len(table), "scenario": header}
+        table_path, meta_path = self._files(key)
+        try:
+            # The meta file is the commit marker, so it is replaced last.
+            with tempfile.NamedTemporaryFile(dir=self.path, suffix=".npy.tmp", delete=False) as f:
+                np.save(f, table, allow_pickle=False)
+            os.replace(f.name, table_path)
+            with tempfile.NamedTemporaryFile("w", dir=self.path, suffix=".json.tmp", delete=False, encoding="utf-8") as f:
+                json.dump(meta, f)
+            os.replace(f.name, meta_path)
+        except (OSError, TypeError, ValueError):
+            return False
+        self.evict()
+        return True
+
+    def entries(self) -> list[tuple[str, int, float]]:
+        out = []
+        for meta_path in self.path.glob("*.json"):
+            table_path = meta_path.with_suffix(".npy")
+            try:
+                size = meta_path.stat().st_size + table_path.stat().st_size
+                accessed = meta_path.stat().st_mtime
+            except OSError:
+                continue
+            out.append((meta_path.stem, size, accessed))
+        return out
+
+    def size_bytes(self) -> int:
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self) -> int:
+        entries = sorted(self.entries(), key=lambda e: e[2])
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for key, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(key)
+            total -= size
+            removed += 1
+        return removed
+
+    def _remove(self, key: str) -> None:
+        table_path, meta_path = self._files(key)
+        for p in (meta_path, table_path):
+            try:
+                p.unlink()
+            except FileNotFoundError:
+                pass
+
+    def clear(self) -> None:
+        for key, _, _ in self.entries():
+            self._remove(key)
+
+    def __len__(self) -> int:
+        return len(self.entries())
+
+
+_DEFAULT_CACHE: TelemetryParseCache | None = None
+_DEFAULT_CACHE_PATH: str | None = None
+
+
+def default_parse_cache() -> TelemetryParseCache | None:
+    global _DEFAULT_CACHE, _DEFAULT_CACHE_PATH
+    path = os.getenv("INFRALENS_PARSE_CACHE", "").strip()
+    if path.lower() in {"off", "0", "false", "none"}:
+        return None
+    path = path or str(Path.home() / ".cache" / "infralens" / "telemetry")
+    if _DEFAULT_CACHE is None or _DEFAULT_CACHE_PATH != path:
+        try:
+            _DEFAULT_CACHE = TelemetryParseCache(path)
+        except OSError:
+            return None
+        _DEFAULT_CACHE_PATH = path
+    return _DEFAULT_CACHE
+
+
+def telemetry_cache_key(
+    filename: str, raw_bytes: bytes, topo_text: str | None = None, numactl_text: str | None = None
+) -> str:
+    digest = hashlib.sha256()
+    header = {
+        "version": PARSE_CACHE_VERSION,
+        "filename": filename,
+        "topo": topo_text is not None,
+        "numactl": numactl_text is not None,
+        "aliases": default_registry().signature(),
+    }
+    digest.update(json.dumps(header, sort_keys=True).encode("utf-8"))
+    for part in (raw_bytes, (topo_text or "").encode("utf-8"), (numactl_text or "").encode("utf-8")):
+        digest.update(len(part).to_bytes(8, "little"))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+def parse_uploaded_telemetry_cached(
+    filename: str,
+    raw_bytes: bytes,
+    topo_text: str | None = None,
+    numactl_text: str | None = None,
+    cache: TelemetryParseCache | None = None,
+    use_cache: bool = True,
+) -> dict[str, Any]:
+    store = (cache if cache is not None else default_parse_cache()) if use_cache else None
+    if store is None:
+        return parse_uploaded_telemetry(filename, raw_bytes, topo_text=topo_text, numactl_text=numactl_text)
+    key = telemetry_cache_key(filename, raw_bytes, topo_text, numactl_text)
+    with span("parse_cache", bytes=len(raw_bytes)) as s:
+        scenario = store.get(key)
+        s.set(hit=scenario is not None)
+    if scenario is not None:
+        store.hits += 1
+        return scenario
+    store.misses += 1
+    scenario = parse_uploaded_telemetry(filename, raw_bytes, topo_text=topo_text, numactl_text=numactl_text)
+    store.put(key, scenario)
+    return scenario
@@ -1,17 +1,26 @@
 from __future__ import annotations
 
 import csv
+import io
 import json
+import math
+import os
 import re
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from io import StringIO
-from typing import Any
+from typing import IO, Any, Iterable, Iterator, Sequence
 
-import pandas as pd
+from infralens.schema import AliasRegistry, FieldMapping, compile_field_mapping, default_registry, normalize_column
+from infralens.topology import parse_topology_matrix
+from infralens.tracing import traced
 
+_normalize_col = normalize_column
 
-def _normalize_col(col: str) -> str:
-    col = col.strip().lower()
-    return re.sub(r"[^a-z0-9]+", "_", col).strip("_")
+
+_NON_NUMERIC = re.compile(r"[^0-9.\-]+")
+_NON_NUMERIC_KEEP_NEWLINE = re.compile(r"[^0-9.\-\n]+")
 
 
 def _to_float(value: Any) -> float | None:
@@ -23,7 +32,7 @@ def _to_float(value: Any) -> float | None:
     if not text:
         return None
     text = text.replace(",", "")
-    text = re.sub(r"[^0-9.\-]+", "", text)
+    text = _NON_NUMERIC.sub("", text)
     if not text:
         return None
     try:
@@ -32,7 +41,50 @@ def _to_float(value: Any) -> float | None:
         return None
 
 
-def _pick_value(row: dict[str, Any], keys: list[str], default: Any) -> Any:
+def _to_float_array(values: Sequence[Any]) -> Any:
+    # Column-at-a-time _to_float: NaN where the scalar version returns None.
+    # String columns are cleaned with one regex pass over the joined text
+    # (units, "%", thousands separators, "[N/A]" all reduce to digits or "")
+    # and converted by numpy in bulk; malformed leftovers such as "-" or
+    # "1.2.3" fall back to float() per distinct value.
+    import numpy as np
+
+    n = len(values)
+    out = np.full(n, np.nan)
+    if not n:
+        return out
+    if set(map(type, values)) != {str}:
+        for i, v in enumerate(values):
+            number = _to_float(v)
+            if number is not None:
+                out[i] = number
+        return out
+
+    cleaned = _NON_NUMERIC_KEEP_NEWLINE.sub("", "\n".join(values)).split("\n")
+    if len(cleaned) != n:
+        # A cell held a newline (quoted CSV field); keep the scalar path exact.
+        return np.asarray([np.nan if (x := _to_float(v)) is None else x for v in values], dtype=np.float64)
+
+    text = np.asarray(cleaned)
+    present = text != ""
+    try:
+        out[present] = text[present].astype(np.float64)
+    except ValueError:
+        parsed: dict[str, float] = {}
+        for i in np.flatnonzero(present).tolist():
+            token = cleaned[i]
+            number = parsed.get(token)
+            if number is None:
+                try:
+                    number = float(token)
+                except ValueError:
+                    number = np.nan
+                parsed[token] = number
+            out[i] = number
+    return out
+
+
+def _pick_value(row: dict[str, Any], keys: Iterable[str], default: Any) -> Any:
     for key in keys:
         if key in row and row[key] not in ("", None):
             return row[key]
@@ -75,97 +127,414 @@ def _csv_noheader_columns(col_count: int) -> list[str]:
     return [f"col_{i}" for i in range(1, col_count + 1)]
 
 
-def _parse_csv_rows(text: str) -> list[dict[str, Any]]:
-    raw_rows = [row for row in csv.reader(StringIO(text)) if any(c.strip() for c in row)]
-    if not raw_rows:
+_CSV_MEMO_LIMIT = 4096
+
+
+@dataclass
+class _CsvColumns:
+    names: list[str]
+    cells: dict[str, list[str]]
+    row_count: int
+
+
+def _read_csv_columns(text: str, registry: AliasRegistry | None = None) -> _CsvColumns:
+    # One pass: the first non-blank line decides header vs nvidia-smi noheader
+    # layout, then only the columns some field alias refers to are kept.
+    known = (registry or default_registry()).known_columns()
+    reader = csv.reader(StringIO(text))
+    names: list[str] | None = None
+    header_raw: list[str] | None = None
+    keep: list[int] = []
+    columns: list[list[str]] = []
+    # Share one str object per distinct value in low-cardinality columns.
+    memos: list[dict[str, str] | None] = []
+    rows = 0
+    for raw in reader:
+        if not "".join(raw).strip():
+            continue
+        if names is None:
+            cells = [c.strip() for c in raw]
+            is_header = _looks_like_header(cells)
+            names = [_normalize_col(c) for c in cells] if is_header else _csv_noheader_columns(len(cells))
+            seen: set[str] = set()
+            for i, name in enumerate(names):
+                if name in known and name not in seen:
+                    seen.add(name)
+                    keep.append(i)
+            columns = [[] for _ in keep]
+            memos = [{} for _ in keep]
+            if is_header:
+                header_raw = cells
+                continue
+        elif header_raw is not None and raw[0].strip() == header_raw[0] and [c.strip() for c in raw] == header_raw:
+            # Concatenated captures repeat the header line.
+            continue
+        width = len(raw)
+        for slot, i in enumerate(keep):
+            value = raw[i].strip() if i < width else ""
+            memo = memos[slot]
+            if memo is not None:
+                value = memo.setdefault(value, value)
+                if len(memo) > _CSV_MEMO_LIMIT:
+                    memos[slot] = None
+            columns[slot].append(value)
+        rows += 1
+
+    if names is None:
         raise ValueError("Uploaded CSV is empty.")
+    return _CsvColumns(
+        names=names,
+        cells={names[i]: col for i, col in zip(keep, columns)},
+        row_count=rows,
+    )
 
-    first = [c.strip() for c in raw_rows[0]]
-    if _looks_like_header(first):
-        csv_df = pd.read_csv(StringIO(text))
-        csv_df.columns = [_normalize_col(c) for c in csv_df.columns]
-        return csv_df.to_dict(orient="records")
 
-    columns = _csv_noheader_columns(len(first))
-    parsed_rows: list[dict[str, Any]] = []
-    for row in raw_rows:
-        normalized = [c.strip() for c in row]
-        if len(normalized) < len(columns):
-            normalized += [""] * (len(columns) - len(normalized))
-        parsed_rows.append(dict(zip(columns, normalized)))
-    return parsed_rows
+def _coalesce_column(table: _CsvColumns, columns: Iterable[str]) -> list[str] | None:
+    # Per row, the first column with a non-empty cell wins (same as _pick_value).
+    present = [table.cells[c] for c in columns if c in table.cells]
+    if not present:
+        return None
+    if len(present) == 1:
+        return present[0]
+    out = list(present[0])
+    for col in present[1:]:
+        for i, value in enumerate(out):
+            if value == "":
+                out[i] = col[i]
+    return out
 
 
-def _build_scenario_from_rows(rows: list[dict[str, Any]], name: str) -> dict[str, Any]:
-    if not rows:
-        raise ValueError("No GPU rows detected in uploaded file.")
+def _float_column(values: list[str] | None, n: int) -> Any:
+    import numpy as np
 
-    gpus: list[dict[str, Any]] = []
-    memory_totals: list[float] = []
+    if values is None:
+        return np.full(n, np.nan)
+    return _to_float_array(values)
 
-    for idx, row in enumerate(rows):
-        gpu_id = int(_to_float(_pick_value(row, ["index", "gpu", "gpu_id", "id"], idx)) or idx)
 
-        gpu_util = _to_float(
-            _pick_value(
-                row,
-                ["utilization_gpu", "gpu_util", "gpu_utilization", "util"],
-                None,
-            )
-        )
-        mem_used_mib = _to_float(
-            _pick_value(
-                row,
-                ["memory_used", "memory_used_mib", "fb_memory_usage_used", "vram_used_mib"],
-                None,
-            )
-        )
-        mem_total_mib = _to_float(
-            _pick_value(
-                row,
-                ["memory_total", "memory_total_mib", "fb_memory_usage_total", "vram_total_mib"],
-                None,
-            )
-        )
+def _int_column(values: Any, default: Any) -> list[int]:
+    import numpy as np
 
-        # Allow direct GB fields if MiB fields are absent.
-        mem_used_gb_raw = _to_float(_pick_value(row, ["vram_used_gb", "memory_used_gb"], None))
-        mem_total_gb_raw = _to_float(_pick_value(row, ["vram_total_gb", "memory_total_gb"], None))
+    # Truncates like int(float) and falls back per row where the cell was missing.
+    missing = np.isnan(values)
+    return np.where(missing, default, np.trunc(np.where(missing, 0.0, values))).astype(np.int64).tolist()
 
-        vram_used_gb = mem_used_gb_raw if mem_used_gb_raw is not None else (mem_used_mib or 0.0) / 1024.0
-        vram_total_gb = mem_total_gb_raw if mem_total_gb_raw is not None else (mem_total_mib or 80.0) / 1024.0
 
-        if gpu_util is None:
-            gpu_util = 0.0
+def _build_scenario_from_columns(
+    table: _CsvColumns, name: str, registry: AliasRegistry | None = None
+) -> dict[str, Any]:
+    import numpy as np
 
-        network_io_score = _to_float(_pick_value(row, ["network_io_score", "network_score"], None))
-        if network_io_score is None:
-            # Conservative proxy when network telemetry is missing.
-            network_io_score = min(1.0, max(0.2, (gpu_util / 100.0) * 0.8 + 0.2))
+    n = table.row_count
+    if not n:
+        raise ValueError("No GPU rows detected in uploaded file.")
+    mapping = compile_field_mapping(table.cells, registry)
 
-        numa_node = int(_to_float(_pick_value(row, ["numa_node", "numa"], gpu_id % 2)) or (gpu_id % 2))
-        cpu_socket = int(
-            _to_float(_pick_value(row, ["cpu_socket", "socket", "cpu_affinity_socket"], numa_node)) or numa_node
-        )
-        nvlink_group = str(_pick_value(row, ["nvlink_group", "nvlink", "topology_group"], "A"))
-        if nvlink_group == "A" and "nvlink_group" not in row and "nvlink" not in row:
-            nvlink_group = "A" if gpu_id < max(1, len(rows) // 2) else "B"
+    def column(field: str) -> list[str] | None:
+        return _coalesce_column(table, mapping.columns(field))
+
+    ids = _int_column(_float_column(column("id"), n), np.arange(n))
+    util = _float_column(column("gpu_util"), n)
+    util = np.where(np.isnan(util), 0.0, util)
+
+    used_mib = _float_column(column("memory_used_mib"), n)
+    total_mib = _float_column(column("memory_total_mib"), n)
+    used_gb = _float_column(column("memory_used_gb"), n)
+    total_gb = _float_column(column("memory_total_gb"), n)
+    # `(mib or default)` semantics: missing and zero MiB both fall back.
+    used_mib = np.where(np.isnan(used_mib) | (used_mib == 0), 0.0, used_mib)
+    total_mib = np.where(np.isnan(total_mib) | (total_mib == 0), 80.0, total_mib)
+    vram_used = np.where(np.isnan(used_gb), used_mib / 1024.0, used_gb)
+    vram_total = np.where(np.isnan(total_gb), total_mib / 1024.0, total_gb)
+
+    network = _float_column(column("network_io_score"), n)
+    network = np.where(np.isnan(network), np.clip(util / 100.0 * 0.8 + 0.2, 0.2, 1.0), network)
+
+    id_arr = np.asarray(ids, dtype=np.int64)
+    numa = _int_column(_float_column(column("numa_node"), n), id_arr % 2)
+    sockets = _int_column(_float_column(column("cpu_socket"), n), np.asarray(numa))
+
+    nvlink = column("nvlink_group") or [""] * n
 
+    gpus: list[dict[str, Any]] = []
+    for i, (gpu_id, u, vu, net, numa_node, socket, group) in enumerate(
+        zip(ids, util.tolist(), vram_used.tolist(), network.tolist(), numa, sockets, nvlink)
+    ):
+        group = group or "A"
+        if group == "A" and not mapping.nvlink_explicit:
+            group = _default_nvlink_group(gpu_id, n)
         gpus.append(
             {
                 "id": gpu_id,
-                "gpu_util": round(gpu_util, 2),
-                "vram_used_gb": round(vram_used_gb, 2),
-                "network_io_score": round(float(network_io_score), 2),
+                "gpu_util": round(u, 2),
+                "vram_used_gb": round(vu, 2),
+                "network_io_score": round(net, 2),
                 "numa_node": numa_node,
-                "cpu_socket": cpu_socket,
+                "cpu_socket": socket,
+                "nvlink_group": group,
+            }
+        )
+
+    scenario = {"name": name, "total_vram_gb": _total_vram_gb(vram_total.tolist()), "gpus": gpus}
+    return _with_model(scenario, column("model") or ())
+
+
+def _int_or_default(value: Any, default: int) -> int:
+    number = _to_float(value)
+    if number is None or number != number:
+        return default
+    return int(number)
+
+
+def _rows_field_mapping(rows: Iterable[dict[str, Any]]) -> FieldMapping:
+    # One mapping per batch: CSV rows share their header, and JSON records are
+    # mapped on the union of their keys (a key missing from a record falls
+    # through to the next alias or the default, like an empty cell).
+    return compile_field_mapping(dict.fromkeys(k for row in rows for k in row))
+
+
+def _gpu_fields_from_row(row: dict[str, Any], idx: int, mapping: FieldMapping) -> dict[str, Any]:
+    gpu_id = _int_or_default(_pick_value(row, mapping.columns("id"), idx), idx)
+
+    gpu_util = _to_float(_pick_value(row, mapping.columns("gpu_util"), None))
+    mem_used_mib = _to_float(_pick_value(row, mapping.columns("memory_used_mib"), None))
+    mem_total_mib = _to_float(_pick_value(row, mapping.columns("memory_total_mib"), None))
+
+    # Allow direct GB fields if MiB fields are absent.
+    mem_used_gb_raw = _to_float(_pick_value(row, mapping.columns("memory_used_gb"), None))
+    mem_total_gb_raw = _to_float(_pick_value(row, mapping.columns("memory_total_gb"), None))
+
+    vram_used_gb = mem_used_gb_raw if mem_used_gb_raw is not None else (mem_used_mib or 0.0) / 1024.0
+    vram_total_gb = mem_total_gb_raw if mem_total_gb_raw is not None else (mem_total_mib or 80.0) / 1024.0
+
+    if gpu_util is None:
+        gpu_util = 0.0
+
+    network_io_score = _to_float(_pick_value(row, mapping.columns("network_io_score"), None))
+    if network_io_score is None:
+        # Conservative proxy when network telemetry is missing.
+        network_io_score = min(1.0, max(0.2, (gpu_util / 100.0) * 0.8 + 0.2))
+
+    numa_node = _int_or_default(_pick_value(row, mapping.columns("numa_node"), gpu_id % 2), gpu_id % 2)
+    cpu_socket = _int_or_default(_pick_value(row, mapping.columns("cpu_socket"), numa_node), numa_node)
+    nvlink_group = str(_pick_value(row, mapping.columns("nvlink_group"), "A"))
+    nvlink_defaulted = nvlink_group == "A" and not mapping.nvlink_explicit
+    model = str(_pick_value(row, mapping.columns("model"), "")).strip()
+
+    return {
+        "id": gpu_id,
+        "gpu_util": gpu_util,
+        "vram_used_gb": vram_used_gb,
+        "vram_total_gb": vram_total_gb,
+        "network_io_score": float(network_io_score),
+        "numa_node": numa_node,
+        "cpu_socket": cpu_socket,
+        "nvlink_group": nvlink_group,
+        "nvlink_defaulted": nvlink_defaulted,
+        "model": model,
+    }
+
+
+def _scenario_model(values: Iterable[Any]) -> str | None:
+    # The product name most GPUs report; MIG planning keys off it.
+    counts = Counter(text for v in values if v is not None and (text := str(v).strip()))
+    return counts.most_common(1)[0][0] if counts else None
+
+
+def _with_model(scenario: dict[str, Any], values: Iterable[Any]) -> dict[str, Any]:
+    model = _scenario_model(values)
+    if model:
+        scenario["model"] = model
+    return scenario
+
+
+def _default_nvlink_group(gpu_id: int, gpu_count: int) -> str:
+    return "A" if gpu_id < max(1, gpu_count // 2) else "B"
+
+
+def _total_vram_gb(memory_totals: list[float]) -> int:
+    return max(1, int(round(max(memory_totals) if memory_totals else 80)))
+
+
+def _build_scenario_from_rows(rows: list[dict[str, Any]], name: str) -> dict[str, Any]:
+    if not rows:
+        raise ValueError("No GPU rows detected in uploaded file.")
+
+    gpus: list[dict[str, Any]] = []
+    memory_totals: list[float] = []
+    models: list[str] = []
+
+    mapping = _rows_field_mapping(rows)
+    for idx, row in enumerate(rows):
+        fields = _gpu_fields_from_row(row, idx, mapping)
+        models.append(fields["model"])
+        nvlink_group = fields["nvlink_group"]
+        if fields["nvlink_defaulted"]:
+            nvlink_group = _default_nvlink_group(fields["id"], len(rows))
+
+        gpus.append(
+            {
+                "id": fields["id"],
+                "gpu_util": round(fields["gpu_util"], 2),
+                "vram_used_gb": round(fields["vram_used_gb"], 2),
+                "network_io_score": round(fields["network_io_score"], 2),
+                "numa_node": fields["numa_node"],
+                "cpu_socket": fields["cpu_socket"],
                 "nvlink_group": nvlink_group,
             }
         )
-        memory_totals.append(vram_total_gb)
+        memory_totals.append(fields["vram_total_gb"])
+
+    return _with_model({"name": name, "total_vram_gb": _total_vram_gb(memory_totals), "gpus": gpus}, models)
+
+
+UTIL_HISTOGRAM_BINS = 1001  # 0.0% .. 100.0% at 0.1% resolution
+
+
+@dataclass
+class _GpuAccumulator:
+    gpu_id: int
+    numa_node: int
+    cpu_socket: int
+    nvlink_group: str
+    nvlink_defaulted: bool
+    model: str = ""
+    samples: int = 0
+    util_sum: float = 0.0
+    vram_sum: float = 0.0
+    vram_peak: float = 0.0
+    vram_total_peak: float = 0.0
+    network_sum: float = 0.0
+    util_hist: list[int] = field(default_factory=lambda: [0] * UTIL_HISTOGRAM_BINS)
+
+    def add(self, fields: dict[str, Any]) -> None:
+        util = fields["gpu_util"]
+        vram = fields["vram_used_gb"]
+        self.samples += 1
+        self.model = self.model or fields["model"]
+        self.util_sum += util
+        self.vram_sum += vram
+        self.network_sum += fields["network_io_score"]
+        if self.samples == 1 or vram > self.vram_peak:
+            self.vram_peak = vram
+        self.vram_total_peak = max(self.vram_total_peak, fields["vram_total_gb"])
+        bin_idx = min(UTIL_HISTOGRAM_BINS - 1, max(0, int(round(util * 10))))
+        self.util_hist[bin_idx] += 1
+
+    def util_quantile(self, q: float) -> float:
+        rank = max(1, math.ceil(q * self.samples))
+        seen = 0
+        for bin_idx, count in enumerate(self.util_hist):
+            seen += count
+            if seen >= rank:
+                return bin_idx / 10.0
+        return 100.0
+
+
+class TelemetryAggregator:
+    def __init__(self) -> None:
+        self._gpus: dict[int, _GpuAccumulator] = {}
+        self.rows_seen = 0
+
+    def add_row(self, row: dict[str, Any], mapping: FieldMapping | None = None) -> None:
+        fields = _gpu_fields_from_row(row, self.rows_seen, mapping or compile_field_mapping(row))
+        self.rows_seen += 1
+        acc = self._gpus.get(fields["id"])
+        if acc is None:
+            acc = _GpuAccumulator(
+                gpu_id=fields["id"],
+                numa_node=fields["numa_node"],
+                cpu_socket=fields["cpu_socket"],
+                nvlink_group=fields["nvlink_group"],
+                nvlink_defaulted=fields["nvlink_defaulted"],
+            )
+            self._gpus[fields["id"]] = acc
+        acc.add(fields)
+
+    def add_rows(self, rows: Iterable[dict[str, Any]]) -> None:
+        batch = rows if isinstance(rows, list) else list(rows)
+        mapping = _rows_field_mapping(batch)
+        for row in batch:
+            self.add_row(row, mapping)
+
+    def to_scenario(self, name: str) -> dict[str, Any]:
+        if not self._gpus:
+            raise ValueError("No GPU rows detected in uploaded file.")
+
+        gpu_count = len(self._gpus)
+        gpus: list[dict[str, Any]] = []
+        for acc in self._gpus.values():
+            nvlink_group = acc.nvlink_group
+            if acc.nvlink_defaulted:
+                nvlink_group = _default_nvlink_group(acc.gpu_id, gpu_count)
+            gpus.append(
+                {
+                    "id": acc.gpu_id,
+                    "gpu_util": round(acc.util_sum / acc.samples, 2),
+                    "vram_used_gb": round(acc.vram_sum / acc.samples, 2),
+                    "network_io_score": round(acc.network_sum / acc.samples, 2),
+                    "numa_node": acc.numa_node,
+                    "cpu_socket": acc.cpu_socket,
+                    "nvlink_group": nvlink_group,
+                    "gpu_util_p50": acc.util_quantile(0.50),
+                    "gpu_util_p95": acc.util_quantile(0.95),
+                    "vram_peak_gb": round(acc.vram_peak, 2),
+                    "samples": acc.samples,
+                }
+            )
 
-    total_vram_gb = max(1, int(round(max(memory_totals) if memory_totals else 80)))
-    return {"name": name, "total_vram_gb": total_vram_gb, "gpus": gpus}
+        memory_totals = [acc.vram_total_peak for acc in self._gpus.values()]
+        scenario = {"name": name, "total_vram_gb": _total_vram_gb(memory_totals), "gpus": gpus}
+        return _with_model(scenario, (acc.model for acc in self._gpus.values()))
+
+
+@contextmanager
+def _open_text_source(source: str | os.PathLike[str] | IO[Any]) -> Iterator[IO[str]]:
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "r", encoding="utf-8", errors="ignore", newline="") as f:
+            yield f
+        return
+    if isinstance(source, io.TextIOBase):
+        yield source
+        return
+    wrapper = io.TextIOWrapper(source, encoding="utf-8", errors="ignore", newline="")
+    try:
+        yield wrapper
+    finally:
+        # Leave the caller's binary handle open.
+        wrapper.detach()
+
+
+def iter_telemetry_chunks(
+    source: str | os.PathLike[str] | IO[Any], chunk_size: int = 4096
+) -> Iterator[list[dict[str, Any]]]:
+    chunk_size = max(1, int(chunk_size))
+    with _open_text_source(source) as f:
+        reader = csv.reader(f)
+        columns: list[str] | None = None
+        header_raw: list[str] | None = None
+        chunk: list[dict[str, Any]] = []
+        for raw in reader:
+            cells = [c.strip() for c in raw]
+            if not any(cells):
+                continue
+            if columns is None:
+                if _looks_like_header(cells):
+                    header_raw = cells
+                    columns = [_normalize_col(c) for c in cells]
+                    continue
+                columns = _csv_noheader_columns(len(cells))
+            elif cells == header_raw:
+                # Concatenated captures repeat the header line.
+                continue
+            if len(cells) < len(columns):
+                cells += [""] * (len(columns) - len(cells))
+            chunk.append(dict(zip(columns, cells)))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
 
 
 def _parse_cpu_affinity_to_set(text: str) -> set[int]:
@@ -244,6 +613,8 @@ def parse_numactl_hardware_any(text: str) -> dict[int, set[int]]:
 
     if "," in stripped:
         try:
+            import pandas as pd
+
             df = pd.read_csv(StringIO(stripped))
             df.columns = [_normalize_col(c) for c in df.columns]
             node_cpus: dict[int, set[int]] = {}
@@ -409,6 +780,8 @@ def parse_nvidia_smi_topology_any(
 
     if "," in stripped:
         try:
+            import pandas as pd
+
             df = pd.read_csv(StringIO(stripped))
             df.columns = [_normalize_col(c) for c in df.columns]
             infos: dict[int, dict[str, Any]] = {}
@@ -456,6 +829,23 @@ def apply_topology_overrides(
     return patched
 
 
+def apply_host_topology(
+    scenario: dict[str, Any], topo_text: str | None = None, numactl_text: str | None = None
+) -> dict[str, Any]:
+    node_cpus = parse_numactl_hardware_any(numactl_text or "") if numactl_text else {}
+    if topo_text:
+        topo_info = parse_nvidia_smi_topology_any(topo_text, node_cpus=node_cpus)
+        scenario = apply_topology_overrides(scenario, topo_info)
+        graph = parse_topology_matrix(topo_text)
+        if graph is not None:
+            scenario["topology"] = graph.to_dict()
+    if node_cpus:
+        # String keys so the scenario survives a JSON round trip unchanged.
+        scenario["node_cpus"] = {str(node): sorted(cpus) for node, cpus in sorted(node_cpus.items())}
+    return scenario
+
+
+@traced("parse")
 def parse_uploaded_telemetry(
     filename: str,
     raw_bytes: bytes,
@@ -482,13 +872,27 @@ def parse_uploaded_telemetry(
         normalized_rows = [{_normalize_col(k): v for k, v in row.items()} for row in rows if isinstance(row, dict)]
         scenario = _build_scenario_from_rows(normalized_rows, f"Uploaded ({filename})")
     else:
-        rows = _parse_csv_rows(text)
-        rows = [{_normalize_col(k): v for k, v in row.items()} for row in rows]
-        scenario = _build_scenario_from_rows(rows, f"Uploaded ({filename})")
+        scenario = _build_scenario_from_columns(_read_csv_columns(text), f"Uploaded ({filename})")
 
-    if topo_text:
-        node_cpus = parse_numactl_hardware_any(numactl_text or "")
-        topo_info = parse_nvidia_smi_topology_any(topo_text, node_cpus=node_cpus)
-        scenario = apply_topology_overrides(scenario, topo_info)
+    return apply_host_topology(scenario, topo_text, numactl_text)
 
-    return scenario
+
+def parse_telemetry_stream(
+    source: str | os.PathLike[str] | IO[Any],
+    name: str | None = None,
+    topo_text: str | None = None,
+    numactl_text: str | None = None,
+    chunk_size: int = 4096,
+) -> dict[str, Any]:
+    if name is None:
+        source_name = source if isinstance(source, (str, os.PathLike)) else getattr(source, "name", "stream")
+        name = f"Uploaded ({os.path.basename(str(source_name))})"
+
+    aggregator = TelemetryAggregator()
+    for chunk in iter_telemetry_chunks(source, chunk_size=chunk_size):
+        aggregator.add_rows(chunk)
+    if not aggregator.rows_seen:
+        raise ValueError("Uploaded CSV is empty.")
+    scenario = aggregator.to_scenario(name)
+
+    return apply_host_topology(scenario, topo_text, numactl_text)
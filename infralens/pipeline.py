@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field, is_dataclass
+from typing import Any, Callable
+
+from infralens.commands import CommandTemplate, ExecutionConfig, build_execution_templates
+from infralens.config import config_signature
+from infralens.data import Workload
+from infralens.i18n import localize_findings, localize_recommendation
+from infralens.llm import DEFAULT_LLM_TIMEOUT_SEC, generate_narratives
+from infralens.report import build_pdf_report
+from infralens.rules import Finding, RecommendationResult, build_placement_recommendation, detect_bottlenecks
+from infralens.scoring import ScoreResult, calculate_efficiency_score, infer_workload_profile
+
+PIPELINE_STAGES = (
+    "profile",
+    "score",
+    "findings",
+    "recommendation",
+    "localized",
+    "narratives",
+    "templates",
+    "pdf",
+)
+
+
+def _canonical(value: Any) -> Any:
+    if is_dataclass(value) and not isinstance(value, type):
+        return _canonical(asdict(value))
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    return value
+
+
+def fingerprint(*parts: Any) -> str:
+    payload = json.dumps(_canonical(parts), sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class StageStats:
+    computed: int = 0
+    reused: int = 0
+    total_sec: float = 0.0
+
+
+@dataclass
+class PipelineResult:
+    profile: str
+    score: ScoreResult
+    findings_raw: list[Finding]
+    recommendation_raw: RecommendationResult
+    findings: list[Finding]
+    recommendation: RecommendationResult
+    analysis_text: str
+    analysis_source: str
+    rec_text: str
+    rec_source: str
+    keys: dict[str, str] = field(default_factory=dict)
+    recomputed: list[str] = field(default_factory=list)
+
+
+class AnalysisPipeline:
+    # Each stage is memoized on a key chained from its inputs' fingerprints and
+    # the keys of the stages it depends on, so an unchanged upstream stage never
+    # invalidates anything downstream. Memo entries are private copies: callers
+    # may mutate what they get back without changing later hits.
+
+    def __init__(self, max_entries_per_stage: int = 8) -> None:
+        self.max_entries_per_stage = max(1, max_entries_per_stage)
+        self._memo: dict[str, OrderedDict[str, Any]] = {name: OrderedDict() for name in PIPELINE_STAGES}
+        self.stats: dict[str, StageStats] = {name: StageStats() for name in PIPELINE_STAGES}
+        self.last_recomputed: list[str] = []
+
+    def clear(self) -> None:
+        for memo in self._memo.values():
+            memo.clear()
+
+    def _stage(
+        self,
+        name: str,
+        key: str,
+        compute: Callable[[], Any],
+        keep: Callable[[Any], bool] | None = None,
+    ) -> Any:
+        memo = self._memo[name]
+        stats = self.stats[name]
+        if key in memo:
+            memo.move_to_end(key)
+            stats.reused += 1
+            return copy.deepcopy(memo[key])
+
+        t0 = time.perf_counter()
+        value = compute()
+        stats.computed += 1
+        stats.total_sec += time.perf_counter() - t0
+        self.last_recomputed.append(name)
+        if keep is None or keep(value):
+            memo[key] = copy.deepcopy(value)
+            while len(memo) > self.max_entries_per_stage:
+                memo.popitem(last=False)
+        return value
+
+    def run(
+        self,
+        scenario: dict[str, Any],
+        workloads: list[Workload],
+        language: str = "ko",
+        provider: str = "openai",
+        api_key: str | None = None,
+        model: str | None = None,
+        timeout_sec: float = DEFAULT_LLM_TIMEOUT_SEC,
+    ) -> PipelineResult:
+        self.last_recomputed = []
+        scenario_fp = fingerprint(scenario)
+        workloads_fp = fingerprint(workloads)
+        config_fp = fingerprint(config_signature())
+
+        profile_key = fingerprint("profile", workloads_fp)
+        profile = self._stage("profile", profile_key, lambda: infer_workload_profile(workloads))
+
+        score_key = fingerprint("score", scenario_fp, profile, config_fp)
+        score = self._stage("score", score_key, lambda: calculate_efficiency_score(scenario, profile=profile))
+
+        findings_key = fingerprint("findings", scenario_fp, workloads_fp, profile, config_fp)
+        findings_raw = self._stage(
+            "findings", findings_key, lambda: detect_bottlenecks(scenario, workloads, profile=profile)
+        )
+
+        rec_key = fingerprint("recommendation", scenario_fp, workloads_fp, profile, score.score, config_fp)
+        recommendation_raw = self._stage(
+            "recommendation",
+            rec_key,
+            lambda: build_placement_recommendation(scenario, workloads, score.score, profile=profile),
+        )
+
+        localized_key = fingerprint("localized", findings_key, rec_key, language)
+        findings, recommendation = self._stage(
+            "localized",
+            localized_key,
+            lambda: (
+                localize_findings(findings_raw, language),
+                localize_recommendation(recommendation_raw, language),
+            ),
+        )
+
+        narratives_key = fingerprint(
+            "narratives", localized_key, score_key, language, provider, api_key or "", model or "", timeout_sec
+        )
+        # Fallback text caused by a failed provider call is not memoized so the
+        # next run retries the provider.
+        (analysis_text, analysis_source), (rec_text, rec_source) = self._stage(
+            "narratives",
+            narratives_key,
+            lambda: generate_narratives(
+                findings,
+                score.score,
+                score.grade,
+                recommendation,
+                language=language,
+                provider=provider,
+                api_key=api_key,
+                model=model,
+                timeout_sec=timeout_sec,
+            ),
+            keep=lambda out: not api_key or not any(src.startswith("fallback") for _, src in out),
+        )
+
+        return PipelineResult(
+            profile=profile,
+            score=score,
+            findings_raw=findings_raw,
+            recommendation_raw=recommendation_raw,
+            findings=findings,
+            recommendation=recommendation,
+            analysis_text=analysis_text,
+            analysis_source=analysis_source,
+            rec_text=rec_text,
+            rec_source=rec_source,
+            keys={
+                "scenario": scenario_fp,
+                "workloads": workloads_fp,
+                "config": config_fp,
+                "score": score_key,
+                "findings": findings_key,
+                "recommendation": rec_key,
+                "localized": localized_key,
+                "narratives": narratives_key,
+            },
+            recomputed=list(self.last_recomputed),
+        )
+
+    def templates(
+        self,
+        scenario: dict[str, Any],
+        workloads: list[Workload],
+        result: PipelineResult,
+        exec_cfg: ExecutionConfig | None = None,
+    ) -> list[CommandTemplate]:
+        key = fingerprint(
+            "templates",
+            fingerprint(scenario),
+            fingerprint(workloads),
+            result.keys["recommendation"],
+            exec_cfg or ExecutionConfig(),
+        )
+        return self._stage(
+            "templates",
+            key,
+            lambda: build_execution_templates(scenario, workloads, result.recommendation_raw, exec_cfg=exec_cfg),
+        )
+
+    def pdf_report(
+        self,
+        scenario_name: str,
+        result: PipelineResult,
+        labels: dict[str, str] | None = None,
+        expected_line: str | None = None,
+    ) -> bytes:
+        key = fingerprint(
+            "pdf",
+            scenario_name,
+            result.keys["score"],
+            result.keys["localized"],
+            result.analysis_text,
+            result.rec_text,
+            labels,
+            expected_line,
+        )
+        return self._stage(
+            "pdf",
+            key,
+            lambda: build_pdf_report(
+                scenario_name=scenario_name,
+                score=result.score,
+                findings=result.findings,
+                analysis_text=result.analysis_text,
+                recommendation=result.recommendation,
+                recommendation_text=result.rec_text,
+                labels=labels,
+                expected_line=expected_line,
+            ),
+        )
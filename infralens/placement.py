@@ -0,0 +1,443 @@
+from __future__ import annotations
+
+import bisect
+import heapq
+import time
+from dataclasses import dataclass, field
+from typing import Any, Mapping
+
+from infralens.data import Workload
+from infralens.gpu_subset import DEFAULT_SUBSET_TIME_BUDGET_SEC, GpuSubsetSearch
+from infralens.topology import TopologyGraph
+
+# Bounds the search only: building per-host slots and topology graphs comes
+# first, and a dive that runs out of time still finishes first-fit so every
+# job gets a decision (a few hundred ms at 4,096 GPUs / ~1,300 jobs).
+DEFAULT_TIME_BUDGET_SEC = 0.05
+DEFAULT_BRANCHING = 3
+
+# Cost weights. Unplaced work dominates everything else so the search always
+# prefers placing more GPU demand over a nicer layout.
+UNPLACED_COST_PER_GPU = 1000.0
+NVLINK_SPAN_COST = 10.0
+NUMA_SPAN_COST = 2.0
+NUMA_MISMATCH_COST = 0.5
+UTIL_COST = 1.0
+OPEN_INFERENCE_GPU_COST = 1.0
+# A candidate below this has no NVLink or NUMA span; good enough once out of time.
+RUSH_ACCEPT_COST = NUMA_SPAN_COST
+
+
+@dataclass
+class Assignment:
+    workload: str
+    kind: str
+    host: str
+    gpu_ids: list[int]
+    vram_per_gpu_gb: float
+
+
+@dataclass
+class PlacementPlan:
+    assignments: list[Assignment]
+    unplaced: list[str]
+    cost: float
+    # The search only expands each job's `branching` cheapest GPU choices, so a
+    # finished search is the best plan within that beam, not a proven optimum.
+    search_complete: bool
+    nodes_explored: int
+    elapsed_sec: float
+    assignment_by_workload: dict[str, Assignment] = field(default_factory=dict)
+
+
+@dataclass
+class _Slot:
+    host: str
+    gpu_id: int
+    group: str
+    numa_node: int
+    mismatch: bool
+    util: float
+    capacity_gb: float
+    # Row of the host's link penalty matrix and this GPU's column in it, when
+    # the scenario carries a real `topo -m` matrix.
+    penalty_row: list[float] | None = None
+    topo_idx: int = -1
+
+
+@dataclass
+class _Job:
+    workload: Workload
+    exclusive: bool
+    gpu_count: int
+    vram_per_gpu: float
+    order: int
+
+
+class _Solver:
+    def __init__(
+        self,
+        slots: list[_Slot],
+        jobs: list[_Job],
+        time_budget_sec: float,
+        branching: int,
+        subset_budget_sec: float = DEFAULT_SUBSET_TIME_BUDGET_SEC,
+    ) -> None:
+        self.slots = slots
+        self.subset_budget_sec = subset_budget_sec
+        self.jobs = jobs
+        self.branching = max(1, branching)
+        self.deadline = time.perf_counter() + max(0.0, time_budget_sec)
+        self.nodes = 0
+
+        self.hosts: dict[str, list[int]] = {}
+        for idx, slot in enumerate(slots):
+            self.hosts.setdefault(slot.host, []).append(idx)
+        self.host_members = list(self.hosts.values())
+        host_pos = {host: pos for pos, host in enumerate(self.hosts)}
+        self.host_of = [host_pos[slot.host] for slot in slots]
+        self.local_of = [0] * len(slots)
+        for members in self.host_members:
+            for local, i in enumerate(members):
+                self.local_of[i] = local
+        self.subset_search = [self._host_search(members) for members in self.host_members]
+
+        self.train_used = [False] * len(slots)
+        self.infer_load = [0.0] * len(slots)
+        self.infer_count = [0] * len(slots)
+        # Idle GPUs per host and a per-host version bumped on every change, so
+        # per-host candidate lists are reused until that host's state changes.
+        self.host_idle = [len(m) for m in self.host_members]
+        self.host_version = [0] * len(self.host_members)
+        self._host_cache: dict[tuple[Any, ...], tuple[int, list[tuple[float, tuple[int, ...]]]]] = {}
+
+        self.best_cost = float("inf")
+        self.best: list[tuple[int, ...] | None] = []
+        self.current: list[tuple[int, ...] | None] = []
+        self.complete = True
+        self.rushing = False
+        self._rush_from: dict[tuple[bool, int, float], int] = {}
+        self.lower_bounds = self._suffix_lower_bounds()
+
+    def _unplaced_cost(self, job: _Job) -> float:
+        return UNPLACED_COST_PER_GPU * job.gpu_count
+
+    def _host_search(self, members: list[int]) -> GpuSubsetSearch:
+        slots = [self.slots[i] for i in members]
+        if all(slot.penalty_row is not None for slot in slots):
+            penalty = [[a.penalty_row[b.topo_idx] for b in slots] for a in slots]
+        else:
+            # No link matrix: a pair costs one full span unless it shares an NVLink group.
+            penalty = [[0.0 if a.group == b.group else 1.0 for b in slots] for a in slots]
+        return GpuSubsetSearch(
+            penalty,
+            numa=[slot.numa_node for slot in slots],
+            util=[slot.util for slot in slots],
+            mismatch=[slot.mismatch for slot in slots],
+            span_weight=NVLINK_SPAN_COST,
+            numa_weight=NUMA_SPAN_COST,
+            util_weight=UTIL_COST,
+            mismatch_weight=NUMA_MISMATCH_COST,
+        )
+
+    def _set_cost(self, members: list[int]) -> float:
+        search = self.subset_search[self.host_of[members[0]]]
+        return search.cost([self.local_of[i] for i in members])
+
+    def _host_exclusive(self, h: int, job: _Job) -> list[tuple[float, tuple[int, ...]]]:
+        k = job.gpu_count
+        free = [
+            i
+            for i in self.host_members[h]
+            if not self.train_used[i]
+            and self.infer_count[i] == 0
+            and self.slots[i].capacity_gb >= job.vram_per_gpu
+        ]
+        if len(free) < k:
+            return []
+        by_group: dict[str, list[int]] = {}
+        for i in free:
+            by_group.setdefault(self.slots[i].group, []).append(i)
+
+        # The exact best set first, then the best set inside each NVLink group
+        # that fits, so the search can still trade groups between jobs. Once
+        # out of time the exact search only runs when no group fits.
+        members = self.host_members[h]
+        host_candidates: list[tuple[int, ...]] = []
+        if not self.rushing or all(len(g) < k for g in by_group.values()):
+            best = self.subset_search[h].solve(k, [self.local_of[i] for i in free], self.subset_budget_sec)
+            host_candidates.append(tuple(sorted(members[j] for j in best.members)))
+        for group_free in by_group.values():
+            if len(group_free) >= k:
+                cand = self._pick_within(group_free, k)
+                if cand not in host_candidates:
+                    host_candidates.append(cand)
+        out = [(self._set_cost(list(cand)), cand) for cand in host_candidates]
+        out.sort(key=lambda c: (c[0], c[1]))
+        return out[: self.branching]
+
+    def _host_shared(self, h: int, job: _Job) -> list[tuple[float, tuple[int, ...]]]:
+        out: list[tuple[float, tuple[int, ...]]] = []
+        for i in self.host_members[h]:
+            slot = self.slots[i]
+            if self.train_used[i] or slot.capacity_gb - self.infer_load[i] < job.vram_per_gpu:
+                continue
+            cost = UTIL_COST * slot.util / 100.0
+            if self.infer_count[i] == 0:
+                cost += OPEN_INFERENCE_GPU_COST
+            if slot.mismatch:
+                cost += NUMA_MISMATCH_COST
+            out.append((cost, (i,)))
+        out.sort(key=lambda c: (c[0], c[1]))
+        return out[: self.branching]
+
+    def _host_candidates(self, h: int, job: _Job) -> list[tuple[float, tuple[int, ...]]]:
+        key = (h, job.exclusive, job.gpu_count, job.vram_per_gpu)
+        cached = self._host_cache.get(key)
+        if cached is None or cached[0] != self.host_version[h]:
+            builder = self._host_exclusive if job.exclusive else self._host_shared
+            cached = (self.host_version[h], builder(h, job))
+            self._host_cache[key] = cached
+        return cached[1]
+
+    def _candidates(self, job: _Job) -> list[tuple[float, tuple[int, ...]]]:
+        if self.rushing:
+            # Out of time before the first leaf: finish the dive with the first
+            # host whose best set spans no NVLink group or NUMA node, instead of
+            # ranking the whole fleet. The dive only adds load, so each job
+            # shape resumes from the first host that last had room for it.
+            shape = (job.exclusive, job.gpu_count, job.vram_per_gpu)
+            best: tuple[float, tuple[int, ...]] | None = None
+            first_room = len(self.host_members)
+            for h in range(self._rush_from.get(shape, 0), len(self.host_members)):
+                if job.exclusive and self.host_idle[h] < job.gpu_count:
+                    continue
+                found = self._host_candidates(h, job)
+                if not found:
+                    continue
+                first_room = min(first_room, h)
+                if best is None or found[0] < best:
+                    best = found[0]
+                if best[0] < RUSH_ACCEPT_COST:
+                    break
+            self._rush_from[shape] = first_room
+            return [best] if best is not None else []
+        out: list[tuple[float, tuple[int, ...]]] = []
+        for h in range(len(self.host_members)):
+            if job.exclusive and self.host_idle[h] < job.gpu_count:
+                continue
+            out.extend(self._host_candidates(h, job))
+        return heapq.nsmallest(self.branching, out)
+
+    def _pick_within(self, free: list[int], k: int) -> tuple[int, ...]:
+        # Prefer a single NUMA node, then NUMA-aligned and least busy GPUs.
+        slots = self.slots
+
+        def rank(i: int) -> tuple[bool, float, int]:
+            return (slots[i].mismatch, slots[i].util, i)
+
+        by_numa: dict[int, list[int]] = {}
+        for i in free:
+            by_numa.setdefault(slots[i].numa_node, []).append(i)
+        local = [sorted(m, key=rank)[:k] for m in by_numa.values() if len(m) >= k]
+        if local:
+            return tuple(sorted(min(local, key=lambda m: self._set_cost(m))))
+        ordered: list[int] = []
+        for numa_members in sorted(by_numa.values(), key=lambda m: (-len(m), min(m))):
+            ordered.extend(sorted(numa_members, key=rank))
+        return tuple(sorted(ordered[:k]))
+
+    def _suffix_lower_bounds(self) -> list[float]:
+        # Optimistic per-job cost (no spans, no opening cost, least busy GPU
+        # with enough capacity); placing other jobs first can only make a job
+        # more expensive.
+        order = sorted(range(len(self.slots)), key=lambda i: self.slots[i].capacity_gb)
+        capacities = [self.slots[i].capacity_gb for i in order]
+        best_exclusive = [0.0] * (len(order) + 1)
+        best_shared = [0.0] * (len(order) + 1)
+        best_exclusive[-1] = best_shared[-1] = float("inf")
+        for pos in range(len(order) - 1, -1, -1):
+            slot = self.slots[order[pos]]
+            util = UTIL_COST * slot.util / 100.0
+            best_exclusive[pos] = min(best_exclusive[pos + 1], util)
+            best_shared[pos] = min(best_shared[pos + 1], util + (NUMA_MISMATCH_COST if slot.mismatch else 0.0))
+
+        largest_host = max((len(m) for m in self.host_members), default=0)
+        per_job: list[float] = []
+        for job in self.jobs:
+            pos = bisect.bisect_left(capacities, job.vram_per_gpu)
+            best = (best_exclusive if job.exclusive else best_shared)[pos]
+            placeable = best != float("inf") and (not job.exclusive or largest_host >= job.gpu_count)
+            per_job.append(best if placeable else self._unplaced_cost(job))
+        bounds = [0.0] * (len(per_job) + 1)
+        for pos in range(len(per_job) - 1, -1, -1):
+            bounds[pos] = bounds[pos + 1] + per_job[pos]
+        return bounds
+
+    def _apply(self, job: _Job, members: tuple[int, ...]) -> None:
+        h = self.host_of[members[0]]
+        self.host_version[h] += 1
+        for i in members:
+            if job.exclusive:
+                self.train_used[i] = True
+                self.host_idle[h] -= 1
+            else:
+                if self.infer_count[i] == 0:
+                    self.host_idle[h] -= 1
+                self.infer_load[i] += job.vram_per_gpu
+                self.infer_count[i] += 1
+
+    def _undo(self, job: _Job, members: tuple[int, ...]) -> None:
+        h = self.host_of[members[0]]
+        self.host_version[h] += 1
+        for i in members:
+            if job.exclusive:
+                self.train_used[i] = False
+                self.host_idle[h] += 1
+            else:
+                self.infer_load[i] -= job.vram_per_gpu
+                self.infer_count[i] -= 1
+                if self.infer_count[i] == 0:
+                    self.host_idle[h] += 1
+
+    def _enter(self, stack: list[list[Any]], pos: int, cost: float) -> None:
+        self.nodes += 1
+        if cost + self.lower_bounds[pos] >= self.best_cost:
+            return
+        if pos == len(self.jobs):
+            self.best_cost = cost
+            self.best = list(self.current)
+            return
+        job = self.jobs[pos]
+        options: list[tuple[float, tuple[int, ...] | None]] = list(self._candidates(job))
+        options.append((self._unplaced_cost(job), None))
+        # Frame: position, cost so far, options, next option, option applied.
+        stack.append([pos, cost, options, 0, False])
+
+    def solve(self) -> None:
+        # Iterative depth-first branch-and-bound; the first leaf is the greedy
+        # (best-candidate-first) solution, later leaves only replace it when cheaper.
+        stack: list[list[Any]] = []
+        self._enter(stack, 0, 0.0)
+        while stack:
+            # The clock is read on every node until a leaf exists, so a large
+            # fleet cannot spend its whole greedy dive past the deadline.
+            if (not self.best or self.rushing or self.nodes & 63 == 0) and time.perf_counter() > self.deadline:
+                self.complete = False
+                if self.best:
+                    return
+                self.rushing = True
+                self.subset_budget_sec = 0.0
+            frame = stack[-1]
+            pos, cost, options, nxt, applied = frame
+            job = self.jobs[pos]
+            if applied:
+                members = self.current.pop()
+                if members is not None:
+                    self._undo(job, members)
+                frame[4] = False
+            if nxt >= len(options):
+                stack.pop()
+                continue
+            frame[3] = nxt + 1
+            option_cost, members = options[nxt]
+            if members is not None:
+                self._apply(job, members)
+            self.current.append(members)
+            frame[4] = True
+            self._enter(stack, pos + 1, cost + option_cost)
+
+
+def _slots_for_scenario(host: str, scenario: dict[str, Any]) -> list[_Slot]:
+    capacity = float(scenario.get("total_vram_gb", 80))
+    graph = TopologyGraph.for_scenario(scenario) if scenario.get("topology") and scenario.get("gpus") else None
+    penalty = graph.penalty.tolist() if graph is not None and graph.gpu_ids else None
+    slots: list[_Slot] = []
+    for g in scenario.get("gpus", []):
+        topo_idx = graph.index_of(g["id"]) if penalty is not None and int(g["id"]) in graph.gpu_ids else -1
+        slots.append(
+            _Slot(
+                host=host,
+                gpu_id=int(g["id"]),
+                group=str(g.get("nvlink_group", "A")),
+                numa_node=int(g.get("numa_node", 0)),
+                mismatch=int(g.get("numa_node", 0)) != int(g.get("cpu_socket", g.get("numa_node", 0))),
+                util=float(g.get("gpu_util", 0.0)),
+                capacity_gb=capacity,
+                penalty_row=penalty[topo_idx] if topo_idx >= 0 else None,
+                topo_idx=topo_idx,
+            )
+        )
+    return slots
+
+
+def _jobs_for_workloads(workloads: list[Workload]) -> list[_Job]:
+    # Jobs keep their full gpu_demand; one that no host can hold stays unplaced.
+    jobs: list[_Job] = []
+    for order, w in enumerate(workloads):
+        exclusive = w.kind == "training" or w.gpu_demand > 1
+        count = max(1, int(w.gpu_demand)) if exclusive else 1
+        jobs.append(
+            _Job(
+                workload=w,
+                exclusive=exclusive,
+                gpu_count=count,
+                vram_per_gpu=float(w.vram_gb) / count,
+                order=order,
+            )
+        )
+    # Decreasing size first: big exclusive jobs, then the largest shared ones.
+    jobs.sort(key=lambda j: (not j.exclusive, -j.gpu_count, -j.vram_per_gpu, j.order))
+    return jobs
+
+
+def solve_fleet_placement(
+    scenarios: Mapping[str, dict[str, Any]],
+    workloads: list[Workload],
+    time_budget_sec: float = DEFAULT_TIME_BUDGET_SEC,
+    branching: int = DEFAULT_BRANCHING,
+) -> PlacementPlan:
+    t0 = time.perf_counter()
+    slots: list[_Slot] = []
+    for host, scenario in scenarios.items():
+        slots.extend(_slots_for_scenario(str(host), scenario))
+
+    jobs = _jobs_for_workloads(workloads)
+    solver = _Solver(slots, jobs, time_budget_sec, branching)
+    solver.solve()
+
+    assignments: list[Assignment] = []
+    unplaced: list[str] = []
+    for job, members in zip(jobs, solver.best):
+        if members is None:
+            unplaced.append(job.workload.name)
+            continue
+        assignments.append(
+            Assignment(
+                workload=job.workload.name,
+                kind=job.workload.kind,
+                host=slots[members[0]].host,
+                gpu_ids=[slots[i].gpu_id for i in members],
+                vram_per_gpu_gb=job.vram_per_gpu,
+            )
+        )
+
+    return PlacementPlan(
+        assignments=assignments,
+        unplaced=unplaced,
+        cost=solver.best_cost,
+        search_complete=solver.complete,
+        nodes_explored=solver.nodes,
+        elapsed_sec=time.perf_counter() - t0,
+        assignment_by_workload={a.workload: a for a in assignments},
+    )
+
+
+def solve_placement(
+    scenario: dict[str, Any],
+    workloads: list[Workload],
+    time_budget_sec: float = DEFAULT_TIME_BUDGET_SEC,
+    branching: int = DEFAULT_BRANCHING,
+) -> PlacementPlan:
+    host = str(scenario.get("name", "local"))
+    return solve_fleet_placement({host: scenario}, workloads, time_budget_sec, branching)
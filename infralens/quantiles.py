@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import math
+from typing import Any, Iterable, Iterator
+
+DEFAULT_UNIT_SEC = 1e-9  # values are bucketed as integer nanoseconds
+DEFAULT_SUB_BUCKET_BITS = 7  # 64..128 linear sub-buckets per power of two (<0.8% relative error)
+
+
+class LatencyHistogram:
+    # HDR-style log-linear histogram: exact linear buckets below 2**bits units,
+    # then each power of two is split into 2**(bits-1) equal sub-buckets. Memory
+    # is bounded by the number of distinct buckets (a few thousand at most), and
+    # histograms with the same unit/precision merge by adding counts.
+
+    __slots__ = ("unit_sec", "sub_bucket_bits", "_half", "counts", "count", "total", "min", "max")
+
+    def __init__(self, unit_sec: float = DEFAULT_UNIT_SEC, sub_bucket_bits: int = DEFAULT_SUB_BUCKET_BITS) -> None:
+        if unit_sec <= 0:
+            raise ValueError("unit_sec must be positive")
+        if not 2 <= sub_bucket_bits <= 16:
+            raise ValueError("sub_bucket_bits must be between 2 and 16")
+        self.unit_sec = float(unit_sec)
+        self.sub_bucket_bits = int(sub_bucket_bits)
+        self._half = 1 << (self.sub_bucket_bits - 1)
+        self.counts: dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = 0.0
+        self.max = 0.0
+
+    def _index(self, units: int) -> int:
+        shift = max(0, units.bit_length() - self.sub_bucket_bits)
+        return shift * self._half + (units >> shift)
+
+    def _bounds(self, index: int) -> tuple[int, int]:
+        if index < 2 * self._half:
+            return index, index
+        shift = index // self._half - 1
+        sub = index - shift * self._half
+        return sub << shift, ((sub + 1) << shift) - 1
+
+    def _representative(self, index: int) -> float:
+        low, high = self._bounds(index)
+        return (low + high) / 2.0 * self.unit_sec
+
+    def record(self, value_sec: float, count: int = 1) -> None:
+        if count <= 0:
+            return
+        value = max(0.0, float(value_sec))
+        idx = self._index(int(round(value / self.unit_sec)))
+        self.counts[idx] = self.counts.get(idx, 0) + count
+        if self.count == 0 or value < self.min:
+            self.min = value
+        if self.count == 0 or value > self.max:
+            self.max = value
+        self.count += count
+        self.total += value * count
+
+    def record_many(self, values: Iterable[float]) -> None:
+        for v in values:
+            self.record(v)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        # Nearest rank over buckets, clamped to the exact observed min/max.
+        if not self.count:
+            return 0.0
+        if q >= 1.0:
+            return self.max
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for idx in sorted(self.counts):
+            seen += self.counts[idx]
+            if seen >= rank:
+                return min(self.max, max(self.min, self._representative(idx)))
+        return self.max
+
+    def summary(self, digits: int = 6) -> dict[str, float]:
+        return {
+            "count": self.count,
+            "mean": round(self.mean, digits),
+            "p50": round(self.quantile(0.50), digits),
+            "p95": round(self.quantile(0.95), digits),
+            "p99": round(self.quantile(0.99), digits),
+            "max": round(self.max, digits),
+        }
+
+    def buckets(self) -> Iterator[tuple[float, int]]:
+        for idx in sorted(self.counts):
+            yield self._representative(idx), self.counts[idx]
+
+    def _check_compatible(self, other: LatencyHistogram) -> None:
+        if other.unit_sec != self.unit_sec or other.sub_bucket_bits != self.sub_bucket_bits:
+            raise ValueError("Cannot merge histograms with different unit or precision")
+
+    def merge(self, other: LatencyHistogram) -> LatencyHistogram:
+        self._check_compatible(other)
+        if not other.count:
+            return self
+        for idx, c in other.counts.items():
+            self.counts[idx] = self.counts.get(idx, 0) + c
+        self.min = other.min if not self.count else min(self.min, other.min)
+        self.max = other.max if not self.count else max(self.max, other.max)
+        self.count += other.count
+        self.total += other.total
+        return self
+
+    @classmethod
+    def merged(cls, histograms: Iterable[LatencyHistogram]) -> LatencyHistogram:
+        out: LatencyHistogram | None = None
+        for h in histograms:
+            if out is None:
+                out = cls(h.unit_sec, h.sub_bucket_bits)
+            out.merge(h)
+        return out if out is not None else cls()
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "unit_sec": self.unit_sec,
+            "sub_bucket_bits": self.sub_bucket_bits,
+            "count": self.count,
+            "total": self.total,
+            "min": self.min,
+            "max": self.max,
+            "counts": [[idx, self.counts[idx]] for idx in sorted(self.counts)],
+        }
+
+    @classmethod
+    def from_dict(cls, payload: dict[str, Any]) -> LatencyHistogram:
+        h = cls(
+            unit_sec=float(payload.get("unit_sec", DEFAULT_UNIT_SEC)),
+            sub_bucket_bits=int(payload.get("sub_bucket_bits", DEFAULT_SUB_BUCKET_BITS)),
+        )
+        h.counts = {int(idx): int(c) for idx, c in payload.get("counts", [])}
+        h.count = int(payload.get("count", sum(h.counts.values())))
+        h.total = float(payload.get("total", 0.0))
+        h.min = float(payload.get("min", 0.0))
+        h.max = float(payload.get("max", 0.0))
+        return h
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __bool__(self) -> bool:
+        return True
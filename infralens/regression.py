@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Sequence, Union
+
+import numpy as np
+
+from infralens.quantiles import LatencyHistogram
+
+DEFAULT_THRESHOLD = 0.10
+DEFAULT_CONFIDENCE = 0.95
+DEFAULT_RESAMPLES = 2000
+DEFAULT_MIN_SAMPLES = 3
+
+
+@dataclass
+class WeightedSamples:
+    # (value, count) pairs, e.g. histogram buckets, so long-running histograms
+    # are never expanded into one float per recorded sample.
+    values: list[float]
+    counts: list[int]
+
+    def __len__(self) -> int:
+        return sum(self.counts)
+
+    def extend(self, other: Samples) -> None:
+        if isinstance(other, WeightedSamples):
+            self.values.extend(other.values)
+            self.counts.extend(other.counts)
+        else:
+            self.values.extend(float(v) for v in other)
+            self.counts.extend(1 for _ in other)
+
+
+Samples = Union[Sequence[float], WeightedSamples]
+
+
+@dataclass
+class StageComparison:
+    stage: str
+    baseline_n: int
+    candidate_n: int
+    baseline_median_sec: float
+    candidate_median_sec: float
+    delta_pct: float
+    ci_low_pct: float
+    ci_high_pct: float
+    status: str  # regression | improvement | unchanged | insufficient
+
+
+def load_records(path: str | Path) -> list[dict[str, Any]]:
+    records: list[dict[str, Any]] = []
+    p = Path(path)
+    if not p.exists():
+        return records
+    with p.open("r", encoding="utf-8") as f:
+        for line in f:
+            token = line.strip()
+            if not token:
+                continue
+            try:
+                records.append(json.loads(token))
+            except json.JSONDecodeError:
+                continue
+    return records
+
+
+def stage_samples(record: dict[str, Any]) -> dict[str, Samples]:
+    # Benchmark records: one distribution per stage and fleet size.
+    if record.get("kind") == "benchmark":
+        out: dict[str, list[float]] = {}
+        for r in record.get("results", []):
+            key = f"{r['stage']}@{r['gpus']}"
+            out.setdefault(key, []).extend(float(v) for v in r.get("samples_sec", []))
+        return out
+
+    # Success-metric records: latency histograms (bucket representatives with
+    # their counts), raw samples, or the summary averages for old records.
+    histograms = record.get("latency_histograms")
+    if isinstance(histograms, dict) and histograms:
+        weighted: dict[str, Samples] = {}
+        for stage, payload in histograms.items():
+            buckets = list(LatencyHistogram.from_dict(payload).buckets())
+            weighted[stage] = WeightedSamples([v for v, _ in buckets], [c for _, c in buckets])
+        return weighted
+    samples = record.get("samples_sec")
+    if isinstance(samples, dict) and samples:
+        return {stage: [float(v) for v in values] for stage, values in samples.items()}
+    response = record.get("response_time_sec", {})
+    return {
+        stage: [float(response[f"{stage}_avg"])]
+        for stage in ("score", "analysis_pipeline")
+        if f"{stage}_avg" in response
+    }
+
+
+def pooled_samples(records: list[dict[str, Any]]) -> dict[str, Samples]:
+    pooled: dict[str, Samples] = {}
+    for record in records:
+        for stage, values in stage_samples(record).items():
+            current = pooled.get(stage)
+            if current is None:
+                pooled[stage] = values if isinstance(values, WeightedSamples) else list(values)
+                continue
+            if isinstance(values, WeightedSamples) and not isinstance(current, WeightedSamples):
+                current = pooled[stage] = WeightedSamples([float(v) for v in current], [1] * len(current))
+            current.extend(values)
+    return pooled
+
+
+def select_phase(records: list[dict[str, Any]], phase: str, window: int = 1) -> list[dict[str, Any]]:
+    matching = [r for r in records if r.get("phase", "") == phase]
+    return matching[-max(1, window):] if matching else []
+
+
+def _distribution(samples: Samples) -> tuple[np.ndarray, np.ndarray]:
+    # Sorted distinct values and their counts.
+    if isinstance(samples, WeightedSamples):
+        values = np.asarray(samples.values, dtype=np.float64)
+        counts = np.asarray(samples.counts, dtype=np.int64)
+        keep = counts > 0
+        values, inverse = np.unique(values[keep], return_inverse=True)
+        return values, np.bincount(inverse, weights=counts[keep], minlength=values.size).astype(np.int64)
+    return np.unique(np.asarray(samples, dtype=np.float64), return_counts=True)
+
+
+def _weighted_medians(values: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    # Row-wise median of counts over `values` (sorted); matches np.median on
+    # the expanded samples, averaging the two middle order statistics.
+    counts = np.atleast_2d(counts)
+    n = counts.sum(axis=1)
+    cum = np.cumsum(counts, axis=1)
+    lo = np.minimum((cum <= ((n - 1) // 2)[:, None]).sum(axis=1), values.size - 1)
+    hi = np.minimum((cum <= (n // 2)[:, None]).sum(axis=1), values.size - 1)
+    return (values[lo] + values[hi]) / 2.0
+
+
+def _bootstrap_ratio_ci(
+    baseline: tuple[np.ndarray, np.ndarray],
+    candidate: tuple[np.ndarray, np.ndarray],
+    confidence: float,
+    resamples: int,
+    rng: np.random.Generator,
+) -> tuple[float, float]:
+    # Resampling n draws with replacement is a multinomial over the distinct
+    # values, so memory is resamples x distinct values, not resamples x n.
+    medians = []
+    for values, counts in (baseline, candidate):
+        n = int(counts.sum())
+        draws = rng.multinomial(n, counts / n, size=resamples)
+        medians.append(_weighted_medians(values, draws))
+    b, c = medians
+    ratios = c / np.maximum(b, 1e-12)
+    alpha = (1.0 - confidence) / 2.0
+    low, high = np.quantile(ratios, [alpha, 1.0 - alpha])
+    return float(low) - 1.0, float(high) - 1.0
+
+
+def compare_stage(
+    stage: str,
+    baseline: Samples,
+    candidate: Samples,
+    threshold: float = DEFAULT_THRESHOLD,
+    confidence: float = DEFAULT_CONFIDENCE,
+    resamples: int = DEFAULT_RESAMPLES,
+    min_samples: int = DEFAULT_MIN_SAMPLES,
+    seed: int = 0,
+) -> StageComparison:
+    b = _distribution(baseline)
+    c = _distribution(candidate)
+    b_n, c_n = int(b[1].sum()), int(c[1].sum())
+    b_med = float(_weighted_medians(*b)[0]) if b_n else 0.0
+    c_med = float(_weighted_medians(*c)[0]) if c_n else 0.0
+    delta = (c_med / b_med - 1.0) if b_med > 0 else 0.0
+
+    if b_n < min_samples or c_n < min_samples:
+        low = high = delta
+        status = "insufficient"
+    else:
+        low, high = _bootstrap_ratio_ci(b, c, confidence, max(100, resamples), np.random.default_rng(seed))
+        # Only call it when the whole interval clears the threshold.
+        if low > threshold:
+            status = "regression"
+        elif high < -threshold:
+            status = "improvement"
+        else:
+            status = "unchanged"
+
+    return StageComparison(
+        stage=stage,
+        baseline_n=b_n,
+        candidate_n=c_n,
+        baseline_median_sec=b_med,
+        candidate_median_sec=c_med,
+        delta_pct=round(delta * 100.0, 2),
+        ci_low_pct=round(low * 100.0, 2),
+        ci_high_pct=round(high * 100.0, 2),
+        status=status,
+    )
+
+
+def compare_runs(
+    baseline: dict[str, Samples],
+    candidate: dict[str, Samples],
+    threshold: float = DEFAULT_THRESHOLD,
+    confidence: float = DEFAULT_CONFIDENCE,
+    resamples: int = DEFAULT_RESAMPLES,
+    min_samples: int = DEFAULT_MIN_SAMPLES,
+    seed: int = 0,
+) -> list[StageComparison]:
+    stages = [s for s in baseline if s in candidate]
+    return [
+        compare_stage(
+            stage,
+            baseline[stage],
+            candidate[stage],
+            threshold=threshold,
+            confidence=confidence,
+            resamples=resamples,
+            min_samples=min_samples,
+            seed=seed,
+        )
+        for stage in stages
+    ]
+
+
+def has_regression(comparisons: list[StageComparison]) -> bool:
+    return any(c.status == "regression" for c in comparisons)
+
+
+def format_delta_table(comparisons: list[StageComparison]) -> str:
+    header = (
+        f"{'stage':<24} {'n(b/c)':>9} {'base ms':>10} {'cand ms':>10} {'delta':>9} {'CI':>21}  status"
+    )
+    lines = [header, "-" * len(header)]
+    for c in comparisons:
+        ci = f"[{c.ci_low_pct:+.1f}%, {c.ci_high_pct:+.1f}%]"
+        lines.append(
+            f"{c.stage:<24} {f'{c.baseline_n}/{c.candidate_n}':>9} "
+            f"{c.baseline_median_sec * 1000:>10.3f} {c.candidate_median_sec * 1000:>10.3f} "
+            f"{c.delta_pct:>+8.1f}% {ci:>21}  {c.status}"
+        )
+    return "\n".join(lines)
@@ -3,21 +3,40 @@ from __future__ import annotations
 from datetime import datetime
 from pathlib import Path
 import re
-from typing import Any
-
-from fpdf import FPDF
+from typing import TYPE_CHECKING, Any
 
 from infralens.rules import Finding, RecommendationResult
 from infralens.scoring import ScoreResult
+from infralens.tracing import traced
+
+if TYPE_CHECKING:
+    from fpdf import FPDF
+
+_PDF_REPORT_CLASS: type | None = None
+
+
+def _pdf_report_class() -> type:
+    # fpdf is only needed for export; build the subclass on first use.
+    global _PDF_REPORT_CLASS
+    if _PDF_REPORT_CLASS is None:
+        from fpdf import FPDF
+
+        class PDFReport(FPDF):
+            def header(self) -> None:
+                self.set_font("Helvetica", "B", 14)
+                self.cell(0, 10, "InfraLens MVP Report", ln=True)
+                self.set_font("Helvetica", "", 10)
+                self.cell(0, 7, datetime.now().strftime("Generated: %Y-%m-%d %H:%M:%S"), ln=True)
+                self.ln(2)
+
+        _PDF_REPORT_CLASS = PDFReport
+    return _PDF_REPORT_CLASS
 
 
-class PDFReport(FPDF):
-    def header(self) -> None:
-        self.set_font("Helvetica", "B", 14)
-        self.cell(0, 10, "InfraLens MVP Report", ln=True)
-        self.set_font("Helvetica", "", 10)
-        self.cell(0, 7, datetime.now().strftime("Generated: %Y-%m-%d %H:%M:%S"), ln=True)
-        self.ln(2)
+def __getattr__(name: str) -> Any:
+    if name == "PDFReport":
+        return _pdf_report_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def _safe_pdf_text(pdf: FPDF, text: str) -> str:
@@ -91,6 +110,7 @@ def _enable_unicode_font(pdf: FPDF) -> tuple[bool, str]:
     return False, "Helvetica"
 
 
+@traced("pdf")
 def build_pdf_report(
     scenario_name: str,
     score: ScoreResult,
@@ -114,7 +134,7 @@ def build_pdf_report(
         "expected": "Expected improvement",
     }
 
-    pdf = PDFReport()
+    pdf = _pdf_report_class()()
     unicode_enabled, font_family = _enable_unicode_font(pdf)
     setattr(pdf, "_unicode_enabled", unicode_enabled)
     pdf.set_auto_page_break(auto=True, margin=15)
@@ -160,8 +180,8 @@ def build_pdf_report(
     if expected_line is None:
         expected_line = (
             f"{lbl['expected']}: utilization {recommendation.expected_util_before}% -> "
-            f"{recommendation.expected_util_after}%, training +{recommendation.expected_training_gain_pct}%, "
-            f"latency -{recommendation.expected_latency_drop_pct}%"
+            f"{recommendation.expected_util_after}%, training {recommendation.expected_training_gain_pct:+d}%, "
+            f"latency {-recommendation.expected_latency_drop_pct:+d}%"
         )
     _write_multiline(pdf, expected_line)
     pdf.ln(2)
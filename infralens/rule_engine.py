@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import operator
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable
+
+from infralens.config import get_profile_map, get_rule_specs
+from infralens.data import Workload
+
+if TYPE_CHECKING:
+    import numpy as np
+
+RULE_SCOPES = ("gpu", "any", "count")
+
+_OPERATORS: dict[str, Callable[[Any, Any], Any]] = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+_PARAM_TYPES: dict[str, Callable[[Any], Any]] = {"int": int, "float": float, "str": str}
+
+
+@dataclass
+class RuleTiming:
+    calls: int = 0
+    total_sec: float = 0.0
+    fired: int = 0
+
+
+@dataclass
+class RuleHit:
+    code: str
+    category: str
+    severity: str
+    message: str
+    data: dict[str, Any] | None
+
+
+@dataclass(frozen=True)
+class _Clause:
+    column: str
+    op: str
+    rhs_column: str | None
+    rhs_value: Any
+
+
+@dataclass
+class CompiledRule:
+    code: str
+    category: str
+    severity: str
+    scope: str
+    message: str
+    clauses: tuple[int, ...]
+    params: dict[str, Any]
+    data: dict[str, str] | None = None
+    min_count: int = 1
+    min_fraction: float = 0.0
+    workload_kind: str | None = None
+    workload_min_gpu_demand: int = 0
+    min_distinct: dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class CompiledRuleSet:
+    profile: str
+    rules: list[CompiledRule]
+    clauses: list[_Clause]
+    columns: tuple[str, ...]
+
+
+_RULE_TIMINGS: dict[str, RuleTiming] = {}
+
+
+def rule_timings() -> dict[str, RuleTiming]:
+    return {code: RuleTiming(t.calls, t.total_sec, t.fired) for code, t in _RULE_TIMINGS.items()}
+
+
+def reset_rule_timings() -> None:
+    _RULE_TIMINGS.clear()
+
+
+def _resolve_params(spec: dict[str, Any], thresholds: dict[str, Any]) -> dict[str, Any]:
+    params: dict[str, Any] = {}
+    for name, p in (spec.get("params") or {}).items():
+        if not isinstance(p, dict):
+            p = {"default": p}
+        cast = _PARAM_TYPES.get(str(p.get("type", "float")))
+        if cast is None:
+            raise ValueError(f"Rule '{spec.get('code')}' param '{name}' has unknown type '{p.get('type')}'.")
+        params[name] = cast(thresholds.get(p.get("key", name), p.get("default")))
+    return params
+
+
+def _operand(value: Any, params: dict[str, Any], code: str) -> tuple[str | None, Any]:
+    # "$name" is a threshold parameter, other strings are columns, the rest literals.
+    if isinstance(value, str):
+        if value.startswith("$"):
+            if value[1:] not in params:
+                raise ValueError(f"Rule '{code}' references undefined param '{value}'.")
+            return None, params[value[1:]]
+        return value, None
+    return None, value
+
+
+def _resolve_number(value: Any, params: dict[str, Any], code: str) -> Any:
+    column, literal = _operand(value, params, code)
+    if column is not None:
+        raise ValueError(f"Rule '{code}' expects a number or '$param', got '{value}'.")
+    return literal
+
+
+def _compile_rule(
+    spec: dict[str, Any],
+    thresholds: dict[str, Any],
+    clause_index: dict[_Clause, int],
+    columns: set[str],
+) -> CompiledRule:
+    code = str(spec.get("code") or "")
+    if not code:
+        raise ValueError("Every rule needs a 'code'.")
+    scope = str(spec.get("scope", "any"))
+    if scope not in RULE_SCOPES:
+        raise ValueError(f"Rule '{code}' has unknown scope '{scope}'.")
+    params = _resolve_params(spec, thresholds)
+
+    clause_ids: list[int] = []
+    for raw in spec.get("when") or []:
+        if not isinstance(raw, (list, tuple)) or len(raw) != 3 or raw[1] not in _OPERATORS:
+            raise ValueError(f"Rule '{code}' has an invalid clause {raw!r}.")
+        lhs, op, rhs = raw
+        if not isinstance(lhs, str) or lhs.startswith("$"):
+            raise ValueError(f"Rule '{code}' clause must start with a column name: {raw!r}.")
+        rhs_column, rhs_value = _operand(rhs, params, code)
+        clause = _Clause(column=lhs, op=op, rhs_column=rhs_column, rhs_value=rhs_value)
+        columns.add(lhs)
+        if rhs_column:
+            columns.add(rhs_column)
+        # Identical clauses across rules are evaluated once per call.
+        clause_ids.append(clause_index.setdefault(clause, len(clause_index)))
+
+    workloads = spec.get("workloads") or {}
+    min_distinct = {str(k): int(v) for k, v in (spec.get("min_distinct") or {}).items()}
+    columns.update(min_distinct)
+
+    return CompiledRule(
+        code=code,
+        category=str(spec.get("category", "GENERIC")),
+        severity=str(spec.get("severity", "medium")),
+        scope=scope,
+        message=str(spec.get("message", "")),
+        clauses=tuple(clause_ids),
+        params=params,
+        data=dict(spec["data"]) if spec.get("data") else None,
+        min_count=int(_resolve_number(spec.get("min_count", 1), params, code)),
+        min_fraction=float(_resolve_number(spec.get("min_fraction", 0.0), params, code)),
+        workload_kind=workloads.get("kind"),
+        workload_min_gpu_demand=int(_resolve_number(workloads.get("min_gpu_demand", 0), params, code)),
+        min_distinct=min_distinct,
+    )
+
+
+@lru_cache(maxsize=None)
+def compile_rules(profile: str = "default") -> CompiledRuleSet:
+    cfg_map = get_profile_map("rule_thresholds")
+    thresholds = cfg_map.get(profile, cfg_map.get("default", {}))
+    clause_index: dict[_Clause, int] = {}
+    columns: set[str] = set()
+    rules = [_compile_rule(spec, thresholds, clause_index, columns) for spec in get_rule_specs()]
+    return CompiledRuleSet(
+        profile=profile,
+        rules=rules,
+        clauses=sorted(clause_index, key=clause_index.__getitem__),
+        columns=tuple(sorted(columns)),
+    )
+
+
+def _gpu_columns(scenario: dict[str, Any], columns: tuple[str, ...]) -> dict[str, np.ndarray]:
+    import numpy as np
+
+    gpus = scenario["gpus"]
+    table: dict[str, np.ndarray] = {}
+    for name in columns:
+        # Scenario-level values (e.g. total_vram_gb) broadcast to every GPU.
+        fallback = scenario.get(name)
+        values = [g.get(name, fallback) for g in gpus]
+        table[name] = np.asarray(values, dtype=object if any(isinstance(v, str) for v in values) else None)
+    return table
+
+
+def _format(rule: CompiledRule, context: dict[str, Any]) -> tuple[str, dict[str, Any] | None]:
+    try:
+        message = rule.message.format(**context)
+        data = {key: context[name] for key, name in rule.data.items()} if rule.data else None
+    except (KeyError, IndexError) as exc:
+        raise ValueError(f"Rule '{rule.code}' references unknown field {exc}.") from exc
+    return message, data
+
+
+def _workloads_match(rule: CompiledRule, workloads: list[Workload]) -> bool:
+    if rule.workload_kind is None:
+        return True
+    return any(
+        w.kind == rule.workload_kind and w.gpu_demand >= rule.workload_min_gpu_demand for w in workloads
+    )
+
+
+def evaluate_rules(
+    scenario: dict[str, Any], workloads: list[Workload], profile: str = "default"
+) -> list[RuleHit]:
+    import numpy as np
+
+    ruleset = compile_rules(profile)
+    gpus = scenario["gpus"]
+    n = len(gpus)
+    table = _gpu_columns(scenario, ruleset.columns)
+    masks: list[np.ndarray | None] = [None] * len(ruleset.clauses)
+    distinct: dict[str, int] = {}
+    all_rows = np.ones(n, dtype=bool)
+
+    hits: list[RuleHit] = []
+    for rule in ruleset.rules:
+        t0 = time.perf_counter()
+        fired = 0
+        if _workloads_match(rule, workloads) and all(
+            distinct.setdefault(col, len(set(table[col].tolist()))) >= need
+            for col, need in rule.min_distinct.items()
+        ):
+            mask = all_rows
+            for cid in rule.clauses:
+                clause_mask = masks[cid]
+                if clause_mask is None:
+                    clause = ruleset.clauses[cid]
+                    rhs = table[clause.rhs_column] if clause.rhs_column else clause.rhs_value
+                    clause_mask = np.asarray(_OPERATORS[clause.op](table[clause.column], rhs), dtype=bool)
+                    masks[cid] = clause_mask
+                mask = mask & clause_mask
+
+            count = int(mask.sum())
+            if rule.scope == "gpu":
+                for idx in np.flatnonzero(mask).tolist():
+                    message, data = _format(rule, {**rule.params, **gpus[idx]})
+                    hits.append(RuleHit(rule.code, rule.category, rule.severity, message, data))
+                    fired += 1
+            else:
+                needed = 1 if rule.scope == "any" else max(rule.min_count, int(round(n * rule.min_fraction)))
+                if count >= needed and count > 0:
+                    message, data = _format(rule, {**rule.params, "count": count, "gpu_count": n})
+                    hits.append(RuleHit(rule.code, rule.category, rule.severity, message, data))
+                    fired = 1
+
+        timing = _RULE_TIMINGS.setdefault(rule.code, RuleTiming())
+        timing.calls += 1
+        timing.total_sec += time.perf_counter() - t0
+        timing.fired += fired
+    return hits
@@ -1,11 +1,26 @@
 from __future__ import annotations
 
-from collections import defaultdict
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any
 
 from infralens.config import get_profile_map
 from infralens.data import Workload
+from infralens.mig import (
+    MigInstance,
+    MigLayout,
+    MigProfile,
+    apply_upgrade,
+    compute_slices_of,
+    instance_upgrades,
+    mig_model_for,
+    mig_setup_commands,
+    plan_mig,
+)
+from infralens.placement import solve_placement
+from infralens.rule_engine import evaluate_rules
+from infralens.simulator import Placement, PlacementSimulator, naive_placement, projected_change_pct
+from infralens.topology import TopologyGraph
+from infralens.tracing import traced
 
 
 @dataclass
@@ -32,82 +47,17 @@ class RecommendationResult:
     expected_util_after: int
     expected_training_gain_pct: int
     expected_latency_drop_pct: int
+    mig_layouts: list[dict[str, Any]] = field(default_factory=list)
 
 
+@traced("rules")
 def detect_bottlenecks(
     scenario: dict[str, Any], workloads: list[Workload], profile: str = "default"
 ) -> list[Finding]:
-    findings: list[Finding] = []
-    gpus = scenario["gpus"]
-    cfg_map = get_profile_map("rule_thresholds")
-    cfg = cfg_map.get(profile, cfg_map.get("default", {}))
-    low_util_threshold = int(cfg.get("low_util_threshold", 45))
-    low_util_fraction = float(cfg.get("low_util_fraction", 0.25))
-    mig_util_th = int(cfg.get("mig_underused_util_threshold", 65))
-    mig_vram_th = float(cfg.get("mig_underused_vram_threshold_gb", 90))
-    train_gpu_req = int(cfg.get("requires_training_gpus", 4))
-
-    for g in gpus:
-        if g["numa_node"] != g["cpu_socket"]:
-            findings.append(
-                Finding(
-                    category="NUMA",
-                    severity="high",
-                    message=(
-                        f"GPU {g['id']} has NUMA mismatch (GPU NUMA {g['numa_node']} vs "
-                        f"CPU socket {g['cpu_socket']})."
-                    ),
-                    code="numa_mismatch",
-                    data={"gpu_id": g["id"], "numa_node": g["numa_node"], "cpu_socket": g["cpu_socket"]},
-                )
-            )
-
-    low_util = [g for g in gpus if g["gpu_util"] < low_util_threshold]
-    if len(low_util) >= max(1, int(round(len(gpus) * low_util_fraction))):
-        findings.append(
-            Finding(
-                category="GPU_UTIL",
-                severity="medium",
-                message=(
-                    f"{len(low_util)} GPU(s) show low utilization (<{low_util_threshold}%), indicating potential under-allocation."
-                ),
-                code="low_gpu_util",
-                data={"count": len(low_util), "threshold": low_util_threshold},
-            )
-        )
-
-    if any(w.kind == "inference" for w in workloads):
-        underused = any(g["gpu_util"] < mig_util_th and g["vram_used_gb"] < mig_vram_th for g in gpus)
-        if underused:
-            findings.append(
-                Finding(
-                    category="MIG",
-                    severity="medium",
-                    message=(
-                        "Inference workloads are running on underused full GPUs; MIG partitioning can improve density."
-                    ),
-                    code="mig_opportunity",
-                    data={
-                        "gpu_util_threshold": mig_util_th,
-                        "vram_used_threshold_gb": mig_vram_th,
-                    },
-                )
-            )
-
-    groups: dict[str, list[int]] = defaultdict(list)
-    for g in gpus:
-        groups[g["nvlink_group"]].append(g["id"])
-    if len(groups) >= 2 and any(w.kind == "training" and w.gpu_demand >= train_gpu_req for w in workloads):
-        findings.append(
-            Finding(
-                category="NVLINK",
-                severity="high",
-                message=(
-                    "Multi-GPU training workload detected. Keeping GPUs within one NVLink group is recommended."
-                ),
-                code="nvlink_spread_training",
-            )
-        )
+    findings = [
+        Finding(category=h.category, severity=h.severity, message=h.message, code=h.code, data=h.data)
+        for h in evaluate_rules(scenario, workloads, profile=profile)
+    ]
 
     if not findings:
         findings.append(
@@ -122,6 +72,41 @@ def detect_bottlenecks(
     return findings
 
 
+def _deferred_item(job: Workload) -> PlacementItem:
+    return PlacementItem(
+        workload=job.name,
+        action=(
+            f"Defer: no conflict-free GPU capacity left for {job.gpu_demand} GPU(s) / {job.vram_gb:g}GB VRAM."
+        ),
+        code="defer_unplaced",
+        data={"gpu_demand": job.gpu_demand, "vram_gb": job.vram_gb},
+    )
+
+
+def _capped_upgrades(layout: MigLayout, needed: dict[str, int]) -> list[tuple[MigInstance, MigProfile, int]]:
+    # Only instances still short of their SM need grow, and no further than the
+    # smallest profile that covers it.
+    options = [o for o in instance_upgrades(layout) if compute_slices_of(o[0].profile) < needed[o[0].workload]]
+    cap: dict[str, int] = {}
+    for inst, p, _ in options:
+        if p.compute_slices >= needed[inst.workload]:
+            cap[inst.workload] = min(cap.get(inst.workload, p.compute_slices), p.compute_slices)
+    return [o for o in options if o[1].compute_slices <= cap.get(o[0].workload, o[1].compute_slices)]
+
+
+def _subset_metrics(graph: TopologyGraph | None, target: list[int], util_by_id: dict[int, float]) -> dict[str, Any]:
+    if graph is None or not set(target) <= set(graph.gpu_ids):
+        return {}
+    links = [graph.bandwidth_gbps(a, b) for pos, a in enumerate(target) for b in target[pos + 1 :]]
+    return {
+        "aggregate_bandwidth_gbps": round(sum(links), 1),
+        "min_link_gbps": round(min(links), 1) if links else 0.0,
+        "numa_nodes": sorted({int(n) for g, n in zip(graph.gpu_ids, graph.numa.tolist()) if g in target}),
+        "mean_util": round(sum(util_by_id.get(g, 0.0) for g in target) / len(target), 2),
+    }
+
+
+@traced("placement")
 def build_placement_recommendation(
     scenario: dict[str, Any], workloads: list[Workload], current_score: int, profile: str = "default"
 ) -> RecommendationResult:
@@ -130,50 +115,170 @@ def build_placement_recommendation(
     cfg = cfg_map.get(profile, cfg_map.get("default", {}))
     util_score_factor = float(cfg.get("expected_util_score_factor", 0.77))
     util_gain = int(cfg.get("expected_util_gain", 30))
-    groups: dict[str, list[int]] = defaultdict(list)
-    for g in gpus:
-        groups[g["nvlink_group"]].append(g["id"])
-
-    sorted_groups = sorted(groups.values(), key=lambda x: len(x), reverse=True)
-    primary_group = sorted_groups[0] if sorted_groups else []
+    plan = solve_placement(scenario, workloads)
 
     items: list[PlacementItem] = []
 
     train_jobs = [w for w in workloads if w.kind == "training"]
     infer_jobs = [w for w in workloads if w.kind == "inference"]
 
+    graph = TopologyGraph.for_scenario(scenario) if gpus else None
+    simulator = PlacementSimulator(scenario, workloads, graph=graph)
+    chosen = {
+        a.workload: Placement(tuple(a.gpu_ids))
+        for a in plan.assignments
+        if a.kind == "training" or len(a.gpu_ids) > 1
+    }
+    if graph is not None:
+        # Let the simulator arbitrate between the solver's GPU set and the
+        # highest-bandwidth set still free for each training job.
+        used = {g for a in plan.assignments for g in a.gpu_ids}
+        for job in sorted(train_jobs, key=lambda j: j.gpu_demand, reverse=True):
+            current = chosen.get(job.name)
+            if current is None or len(current.gpu_ids) < 2:
+                continue
+            free = [g for g in graph.gpu_ids if g not in used or g in current.gpu_ids]
+            alt = tuple(sorted(graph.best_clique(len(current.gpu_ids), candidates=free)))
+            if not alt or alt == tuple(sorted(current.gpu_ids)):
+                continue
+            trial = {**chosen, job.name: Placement(alt)}
+            if simulator.rank([chosen, trial])[0][0] == 1:
+                used = (used - set(current.gpu_ids)) | set(alt)
+                chosen = trial
+
+    util_by_id = {int(g["id"]): float(g.get("gpu_util", 0.0)) for g in gpus}
     for job in sorted(train_jobs, key=lambda j: j.gpu_demand, reverse=True):
-        target = primary_group[: max(1, min(job.gpu_demand, len(primary_group)))]
+        placement = chosen.get(job.name)
+        if placement is None:
+            items.append(_deferred_item(job))
+            continue
+        target = list(placement.gpu_ids)
         items.append(
             PlacementItem(
                 workload=job.name,
                 action=f"Move to NVLink group GPUs {target} with NUMA-aligned CPU pinning.",
                 code="move_training_nvlink",
-                data={"target_gpus": target},
+                data={"target_gpus": target, **_subset_metrics(graph, target, util_by_id)},
             )
         )
 
-    mig_host = max(gpus, key=lambda x: (x["gpu_util"] < 50, -x["gpu_util"], x["id"]))
+    # Single-GPU inference on MIG-capable parts is packed into MIG instances on
+    # whatever the training jobs left free; everything else shares whole GPUs.
+    reserved = [g for placement in chosen.values() for g in placement.gpu_ids]
+    mig_jobs = [w for w in infer_jobs if w.gpu_demand <= 1] if mig_model_for(scenario) else []
+    mig_names = {w.name for w in mig_jobs}
+    mig_plan = plan_mig(scenario, mig_jobs, reserved_gpus=reserved) if mig_jobs else None
+    layout_by_gpu = {layout.gpu_id: layout for layout in mig_plan.layouts} if mig_plan else {}
+    if mig_plan is not None:
+        for inst in mig_plan.instances.values():
+            chosen[inst.workload] = Placement((inst.gpu_id,), mig_slices=compute_slices_of(inst.profile))
+        # Grow instances into slices the packing left free on their GPU while
+        # the simulator projects a gain and the job still wants more SMs; the
+        # GPU count does not change.
+        needed = {w.name: simulator.mig_slices_needed(w) for w in mig_jobs}
+        for layout in mig_plan.layouts:
+            while True:
+                options = _capped_upgrades(layout, needed)
+                trials = [
+                    {**chosen, inst.workload: Placement((inst.gpu_id,), mig_slices=p.compute_slices)}
+                    for inst, p, _ in options
+                ]
+                best = simulator.rank([chosen, *trials])[0][0] if trials else 0
+                if best == 0:
+                    break
+                apply_upgrade(layout, *options[best - 1])
+                chosen = trials[best - 1]
+
     for job in infer_jobs:
+        if mig_plan is not None and job.name in mig_names:
+            inst = mig_plan.instances.get(job.name)
+            if inst is None:
+                items.append(_deferred_item(job))
+                continue
+            layout = layout_by_gpu[inst.gpu_id]
+            items.append(
+                PlacementItem(
+                    workload=job.name,
+                    action=(
+                        f"Consolidate on GPU {inst.gpu_id} via MIG profile {inst.profile} "
+                        "for higher inference density."
+                    ),
+                    code="consolidate_inference_mig",
+                    data={
+                        "host_gpu": inst.gpu_id,
+                        "profile": inst.profile,
+                        "mig_index": inst.index,
+                        "mig_start": inst.start,
+                        "gpu_model": layout.model,
+                        "layout": layout.profiles,
+                    },
+                )
+            )
+            continue
+        assignment = plan.assignment_by_workload.get(job.name)
+        if assignment is None:
+            items.append(_deferred_item(job))
+            continue
+        chosen[job.name] = Placement(tuple(assignment.gpu_ids))
+        if len(assignment.gpu_ids) > 1:
+            target = list(assignment.gpu_ids)
+            items.append(
+                PlacementItem(
+                    workload=job.name,
+                    action=f"Serve across GPUs {target} as one sharded replica with NUMA-aligned CPU pinning.",
+                    code="place_inference_multi_gpu",
+                    data={"target_gpus": target, **_subset_metrics(graph, target, util_by_id)},
+                )
+            )
+            continue
+        host_gpu = assignment.gpu_ids[0]
         items.append(
             PlacementItem(
                 workload=job.name,
-                action=(
-                    f"Consolidate on GPU {mig_host['id']} via MIG profile 1g.20gb "
-                    "for higher inference density."
-                ),
+                action=f"Consolidate on shared GPU {host_gpu} (no MIG on this GPU model) for higher inference density.",
                 code="consolidate_inference_mig",
-                data={"host_gpu": mig_host["id"], "profile": "1g.20gb"},
+                data={"host_gpu": host_gpu, "profile": None},
             )
         )
 
+    # Projections are relative to a topology-unaware first-fit placement of the
+    # same workloads; the configured util gain caps the projected uplift. Both
+    # sides are evaluated over the jobs each of them places, so work that one
+    # side defers neither inflates nor deflates the other's numbers.
+    naive = naive_placement(scenario, workloads)
+    common = naive.keys() & chosen.keys()
+    baseline = simulator.evaluate({name: naive[name] for name in common})
+    projected = simulator.evaluate({name: chosen[name] for name in common})
+    for item in items:
+        proj = projected.projections.get(item.workload)
+        before = baseline.projections.get(item.workload)
+        if item.code == "defer_unplaced" or item.data is None:
+            continue
+        key = "projected_throughput_gain_pct" if item.code == "move_training_nvlink" else "projected_latency_change_pct"
+        if proj is None or before is None:
+            item.data[key] = None
+        elif proj.kind == "training":
+            item.data[key] = projected_change_pct(before.throughput, proj.throughput)
+        else:
+            item.data[key] = projected_change_pct(before.latency, proj.latency)
+
     util_before = int(round(current_score * util_score_factor))
-    util_after = min(95, util_before + util_gain)
+    uplift = projected_change_pct(baseline.effective_util, projected.effective_util) * util_before / 100.0
+    util_after = min(95, util_before + int(round(min(float(util_gain), max(0.0, uplift)))))
 
     return RecommendationResult(
         items=items,
         expected_util_before=util_before,
         expected_util_after=util_after,
-        expected_training_gain_pct=35,
-        expected_latency_drop_pct=20,
+        expected_training_gain_pct=projected_change_pct(baseline.training_throughput, projected.training_throughput),
+        expected_latency_drop_pct=-projected_change_pct(baseline.mean_latency, projected.mean_latency),
+        mig_layouts=[
+            {
+                "gpu_id": layout.gpu_id,
+                "model": layout.model,
+                "profiles": layout.profiles,
+                "commands": mig_setup_commands(layout),
+            }
+            for layout in (mig_plan.layouts if mig_plan else [])
+        ],
     )
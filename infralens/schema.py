@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import re
+import threading
+from dataclasses import dataclass
+from typing import Iterable, Mapping
+
+from infralens.config import get_column_aliases
+
+GPU_FIELDS = (
+    "id",
+    "gpu_util",
+    "memory_used_mib",
+    "memory_total_mib",
+    "memory_used_gb",
+    "memory_total_gb",
+    "network_io_score",
+    "numa_node",
+    "cpu_socket",
+    "nvlink_group",
+    "model",
+)
+
+# Normalized column names accepted for each GPU field, in priority order.
+BUILTIN_ALIASES: dict[str, tuple[str, ...]] = {
+    "id": ("index", "gpu", "gpu_id", "id"),
+    "gpu_util": ("utilization_gpu", "gpu_util", "gpu_utilization", "util"),
+    "memory_used_mib": ("memory_used", "memory_used_mib", "fb_memory_usage_used", "vram_used_mib"),
+    "memory_total_mib": ("memory_total", "memory_total_mib", "fb_memory_usage_total", "vram_total_mib"),
+    "memory_used_gb": ("vram_used_gb", "memory_used_gb"),
+    "memory_total_gb": ("vram_total_gb", "memory_total_gb"),
+    "network_io_score": ("network_io_score", "network_score"),
+    "numa_node": ("numa_node", "numa"),
+    "cpu_socket": ("cpu_socket", "socket", "cpu_affinity_socket"),
+    "nvlink_group": ("nvlink_group", "nvlink", "topology_group"),
+    # nvidia-smi `name` / DCGM `modelName`, e.g. "NVIDIA H100 80GB HBM3".
+    "model": ("name", "gpu_name", "product_name", "model_name", "modelname", "gpu_model", "model"),
+}
+
+# A generic topology column is a fallback label, not an NVLink assignment:
+# GPUs labelled only through it still get the default A/B split.
+IMPLICIT_NVLINK_COLUMNS = frozenset({"topology_group"})
+
+_MAPPING_CACHE_SIZE = 256
+
+
+def normalize_column(col: str) -> str:
+    col = col.strip().lower()
+    return re.sub(r"[^a-z0-9]+", "_", col).strip("_")
+
+
+@dataclass(frozen=True)
+class FieldMapping:
+    sources: tuple[tuple[str, tuple[str, ...]], ...]
+    nvlink_explicit: bool
+
+    def columns(self, field: str) -> tuple[str, ...]:
+        for name, cols in self.sources:
+            if name == field:
+                return cols
+        return ()
+
+
+class AliasRegistry:
+    def __init__(self, aliases: Mapping[str, Iterable[str]] | None = None) -> None:
+        self._lock = threading.Lock()
+        self._aliases: dict[str, list[str]] = {f: list(BUILTIN_ALIASES[f]) for f in GPU_FIELDS}
+        self._known: frozenset[str] = frozenset()
+        self._cache: dict[tuple[str, ...], FieldMapping] = {}
+        for field, names in (aliases or {}).items():
+            self.register(field, *names)
+        self._refresh()
+
+    def _refresh(self) -> None:
+        self._known = frozenset(c for cols in self._aliases.values() for c in cols)
+        self._cache.clear()
+
+    def register(self, field: str, *aliases: str, first: bool = False) -> None:
+        if field not in self._aliases:
+            raise ValueError(f"Unknown GPU field '{field}'. Expected one of: {', '.join(GPU_FIELDS)}.")
+        names = [normalize_column(a) for a in aliases if isinstance(a, str) and a.strip()]
+        with self._lock:
+            current = [c for c in self._aliases[field] if c not in names]
+            self._aliases[field] = names + current if first else current + [n for n in names if n not in current]
+            self._refresh()
+
+    def aliases(self, field: str) -> tuple[str, ...]:
+        return tuple(self._aliases[field])
+
+    def known_columns(self) -> frozenset[str]:
+        return self._known
+
+    def signature(self) -> str:
+        # Stable across processes; part of any cache key over parsed telemetry.
+        return "|".join(f"{f}={','.join(self._aliases[f])}" for f in GPU_FIELDS)
+
+    def compile(self, columns: Iterable[str]) -> FieldMapping:
+        key = tuple(columns)
+        mapping = self._cache.get(key)
+        if mapping is not None:
+            return mapping
+        present = set(key)
+        sources = tuple((f, tuple(c for c in self._aliases[f] if c in present)) for f in GPU_FIELDS)
+        nvlink_cols = dict(sources)["nvlink_group"]
+        mapping = FieldMapping(
+            sources=sources,
+            nvlink_explicit=any(c not in IMPLICIT_NVLINK_COLUMNS for c in nvlink_cols),
+        )
+        with self._lock:
+            if len(self._cache) >= _MAPPING_CACHE_SIZE:
+                self._cache.clear()
+            self._cache[key] = mapping
+        return mapping
+
+
+_DEFAULT_REGISTRY: AliasRegistry | None = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def default_registry() -> AliasRegistry:
+    # Built-in aliases plus the site's `column_aliases` config section.
+    global _DEFAULT_REGISTRY
+    if _DEFAULT_REGISTRY is None:
+        with _DEFAULT_LOCK:
+            if _DEFAULT_REGISTRY is None:
+                _DEFAULT_REGISTRY = AliasRegistry(get_column_aliases())
+    return _DEFAULT_REGISTRY
+
+
+def reset_default_registry() -> None:
+    global _DEFAULT_REGISTRY
+    with _DEFAULT_LOCK:
+        _DEFAULT_REGISTRY = None
+
+
+def register_column_alias(field: str, *aliases: str, first: bool = False) -> None:
+    default_registry().register(field, *aliases, first=first)
+
+
+def compile_field_mapping(columns: Iterable[str], registry: AliasRegistry | None = None) -> FieldMapping:
+    return (registry or default_registry()).compile(columns)
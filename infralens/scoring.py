@@ -6,6 +6,7 @@ from typing import Any
 
 from infralens.config import get_profile_map
 from infralens.data import Workload
+from infralens.tracing import traced
 
 
 @dataclass
@@ -48,6 +49,7 @@ def infer_workload_profile(workloads: list[Workload]) -> str:
     return "training" if train_gpu > infer_gpu else "inference"
 
 
+@traced("score")
 def calculate_efficiency_score(
     scenario: dict[str, Any], profile: str = "default"
 ) -> ScoreResult:
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Any, Mapping, Sequence
+
+from infralens.data import Workload
+from infralens.topology import TopologyGraph
+
+# Analytical model constants. Times are relative to one training step of pure
+# compute (training) or one request on an idle full GPU (inference); only
+# ratios between placements are meaningful.
+REFERENCE_LINK_GBPS = 300.0  # NV12, where all-reduce costs COMM_FRACTION of a step
+COMM_FRACTION = 0.15
+COMM_OVERLAP = 0.5  # share of compute time that hides communication
+NUMA_MISMATCH_PENALTY = 0.12  # compute slowdown with host memory on the remote node
+BACKGROUND_UTIL_WEIGHT = 0.25  # share of observed util assumed to be other tenants
+INFERENCE_DUTY = 0.6  # average busy fraction an inference job asks of its SMs
+MAX_LOAD = 0.95
+MIG_COMPUTE_SLICES = 7
+
+
+@dataclass(frozen=True)
+class Placement:
+    gpu_ids: tuple[int, ...]
+    mig_slices: int = 0  # compute slices of a MIG instance, 0 for whole GPUs
+    pinned: bool = True  # CPU threads and memory bound to the GPUs' NUMA node
+
+
+@dataclass
+class WorkloadProjection:
+    workload: str
+    kind: str
+    throughput: float  # training: relative samples/s (k GPUs at full speed = k)
+    latency: float  # inference: relative request latency (1.0 = idle full GPU)
+    compute_fraction: float  # share of wall time spent computing
+
+
+@dataclass
+class SimulationResult:
+    projections: dict[str, WorkloadProjection]
+    unplaced: list[str]
+    training_throughput: float
+    mean_latency: float
+    effective_util: float  # mean busy fraction over all GPUs
+
+    @property
+    def objective(self) -> float:
+        return self.training_throughput + sum(
+            1.0 / p.latency for p in self.projections.values() if p.kind == "inference" and p.latency > 0
+        )
+
+
+class PlacementSimulator:
+    # Link, NUMA and load data are flattened once per scenario so evaluating a
+    # candidate is a few list lookups per GPU pair.
+    def __init__(
+        self,
+        scenario: dict[str, Any],
+        workloads: Sequence[Workload],
+        background_weight: float = BACKGROUND_UTIL_WEIGHT,
+        graph: TopologyGraph | None = None,
+    ) -> None:
+        gpus = scenario.get("gpus", [])
+        self.gpu_ids = [int(g["id"]) for g in gpus]
+        self.index = {g: i for i, g in enumerate(self.gpu_ids)}
+        self.workloads = {w.name: w for w in workloads}
+        self.total_vram = float(scenario.get("total_vram_gb", 80)) or 80.0
+        self.background = [min(MAX_LOAD, background_weight * float(g.get("gpu_util", 0.0)) / 100.0) for g in gpus]
+        self.mismatch = [int(g.get("numa_node", 0)) != int(g.get("cpu_socket", g.get("numa_node", 0))) for g in gpus]
+        if graph is None and gpus:
+            graph = TopologyGraph.for_scenario(scenario)
+        self.bandwidth: list[list[float]] = []
+        if graph is not None:
+            raw = graph.bandwidth.tolist()
+            order = [graph.index_of(g) for g in self.gpu_ids]
+            self.bandwidth = [[raw[a][b] for b in order] for a in order]
+
+    def _sm_demand(self, job: Workload) -> float:
+        # Bigger models keep more of the GPU busy per request.
+        return min(1.0, max(0.05, float(job.vram_gb) / self.total_vram))
+
+    def mig_slices_needed(self, job: Workload) -> int:
+        # Smallest compute-slice count at which a MIG instance stops slowing the
+        # job down; more slices only shave queueing off an already-full model.
+        return max(1, math.ceil(self._sm_demand(job) * MIG_COMPUTE_SLICES - 1e-9))
+
+    def evaluate(self, candidate: Mapping[str, Placement]) -> SimulationResult:
+        n = len(self.gpu_ids)
+        index = self.index
+        shared_load = [0.0] * n
+        busy = [0.0] * n
+        placed: list[tuple[Workload, Placement, list[int]]] = []
+        unplaced: list[str] = []
+        for name, job in self.workloads.items():
+            placement = candidate.get(name)
+            idx = [index[g] for g in placement.gpu_ids if g in index] if placement else []
+            if not idx:
+                unplaced.append(name)
+                continue
+            placed.append((job, placement, idx))
+            if job.kind != "training" and not placement.mig_slices:
+                for i in idx:
+                    shared_load[i] += INFERENCE_DUTY * self._sm_demand(job) / len(idx)
+
+        projections: dict[str, WorkloadProjection] = {}
+        for job, placement, idx in placed:
+            numa_hit = 1.0 + (NUMA_MISMATCH_PENALTY if not placement.pinned and any(self.mismatch[i] for i in idx) else 0.0)
+            if job.kind == "training":
+                k = len(idx)
+                slowdown = max(1.0 / (1.0 - min(MAX_LOAD, self.background[i] + shared_load[i])) for i in idx)
+                compute = numa_hit * slowdown
+                comm = 0.0
+                if k > 1:
+                    weakest = min(self.bandwidth[a][b] for p, a in enumerate(idx) for b in idx[p + 1 :]) if self.bandwidth else 0.0
+                    ratio = REFERENCE_LINK_GBPS / max(weakest, 1e-3)
+                    comm = COMM_FRACTION * 2.0 * (k - 1) / k * ratio
+                step = compute + max(0.0, comm - COMM_OVERLAP * compute)
+                fraction = compute / step
+                for i in idx:
+                    busy[i] += fraction
+                projections[job.name] = WorkloadProjection(job.name, job.kind, k / step, 0.0, fraction)
+                continue
+            demand = self._sm_demand(job)
+            if placement.mig_slices:
+                # Isolated slice: slower per request if the model wants more SMs
+                # than the slice has, but no interference from neighbours.
+                share = placement.mig_slices / MIG_COMPUTE_SLICES
+                service = max(1.0, demand / share)
+                load = min(MAX_LOAD, INFERENCE_DUTY * demand / share + self.background[idx[0]])
+                busy[idx[0]] += INFERENCE_DUTY * demand
+            else:
+                service = 1.0
+                load = min(MAX_LOAD, max(shared_load[i] + self.background[i] for i in idx))
+                for i in idx:
+                    busy[i] += INFERENCE_DUTY * demand / len(idx)
+            latency = numa_hit * service / (1.0 - load)
+            projections[job.name] = WorkloadProjection(job.name, job.kind, 1.0 / latency, latency, 1.0 - load)
+
+        latencies = [p.latency for p in projections.values() if p.kind != "training"]
+        return SimulationResult(
+            projections=projections,
+            unplaced=unplaced,
+            training_throughput=sum(p.throughput for p in projections.values() if p.kind == "training"),
+            mean_latency=sum(latencies) / len(latencies) if latencies else 0.0,
+            effective_util=sum(min(1.0, b) for b in busy) / n if n else 0.0,
+        )
+
+    def rank(self, candidates: Sequence[Mapping[str, Placement]]) -> list[tuple[int, SimulationResult]]:
+        # Best first: most work placed, then the highest projected throughput.
+        results = [(pos, self.evaluate(c)) for pos, c in enumerate(candidates)]
+        results.sort(key=lambda r: (len(r[1].unplaced), -r[1].objective, r[0]))
+        return results
+
+
+def naive_placement(scenario: dict[str, Any], workloads: Sequence[Workload]) -> dict[str, Placement]:
+    # What a topology-unaware scheduler does: training on the lowest free GPU
+    # ids, inference time-sliced on the first GPU with VRAM left, no pinning.
+    ids = sorted(int(g["id"]) for g in scenario.get("gpus", []))
+    capacity = float(scenario.get("total_vram_gb", 80))
+    taken: set[int] = set()
+    vram = {g: 0.0 for g in ids}
+    out: dict[str, Placement] = {}
+    for job in workloads:
+        if job.kind == "training" or job.gpu_demand > 1:
+            free = [g for g in ids if g not in taken and vram[g] == 0.0]
+            k = max(1, int(job.gpu_demand))
+            if len(free) < k:
+                continue
+            chosen = tuple(free[:k])
+            taken.update(chosen)
+            out[job.name] = Placement(chosen, pinned=False)
+            continue
+        for g in ids:
+            if g not in taken and vram[g] + float(job.vram_gb) <= capacity:
+                vram[g] += float(job.vram_gb)
+                out[job.name] = Placement((g,), pinned=False)
+                break
+    return out
+
+
+def projected_change_pct(before: float, after: float) -> int:
+    if before <= 0:
+        return 0
+    return int(round((after - before) / before * 100.0))
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from typing import Any
+
+from infralens.data import Workload
+
+
+@dataclass(frozen=True)
+class NodeShape:
+    model: str
+    gpus: int
+    vram_gb: int
+    nvlink_group_size: int  # GPUs per NVLink domain (gpus = one NVSwitch domain)
+    numa_nodes: int = 2
+
+
+# Common server shapes: NVSwitch baseboards are one NVLink domain, PCIe cards
+# are bridged in pairs (or not at all for L4).
+NODE_SHAPES: dict[str, NodeShape] = {
+    "H200-SXM": NodeShape("H200-SXM", gpus=8, vram_gb=141, nvlink_group_size=8),
+    "H100-SXM": NodeShape("H100-SXM", gpus=8, vram_gb=80, nvlink_group_size=8),
+    "A100-SXM": NodeShape("A100-SXM", gpus=8, vram_gb=80, nvlink_group_size=4),
+    "A100-PCIe": NodeShape("A100-PCIe", gpus=4, vram_gb=80, nvlink_group_size=2),
+    "L40S": NodeShape("L40S", gpus=4, vram_gb=48, nvlink_group_size=2),
+    "L4": NodeShape("L4", gpus=2, vram_gb=24, nvlink_group_size=1, numa_nodes=1),
+}
+
+DEFAULT_SHAPE_MIX = {"H100-SXM": 0.35, "H200-SXM": 0.15, "A100-SXM": 0.2, "L40S": 0.2, "L4": 0.1}
+
+
+def _group_label(index: int) -> str:
+    letters = ""
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(ord("A") + rem) + letters
+    return letters
+
+
+def synthetic_host(
+    rng: random.Random,
+    shape: NodeShape,
+    name: str,
+    mismatch_rate: float = 0.05,
+    idle_rate: float = 0.2,
+) -> dict[str, Any]:
+    gpus: list[dict[str, Any]] = []
+    per_numa = max(1, shape.gpus // shape.numa_nodes)
+    for gpu_id in range(shape.gpus):
+        numa_node = min(shape.numa_nodes - 1, gpu_id // per_numa)
+        cpu_socket = numa_node
+        if shape.numa_nodes > 1 and rng.random() < mismatch_rate:
+            cpu_socket = (numa_node + 1) % shape.numa_nodes
+        if rng.random() < idle_rate:
+            util = rng.uniform(0.0, 35.0)
+        else:
+            util = min(100.0, max(0.0, rng.gauss(72.0, 15.0)))
+        vram = shape.vram_gb * min(0.98, max(0.02, util / 100.0 * rng.uniform(0.6, 1.1)))
+        network = min(1.0, max(0.2, util / 100.0 * 0.8 + 0.2 + rng.uniform(-0.1, 0.1)))
+        gpus.append(
+            {
+                "id": gpu_id,
+                "gpu_util": round(util, 1),
+                "vram_used_gb": round(vram, 1),
+                "network_io_score": round(network, 2),
+                "numa_node": numa_node,
+                "cpu_socket": cpu_socket,
+                "nvlink_group": _group_label(gpu_id // max(1, shape.nvlink_group_size)),
+            }
+        )
+    return {"name": name, "model": shape.model, "total_vram_gb": shape.vram_gb, "gpus": gpus}
+
+
+def synthetic_fleet(
+    gpu_count: int,
+    seed: int = 0,
+    shape_mix: dict[str, float] | None = None,
+    mismatch_rate: float = 0.05,
+    idle_rate: float = 0.2,
+) -> dict[str, dict[str, Any]]:
+    rng = random.Random(seed)
+    mix = shape_mix or DEFAULT_SHAPE_MIX
+    names = sorted(mix)
+    weights = [mix[n] for n in names]
+
+    fleet: dict[str, dict[str, Any]] = {}
+    remaining = max(1, int(gpu_count))
+    while remaining > 0:
+        shape = NODE_SHAPES[rng.choices(names, weights=weights)[0]]
+        if shape.gpus > remaining:
+            # Top up with the smallest shape that still fits, so the total matches.
+            fitting = [NODE_SHAPES[n] for n in names if NODE_SHAPES[n].gpus <= remaining]
+            shape = min(fitting, key=lambda s: s.gpus) if fitting else NodeShape("tail", remaining, 24, 1, 1)
+        host = f"node-{len(fleet):05d}"
+        fleet[host] = synthetic_host(rng, shape, host, mismatch_rate=mismatch_rate, idle_rate=idle_rate)
+        remaining -= shape.gpus
+    return fleet
+
+
+def synthetic_workloads(
+    fleet: dict[str, dict[str, Any]],
+    seed: int = 0,
+    fill_ratio: float = 0.8,
+    training_share: float = 0.6,
+) -> list[Workload]:
+    # Draws jobs until roughly fill_ratio of the fleet's GPUs are requested.
+    rng = random.Random(seed)
+    total_gpus = sum(len(s["gpus"]) for s in fleet.values())
+    max_node = max((len(s["gpus"]) for s in fleet.values()), default=1)
+    budget = max(1, int(total_gpus * fill_ratio))
+
+    workloads: list[Workload] = []
+    requested = 0
+    while requested < budget:
+        idx = len(workloads)
+        if rng.random() < training_share:
+            demand = min(max_node, rng.choice([1, 2, 2, 4, 4, 8]))
+            workloads.append(
+                Workload(
+                    name=f"training-{idx:05d}",
+                    kind="training",
+                    gpu_demand=demand,
+                    vram_gb=demand * rng.choice([16, 24, 40, 60]),
+                )
+            )
+        else:
+            demand = 1
+            workloads.append(
+                Workload(
+                    name=f"inference-{idx:05d}",
+                    kind="inference",
+                    gpu_demand=1,
+                    vram_gb=rng.choice([6, 8, 12, 20]),
+                )
+            )
+        requested += demand
+    return workloads
+
+
+def host_workloads(workloads: list[Workload], fleet: dict[str, dict[str, Any]]) -> dict[str, list[Workload]]:
+    # Deals jobs to hosts round-robin, biggest first, within each host's GPU count.
+    hosts = list(fleet)
+    out: dict[str, list[Workload]] = {h: [] for h in hosts}
+    used = {h: 0 for h in hosts}
+    if not hosts:
+        return out
+    cursor = 0
+    for w in sorted(workloads, key=lambda x: -x.gpu_demand):
+        for step in range(len(hosts)):
+            host = hosts[(cursor + step) % len(hosts)]
+            if used[host] + w.gpu_demand <= len(fleet[host]["gpus"]):
+                out[host].append(w)
+                used[host] += w.gpu_demand
+                cursor = (cursor + step + 1) % len(hosts)
+                break
+    return out
+
+
+def scenario_to_nvidia_smi_csv(scenario: dict[str, Any]) -> str:
+    lines = ["index,utilization.gpu,memory.used,memory.total,numa_node,cpu_socket,nvlink_group"]
+    total_mib = int(scenario["total_vram_gb"]) * 1024
+    for g in scenario["gpus"]:
+        lines.append(
+            f"{g['id']},{g['gpu_util']} %,{int(g['vram_used_gb'] * 1024)} MiB,{total_mib} MiB,"
+            f"{g['numa_node']},{g['cpu_socket']},{g['nvlink_group']}"
+        )
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,361 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any, Iterable
+
+import numpy as np
+
+from infralens.parsers import _default_nvlink_group, _gpu_fields_from_row, _rows_field_mapping, _total_vram_gb
+
+WINDOWS: dict[str, float] = {"1m": 60.0, "5m": 300.0, "1h": 3600.0}
+
+_TIMESTAMP_FORMATS = (
+    "%Y/%m/%d %H:%M:%S.%f",
+    "%Y/%m/%d %H:%M:%S",
+    "%Y-%m-%d %H:%M:%S.%f",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S.%f",
+    "%Y-%m-%dT%H:%M:%S",
+)
+
+
+def window_seconds(window: str | float | int) -> float:
+    if isinstance(window, (int, float)):
+        return float(window)
+    if window in WINDOWS:
+        return WINDOWS[window]
+    units = {"s": 1.0, "m": 60.0, "h": 3600.0, "d": 86400.0}
+    try:
+        return float(window[:-1]) * units[window[-1]]
+    except (KeyError, ValueError, IndexError):
+        raise ValueError(f"Unsupported window: {window!r}") from None
+
+
+def parse_timestamp(value: Any) -> float | None:
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).strip()
+    if not text:
+        return None
+    try:
+        return float(text)
+    except ValueError:
+        pass
+    for fmt in _TIMESTAMP_FORMATS:
+        try:
+            parsed = datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+        return parsed.replace(tzinfo=timezone.utc).timestamp()
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+class TelemetryStore:
+    def __init__(self, capacity: int = 4096, sample_interval_sec: float = 1.0) -> None:
+        capacity = max(16, int(capacity))
+        self.sample_interval_sec = float(sample_interval_sec)
+        self._hosts: list[str] = []
+        self._host_index: dict[str, int] = {}
+        self._host = np.empty(capacity, dtype=np.uint16)
+        self._gpu = np.empty(capacity, dtype=np.uint16)
+        self._ts = np.empty(capacity, dtype=np.float64)
+        self._util = np.empty(capacity, dtype=np.float32)
+        self._vram = np.empty(capacity, dtype=np.float32)
+        self._network = np.empty(capacity, dtype=np.float32)
+        self._size = 0
+        self._sorted = True
+        # Per-series static attributes: (host_idx, gpu_id) -> info.
+        self._series: dict[tuple[int, int], dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def nbytes(self) -> int:
+        arrays = (self._host, self._gpu, self._ts, self._util, self._vram, self._network)
+        return sum(a[: self._size].nbytes for a in arrays)
+
+    def hosts(self) -> list[str]:
+        return list(self._hosts)
+
+    def gpu_ids(self, host: str) -> list[int]:
+        host_idx = self._host_index.get(host)
+        return sorted(gpu for h, gpu in self._series if h == host_idx)
+
+    def _intern_host(self, host: str) -> int:
+        idx = self._host_index.get(host)
+        if idx is None:
+            idx = len(self._hosts)
+            if idx > np.iinfo(np.uint16).max:
+                raise ValueError("TelemetryStore supports at most 65536 hosts.")
+            self._hosts.append(host)
+            self._host_index[host] = idx
+        return idx
+
+    def _grow(self, needed: int) -> None:
+        capacity = len(self._ts)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for attr in ("_host", "_gpu", "_ts", "_util", "_vram", "_network"):
+            old = getattr(self, attr)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[: self._size] = old[: self._size]
+            setattr(self, attr, new)
+
+    def append(
+        self,
+        host: str,
+        gpu_id: int,
+        timestamp: float | None,
+        gpu_util: float,
+        vram_used_gb: float,
+        vram_total_gb: float | None = None,
+        network_io_score: float | None = None,
+        numa_node: int | None = None,
+        cpu_socket: int | None = None,
+        nvlink_group: str | None = None,
+    ) -> None:
+        host_idx = self._intern_host(str(host))
+        key = (host_idx, int(gpu_id))
+        info = self._series.get(key)
+        if info is None:
+            info = {
+                "numa_node": int(gpu_id) % 2 if numa_node is None else int(numa_node),
+                "cpu_socket": None if cpu_socket is None else int(cpu_socket),
+                "nvlink_group": nvlink_group,
+                "vram_total_gb": 0.0,
+                "samples": 0,
+                "last_ts": None,
+            }
+            if info["cpu_socket"] is None:
+                info["cpu_socket"] = info["numa_node"]
+            self._series[key] = info
+
+        if timestamp is None:
+            last = info["last_ts"]
+            timestamp = 0.0 if last is None else last + self.sample_interval_sec
+        if vram_total_gb is not None:
+            info["vram_total_gb"] = max(info["vram_total_gb"], float(vram_total_gb))
+        if network_io_score is None:
+            network_io_score = min(1.0, max(0.2, (gpu_util / 100.0) * 0.8 + 0.2))
+
+        self._grow(self._size + 1)
+        i = self._size
+        if i and timestamp < self._ts[i - 1]:
+            self._sorted = False
+        self._host[i] = host_idx
+        self._gpu[i] = int(gpu_id)
+        self._ts[i] = float(timestamp)
+        self._util[i] = float(gpu_util)
+        self._vram[i] = float(vram_used_gb)
+        self._network[i] = float(network_io_score)
+        self._size += 1
+        info["samples"] += 1
+        last = info["last_ts"]
+        info["last_ts"] = float(timestamp) if last is None else max(last, float(timestamp))
+
+    def extend_rows(self, rows: Iterable[dict[str, Any]], host: str = "local") -> int:
+        batch = rows if isinstance(rows, list) else list(rows)
+        mapping = _rows_field_mapping(batch)
+        added = 0
+        for idx, row in enumerate(batch):
+            fields = _gpu_fields_from_row(row, idx, mapping)
+            self.append(
+                host,
+                fields["id"],
+                parse_timestamp(row.get("timestamp")),
+                fields["gpu_util"],
+                fields["vram_used_gb"],
+                vram_total_gb=fields["vram_total_gb"],
+                network_io_score=fields["network_io_score"],
+                numa_node=fields["numa_node"],
+                cpu_socket=fields["cpu_socket"],
+                nvlink_group=None if fields["nvlink_defaulted"] else fields["nvlink_group"],
+            )
+            added += 1
+        return added
+
+    def _ensure_sorted(self) -> None:
+        if self._sorted:
+            return
+        n = self._size
+        order = np.argsort(self._ts[:n], kind="stable")
+        for attr in ("_host", "_gpu", "_ts", "_util", "_vram", "_network"):
+            arr = getattr(self, attr)
+            arr[:n] = arr[:n][order]
+        self._sorted = True
+
+    def latest_timestamp(self, host: str | None = None) -> float | None:
+        if not self._size:
+            return None
+        if host is None:
+            self._ensure_sorted()
+            return float(self._ts[self._size - 1])
+        host_idx = self._host_index.get(host)
+        stamps = [info["last_ts"] for (h, _), info in self._series.items() if h == host_idx]
+        return max(stamps) if stamps else None
+
+    def _slice(self, host: str, start: float, end: float) -> tuple[np.ndarray, ...]:
+        host_idx = self._host_index.get(host)
+        if host_idx is None:
+            raise KeyError(f"Unknown host: {host}")
+        self._ensure_sorted()
+        n = self._size
+        lo = int(np.searchsorted(self._ts[:n], start, side="right"))
+        hi = int(np.searchsorted(self._ts[:n], end, side="right"))
+        mask = self._host[lo:hi] == host_idx
+        return (
+            self._gpu[lo:hi][mask],
+            self._ts[lo:hi][mask],
+            self._util[lo:hi][mask],
+            self._vram[lo:hi][mask],
+            self._network[lo:hi][mask],
+        )
+
+    def window(
+        self, host: str, window: str | float = "5m", end: float | None = None
+    ) -> dict[int, dict[str, float]]:
+        if end is None:
+            end = self.latest_timestamp(host)
+        if end is None:
+            return {}
+        gpu, _, util, vram, network = self._slice(host, end - window_seconds(window), end)
+        if not gpu.size:
+            return {}
+
+        ids, inverse = np.unique(gpu, return_inverse=True)
+        counts = np.bincount(inverse).astype(np.float64)
+        util_mean = np.bincount(inverse, weights=util) / counts
+        vram_mean = np.bincount(inverse, weights=vram) / counts
+        network_mean = np.bincount(inverse, weights=network) / counts
+        vram_peak = np.full(len(ids), -np.inf)
+        np.maximum.at(vram_peak, inverse, vram)
+
+        # Sort once by (gpu, util) to read per-GPU percentiles from contiguous runs.
+        order = np.lexsort((util, inverse))
+        sorted_util = util[order]
+        starts = np.concatenate(([0], np.cumsum(counts[:-1]).astype(np.int64)))
+
+        out: dict[int, dict[str, float]] = {}
+        for pos, gpu_id in enumerate(ids):
+            run = sorted_util[starts[pos] : starts[pos] + int(counts[pos])]
+            out[int(gpu_id)] = {
+                "samples": int(counts[pos]),
+                "gpu_util": float(util_mean[pos]),
+                "gpu_util_p50": float(np.percentile(run, 50)),
+                "gpu_util_p95": float(np.percentile(run, 95)),
+                "vram_used_gb": float(vram_mean[pos]),
+                "vram_peak_gb": float(vram_peak[pos]),
+                "network_io_score": float(network_mean[pos]),
+            }
+        return out
+
+    def rolling(
+        self, host: str, gpu_id: int, window: str | float = "1m"
+    ) -> dict[str, np.ndarray]:
+        host_idx = self._host_index.get(host)
+        if host_idx is None:
+            raise KeyError(f"Unknown host: {host}")
+        self._ensure_sorted()
+        n = self._size
+        mask = (self._host[:n] == host_idx) & (self._gpu[:n] == gpu_id)
+        ts = self._ts[:n][mask]
+        util = self._util[:n][mask].astype(np.float64)
+        vram = self._vram[:n][mask].astype(np.float64)
+        starts = np.searchsorted(ts, ts - window_seconds(window), side="right")
+        idx = np.arange(1, ts.size + 1)
+        counts = idx - starts
+        util_cs = np.concatenate(([0.0], np.cumsum(util)))
+        vram_cs = np.concatenate(([0.0], np.cumsum(vram)))
+        return {
+            "timestamp": ts,
+            "gpu_util": (util_cs[idx] - util_cs[starts]) / counts,
+            "vram_used_gb": (vram_cs[idx] - vram_cs[starts]) / counts,
+            "samples": counts,
+        }
+
+    def downsample(self, bucket: str | float = "1m") -> TelemetryStore:
+        bucket_sec = window_seconds(bucket)
+        n = self._size
+        out = TelemetryStore(capacity=max(16, n // 8), sample_interval_sec=bucket_sec)
+        if not n:
+            return out
+        self._ensure_sorted()
+        buckets = np.floor(self._ts[:n] / bucket_sec).astype(np.int64)
+        keys = np.stack(
+            [buckets, self._host[:n].astype(np.int64), self._gpu[:n].astype(np.int64)], axis=1
+        )
+        uniq, inverse = np.unique(keys, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        counts = np.bincount(inverse).astype(np.float64)
+        util = np.bincount(inverse, weights=self._util[:n]) / counts
+        vram = np.bincount(inverse, weights=self._vram[:n]) / counts
+        network = np.bincount(inverse, weights=self._network[:n]) / counts
+
+        for pos, (bucket_idx, host_idx, gpu_id) in enumerate(uniq):
+            info = self._series[(int(host_idx), int(gpu_id))]
+            out.append(
+                self._hosts[int(host_idx)],
+                int(gpu_id),
+                float(bucket_idx) * bucket_sec,
+                float(util[pos]),
+                float(vram[pos]),
+                vram_total_gb=info["vram_total_gb"] or None,
+                network_io_score=float(network[pos]),
+                numa_node=info["numa_node"],
+                cpu_socket=info["cpu_socket"],
+                nvlink_group=info["nvlink_group"],
+            )
+        return out
+
+    def to_scenario(
+        self,
+        host: str,
+        window: str | float = "5m",
+        end: float | None = None,
+        name: str | None = None,
+    ) -> dict[str, Any]:
+        stats = self.window(host, window=window, end=end)
+        if not stats:
+            raise ValueError(f"No samples for host '{host}' in the requested window.")
+
+        host_idx = self._host_index[host]
+        gpu_count = len(stats)
+        gpus: list[dict[str, Any]] = []
+        memory_totals: list[float] = []
+        for gpu_id, agg in stats.items():
+            info = self._series[(host_idx, gpu_id)]
+            gpus.append(
+                {
+                    "id": gpu_id,
+                    "gpu_util": round(agg["gpu_util"], 2),
+                    "vram_used_gb": round(agg["vram_used_gb"], 2),
+                    "network_io_score": round(agg["network_io_score"], 2),
+                    "numa_node": info["numa_node"],
+                    "cpu_socket": info["cpu_socket"],
+                    "nvlink_group": info["nvlink_group"] or _default_nvlink_group(gpu_id, gpu_count),
+                    "gpu_util_p50": round(agg["gpu_util_p50"], 2),
+                    "gpu_util_p95": round(agg["gpu_util_p95"], 2),
+                    "vram_peak_gb": round(agg["vram_peak_gb"], 2),
+                    "samples": agg["samples"],
+                }
+            )
+            if info["vram_total_gb"]:
+                memory_totals.append(info["vram_total_gb"])
+
+        label = window if isinstance(window, str) else f"{window_seconds(window):g}s"
+        return {
+            "name": name or f"{host} ({label} window)",
+            "total_vram_gb": _total_vram_gb(memory_totals),
+            "gpus": gpus,
+        }
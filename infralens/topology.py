@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from itertools import combinations
+from math import comb
+from typing import TYPE_CHECKING, Any, Iterable
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Link codes as stored in the matrix, best to worst. `topo -m` legend:
+#   NV#  NVLink with # bonded links
+#   PIX  at most one PCIe bridge
+#   PXB  multiple PCIe bridges, no host bridge
+#   PHB  through a PCIe host bridge (CPU)
+#   NODE across host bridges within one NUMA node
+#   SYS  across NUMA nodes (SMP interconnect)
+LINK_SELF, LINK_NV, LINK_PIX, LINK_PXB, LINK_PHB, LINK_NODE, LINK_SYS = range(7)
+LINK_NAMES = ("X", "NV", "PIX", "PXB", "PHB", "NODE", "SYS")
+_LINK_CODES = {name: code for code, name in enumerate(LINK_NAMES)}
+_LINK_CODES["SOC"] = LINK_SYS  # pre-2019 drivers
+
+# Rough effective peer-to-peer bandwidth per direction; only the ordering and
+# ratios matter for ranking GPU sets.
+NVLINK_GBPS_PER_LINK = 25.0
+LINK_BANDWIDTH_GBPS = {LINK_PIX: 24.0, LINK_PXB: 20.0, LINK_PHB: 16.0, LINK_NODE: 12.0, LINK_SYS: 8.0}
+
+EXACT_CLIQUE_LIMIT = 20000
+
+_SPLIT = re.compile(r"\s*\t\s*|\s{2,}")
+
+
+@dataclass(frozen=True)
+class TopologyGraph:
+    gpu_ids: tuple[int, ...]
+    links: np.ndarray  # uint8 link code per GPU pair
+    nvlinks: np.ndarray  # uint8 bonded NVLink count per GPU pair
+    numa: np.ndarray  # int16 NUMA node per GPU, -1 when unknown
+    bandwidth: np.ndarray  # float32 GB/s per GPU pair
+    hops: np.ndarray  # uint8 link rank per GPU pair (0 = self, 1 = NVLink .. 6 = SYS)
+    penalty: np.ndarray  # float32 1 - bandwidth / best bandwidth, 0 on the diagonal
+
+    @classmethod
+    def build(cls, gpu_ids: Iterable[int], links: Any, nvlinks: Any, numa: Any) -> TopologyGraph:
+        import numpy as np
+
+        ids = tuple(int(g) for g in gpu_ids)
+        links = np.asarray(links, dtype=np.uint8)
+        nvlinks = np.asarray(nvlinks, dtype=np.uint8)
+        n = len(ids)
+        if links.shape != (n, n) or nvlinks.shape != (n, n):
+            raise ValueError(f"Link matrix must be {n}x{n}.")
+        numa = np.asarray(list(numa), dtype=np.int16)
+
+        bandwidth = np.zeros((n, n), dtype=np.float32)
+        for code, gbps in LINK_BANDWIDTH_GBPS.items():
+            bandwidth[links == code] = gbps
+        nv = links == LINK_NV
+        bandwidth[nv] = nvlinks[nv].astype(np.float32) * NVLINK_GBPS_PER_LINK
+        np.fill_diagonal(bandwidth, 0.0)
+
+        best = float(bandwidth.max()) if n > 1 else 0.0
+        penalty = (1.0 - bandwidth / best).astype(np.float32) if best > 0 else np.ones((n, n), dtype=np.float32)
+        np.fill_diagonal(penalty, 0.0)
+        # Link codes are already ordered by distance, so they double as hop ranks.
+        hops = links.copy()
+        for arr in (links, nvlinks, numa, bandwidth, hops, penalty):
+            arr.setflags(write=False)
+        return cls(ids, links, nvlinks, numa, bandwidth, hops, penalty)
+
+    @classmethod
+    def from_labels(cls, gpus: list[dict[str, Any]]) -> TopologyGraph:
+        # No matrix uploaded: same NVLink group -> NV1, same NUMA node -> NODE,
+        # otherwise SYS. Equivalent to the label model the rules already use.
+        n = len(gpus)
+        links = [[LINK_SELF] * n for _ in range(n)]
+        nvlinks = [[0] * n for _ in range(n)]
+        for i, a in enumerate(gpus):
+            for j, b in enumerate(gpus):
+                if i == j:
+                    continue
+                if str(a.get("nvlink_group", "A")) == str(b.get("nvlink_group", "A")):
+                    links[i][j], nvlinks[i][j] = LINK_NV, 1
+                elif int(a.get("numa_node", 0)) == int(b.get("numa_node", 0)):
+                    links[i][j] = LINK_NODE
+                else:
+                    links[i][j] = LINK_SYS
+        return cls.build([g["id"] for g in gpus], links, nvlinks, [int(g.get("numa_node", -1)) for g in gpus])
+
+    @classmethod
+    def from_dict(cls, payload: dict[str, Any]) -> TopologyGraph:
+        ids = [int(g) for g in payload["gpu_ids"]]
+        codes, counts = [], []
+        for row in payload["links"]:
+            parsed = [_parse_link(cell) for cell in row]
+            codes.append([c for c, _ in parsed])
+            counts.append([k for _, k in parsed])
+        return cls.build(ids, codes, counts, payload.get("numa") or [-1] * len(ids))
+
+    @classmethod
+    def for_scenario(cls, scenario: dict[str, Any]) -> TopologyGraph:
+        payload = scenario.get("topology")
+        if payload:
+            graph = cls.from_dict(payload)
+            if set(graph.gpu_ids) >= {int(g["id"]) for g in scenario["gpus"]}:
+                return graph
+        return cls.from_labels(scenario["gpus"])
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "gpu_ids": list(self.gpu_ids),
+            "links": [[self.link(a, b) for b in self.gpu_ids] for a in self.gpu_ids],
+            "numa": self.numa.tolist(),
+        }
+
+    def index_of(self, gpu_id: int) -> int:
+        return self.gpu_ids.index(int(gpu_id))
+
+    def link(self, a: int, b: int) -> str:
+        i, j = self.index_of(a), self.index_of(b)
+        code = int(self.links[i, j])
+        if code == LINK_NV:
+            return f"NV{int(self.nvlinks[i, j])}"
+        return LINK_NAMES[code]
+
+    def bandwidth_gbps(self, a: int, b: int) -> float:
+        return float(self.bandwidth[self.index_of(a), self.index_of(b)])
+
+    def gpus_on_numa(self, node: int) -> list[int]:
+        return [g for g, n in zip(self.gpu_ids, self.numa.tolist()) if n == node]
+
+    def nvlink_components(self) -> list[list[int]]:
+        n = len(self.gpu_ids)
+        nv = (self.links == LINK_NV).tolist()
+        seen = [False] * n
+        components: list[list[int]] = []
+        for start in range(n):
+            if seen[start]:
+                continue
+            stack, members = [start], []
+            seen[start] = True
+            while stack:
+                i = stack.pop()
+                members.append(self.gpu_ids[i])
+                for j in range(n):
+                    if nv[i][j] and not seen[j]:
+                        seen[j] = True
+                        stack.append(j)
+            components.append(sorted(members))
+        return sorted(components, key=lambda c: c[0])
+
+    def span_cost(self, gpu_ids: Iterable[int]) -> float:
+        # Mean pairwise link penalty times (k - 1): 0 for an all-best-link set,
+        # about 1 per GPU that can only reach the rest over the slowest path.
+        idx = [self.index_of(g) for g in gpu_ids]
+        if len(idx) < 2:
+            return 0.0
+        total = sum(float(self.penalty[i, j]) for i, j in combinations(idx, 2))
+        return 2.0 * total / len(idx)
+
+    def aggregate_bandwidth(self, gpu_ids: Iterable[int]) -> float:
+        idx = [self.index_of(g) for g in gpu_ids]
+        return sum(float(self.bandwidth[i, j]) for i, j in combinations(idx, 2))
+
+    def best_clique(self, k: int, candidates: Iterable[int] | None = None) -> tuple[int, ...]:
+        pool = sorted(self.gpu_ids if candidates is None else {int(g) for g in candidates})
+        if k <= 0 or k > len(pool):
+            return ()
+        if k == 1:
+            return (pool[0],)
+        idx = [self.index_of(g) for g in pool]
+        bw = self.bandwidth.tolist()
+
+        def score(members: tuple[int, ...]) -> tuple[float, float]:
+            # Highest aggregate bandwidth, then the best weakest link.
+            pairs = [bw[i][j] for i, j in combinations(members, 2)]
+            return (sum(pairs), min(pairs))
+
+        if comb(len(idx), k) <= EXACT_CLIQUE_LIMIT:
+            best = max(combinations(idx, k), key=score)
+        else:
+            # Seed with the best-connected pair, then add the GPU that brings the
+            # most bandwidth to the set so far.
+            seed = max(combinations(idx, 2), key=lambda p: bw[p[0]][p[1]])
+            members = list(seed)
+            rest = [i for i in idx if i not in seed]
+            while len(members) < k:
+                nxt = max(rest, key=lambda c: (sum(bw[c][m] for m in members), -c))
+                members.append(nxt)
+                rest.remove(nxt)
+            best = tuple(members)
+        return tuple(sorted(self.gpu_ids[i] for i in best))
+
+
+def _parse_link(cell: Any) -> tuple[int, int]:
+    token = str(cell).strip().upper()
+    if token.startswith("NV"):
+        digits = token[2:]
+        return LINK_NV, int(digits) if digits.isdigit() else 1
+    return _LINK_CODES.get(token, LINK_SYS), 0
+
+
+def parse_topology_matrix(text: str) -> TopologyGraph | None:
+    lines = [ln.rstrip() for ln in text.splitlines() if ln.strip()]
+    header: list[str] = []
+    start = -1
+    for i, line in enumerate(lines):
+        if "CPU Affinity" in line and "GPU" in line:
+            header = [p for p in _SPLIT.split(line.strip()) if p]
+            start = i
+            break
+    if start < 0:
+        return None
+    gpu_cols = [i for i, name in enumerate(header) if re.fullmatch(r"GPU\d+", name)]
+    numa_col = next((i for i, name in enumerate(header) if name == "NUMA Affinity"), None)
+    if not gpu_cols:
+        return None
+
+    rows: dict[int, tuple[list[str], int]] = {}
+    for line in lines[start + 1 :]:
+        match = re.match(r"\s*GPU(\d+)\b", line)
+        if not match:
+            continue
+        cells = [p for p in _SPLIT.split(line.strip()) if p][1:]
+        if len(cells) < len(gpu_cols):
+            continue
+        numa_cell = cells[numa_col] if numa_col is not None and numa_col < len(cells) else ""
+        rows[int(match.group(1))] = (
+            [cells[i] for i in gpu_cols],
+            int(numa_cell) if numa_cell.isdigit() else -1,
+        )
+    col_ids = [int(header[i][3:]) for i in gpu_cols]
+    if not rows or set(rows) != set(col_ids):
+        return None
+
+    codes, counts, numa = [], [], []
+    for gpu_id in col_ids:
+        cells, node = rows[gpu_id]
+        parsed = [_parse_link(cell) for cell in cells]
+        codes.append([c for c, _ in parsed])
+        counts.append([k for _, k in parsed])
+        numa.append(node)
+    return TopologyGraph.build(col_ids, codes, counts, numa)
@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+import contextvars
+import itertools
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, TypeVar
+
+from infralens.quantiles import LatencyHistogram
+
+TRACE_ENV = "INFRALENS_TRACE"
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+@dataclass
+class SpanRecord:
+    name: str
+    span_id: int
+    parent_id: int | None
+    start_unix: float
+    duration_sec: float
+    self_sec: float
+    thread: str
+    error: str = ""
+    attrs: dict[str, Any] = field(default_factory=dict)
+
+
+class TraceAggregator:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._histograms: dict[str, LatencyHistogram] = {}
+        self._self_sec: dict[str, float] = {}
+        self._errors: dict[str, int] = {}
+
+    def record(self, span: SpanRecord) -> None:
+        with self._lock:
+            hist = self._histograms.get(span.name)
+            if hist is None:
+                hist = self._histograms[span.name] = LatencyHistogram()
+            hist.record(span.duration_sec)
+            self._self_sec[span.name] = self._self_sec.get(span.name, 0.0) + span.self_sec
+            if span.error:
+                self._errors[span.name] = self._errors.get(span.name, 0) + 1
+
+    def histogram(self, name: str) -> LatencyHistogram:
+        with self._lock:
+            return LatencyHistogram.merged([self._histograms[name]]) if name in self._histograms else LatencyHistogram()
+
+    def breakdown(self) -> list[dict[str, Any]]:
+        with self._lock:
+            rows = []
+            for name, hist in self._histograms.items():
+                summary = hist.summary()
+                rows.append(
+                    {
+                        "stage": name,
+                        "calls": hist.count,
+                        "errors": self._errors.get(name, 0),
+                        "total_sec": round(hist.total, 6),
+                        "self_sec": round(self._self_sec.get(name, 0.0), 6),
+                        "mean_sec": summary["mean"],
+                        "p50_sec": summary["p50"],
+                        "p95_sec": summary["p95"],
+                        "p99_sec": summary["p99"],
+                        "max_sec": summary["max"],
+                    }
+                )
+        return sorted(rows, key=lambda r: -r["total_sec"])
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._self_sec.clear()
+            self._errors.clear()
+
+
+class JsonlTraceExporter:
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._fh = self.path.open("a", encoding="utf-8")
+
+    def export(self, span: SpanRecord) -> None:
+        line = json.dumps(asdict(span), ensure_ascii=False, default=str) + "\n"
+        with self._lock:
+            if self._fh is not None:
+                self._fh.write(line)
+                self._fh.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+
+
+class _Tracer:
+    def __init__(self) -> None:
+        self.enabled = False
+        self.aggregator = TraceAggregator()
+        self.exporter: JsonlTraceExporter | None = None
+        self._ids = itertools.count(1)
+
+    def next_id(self) -> int:
+        return next(self._ids)
+
+    def finish(self, span: SpanRecord) -> None:
+        self.aggregator.record(span)
+        exporter = self.exporter
+        if exporter is not None:
+            exporter.export(span)
+
+
+_TRACER = _Tracer()
+_CURRENT: contextvars.ContextVar[_Span | None] = contextvars.ContextVar("infralens_current_span", default=None)
+
+
+class _Span:
+    __slots__ = ("name", "attrs", "span_id", "parent", "child_sec", "_t0", "_start_unix", "_token")
+
+    def __init__(self, name: str, attrs: dict[str, Any]) -> None:
+        self.name = name
+        self.attrs = attrs
+        self.child_sec = 0.0
+
+    def set(self, **attrs: Any) -> None:
+        self.attrs.update(attrs)
+
+    def __enter__(self) -> _Span:
+        self.span_id = _TRACER.next_id()
+        self.parent = _CURRENT.get()
+        self._token = _CURRENT.set(self)
+        self._start_unix = time.time()
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        duration = time.perf_counter() - self._t0
+        _CURRENT.reset(self._token)
+        if self.parent is not None:
+            self.parent.child_sec += duration
+        _TRACER.finish(
+            SpanRecord(
+                name=self.name,
+                span_id=self.span_id,
+                parent_id=self.parent.span_id if self.parent is not None else None,
+                start_unix=round(self._start_unix, 6),
+                duration_sec=duration,
+                self_sec=max(0.0, duration - self.child_sec),
+                thread=threading.current_thread().name,
+                error=exc_type.__name__ if exc_type is not None else "",
+                attrs=self.attrs,
+            )
+        )
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set(self, **attrs: Any) -> None:
+        pass
+
+    def __enter__(self) -> _NoopSpan:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+def span(name: str, **attrs: Any) -> _Span | _NoopSpan:
+    if not _TRACER.enabled:
+        return _NOOP
+    return _Span(name, attrs)
+
+
+def traced(name: str) -> Callable[[F], F]:
+    def decorator(fn: F) -> F:
+        @wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _TRACER.enabled:
+                return fn(*args, **kwargs)
+            with _Span(name, {}):
+                return fn(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def enable_tracing(path: str | Path | None = None) -> TraceAggregator:
+    if _TRACER.exporter is not None:
+        _TRACER.exporter.close()
+        _TRACER.exporter = None
+    if path:
+        _TRACER.exporter = JsonlTraceExporter(path)
+    _TRACER.enabled = True
+    return _TRACER.aggregator
+
+
+def disable_tracing() -> None:
+    _TRACER.enabled = False
+    if _TRACER.exporter is not None:
+        _TRACER.exporter.close()
+        _TRACER.exporter = None
+
+
+def tracing_enabled() -> bool:
+    return _TRACER.enabled
+
+
+def trace_aggregator() -> TraceAggregator:
+    return _TRACER.aggregator
+
+
+def trace_breakdown() -> list[dict[str, Any]]:
+    return _TRACER.aggregator.breakdown()
+
+
+def reset_trace() -> None:
+    _TRACER.aggregator.reset()
+
+
+def configure_from_env() -> None:
+    # INFRALENS_TRACE: unset/off = disabled, on = in-process only, anything else = JSONL path.
+    value = os.getenv(TRACE_ENV, "").strip()
+    if not value or value.lower() in {"off", "0", "false", "none"}:
+        return
+    if value.lower() in {"on", "1", "true"}:
+        enable_tracing()
+    else:
+        enable_tracing(value)
+
+
+configure_from_env()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from infralens.batch import analyze_host_bundles, discover_host_bundles, host_analysis_to_dict
+from infralens.data import Workload
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Analyze a directory of per-host telemetry bundles (CSV plus optional topo/numactl) in parallel."
+    )
+    parser.add_argument("directory", type=str, help="Directory with one subdirectory or <host>.csv file per host.")
+    parser.add_argument("--jobs", type=int, default=0, help="Worker processes (0 = CPU count).")
+    parser.add_argument("--workloads", type=str, default="", help="Optional JSON file with a list of workloads.")
+    parser.add_argument("--out", type=str, default="", help="Optional JSONL output path (default: stdout).")
+    args = parser.parse_args()
+
+    workloads = None
+    if args.workloads:
+        workloads = [Workload(**w) for w in json.loads(Path(args.workloads).read_text(encoding="utf-8"))]
+
+    bundles = discover_host_bundles(args.directory)
+    t0 = time.perf_counter()
+    results = analyze_host_bundles(bundles, workloads=workloads, jobs=args.jobs or None)
+    elapsed = time.perf_counter() - t0
+
+    lines = [json.dumps(host_analysis_to_dict(r), ensure_ascii=False) for r in results]
+    if args.out:
+        output = Path(args.out)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text("\n".join(lines) + ("\n" if lines else ""), encoding="utf-8")
+    else:
+        for line in lines:
+            print(line)
+
+    failed = [r for r in results if r.error]
+    print(
+        f"analyzed {len(results)} host(s) in {elapsed:.3f}s, {len(failed)} failed",
+        file=sys.stderr,
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
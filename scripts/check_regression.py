@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from dataclasses import asdict
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from infralens.regression import (
+    DEFAULT_CONFIDENCE,
+    DEFAULT_MIN_SAMPLES,
+    DEFAULT_RESAMPLES,
+    DEFAULT_THRESHOLD,
+    compare_runs,
+    format_delta_table,
+    has_regression,
+    load_records,
+    pooled_samples,
+    select_phase,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Compare before/after timing distributions per stage with bootstrap confidence intervals. "
+            "Exits 1 when any stage is slower than the threshold with confidence."
+        )
+    )
+    parser.add_argument("path", nargs="?", default="logs/success_metrics.jsonl", help="Metrics or benchmark JSONL.")
+    parser.add_argument("--candidate-file", type=str, default="", help="Read the candidate run from another JSONL.")
+    parser.add_argument("--baseline-phase", type=str, default="before")
+    parser.add_argument("--candidate-phase", type=str, default="after")
+    parser.add_argument("--window", type=int, default=1, help="Pool the last N records of each phase.")
+    parser.add_argument(
+        "--threshold", type=float, default=DEFAULT_THRESHOLD, help="Relative slowdown that fails (0.10 = 10%%)."
+    )
+    parser.add_argument("--confidence", type=float, default=DEFAULT_CONFIDENCE)
+    parser.add_argument("--resamples", type=int, default=DEFAULT_RESAMPLES)
+    parser.add_argument("--min-samples", type=int, default=DEFAULT_MIN_SAMPLES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Print comparisons as JSON instead of a table.")
+    args = parser.parse_args()
+
+    records = load_records(args.path)
+    baseline = select_phase(records, args.baseline_phase, args.window)
+    if args.candidate_file:
+        candidate_records = load_records(args.candidate_file)
+        candidate = select_phase(candidate_records, args.candidate_phase, args.window) or candidate_records[
+            -max(1, args.window):
+        ]
+    else:
+        candidate = select_phase(records, args.candidate_phase, args.window)
+
+    if not baseline or not candidate:
+        print(
+            f"need records for both phases ('{args.baseline_phase}' and '{args.candidate_phase}')",
+            file=sys.stderr,
+        )
+        return 2
+
+    comparisons = compare_runs(
+        pooled_samples(baseline),
+        pooled_samples(candidate),
+        threshold=args.threshold,
+        confidence=args.confidence,
+        resamples=args.resamples,
+        min_samples=args.min_samples,
+        seed=args.seed,
+    )
+    if not comparisons:
+        print("no common stages between baseline and candidate", file=sys.stderr)
+        return 2
+
+    if args.json:
+        print(json.dumps([asdict(c) for c in comparisons], ensure_ascii=False, indent=2))
+    else:
+        print(format_delta_table(comparisons))
+
+    if has_regression(comparisons):
+        failed = ", ".join(c.stage for c in comparisons if c.status == "regression")
+        print(f"performance regression above {args.threshold:.0%}: {failed}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
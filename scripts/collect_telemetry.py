@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from infralens.collector import Collector, SampleRing, source_from_spec
+from infralens.scoring import calculate_efficiency_score
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Poll GPU telemetry on a fixed cadence and print a rolling efficiency score as JSON lines."
+    )
+    parser.add_argument("--source", choices=["nvidia-smi", "prometheus", "replay"], default="nvidia-smi")
+    parser.add_argument(
+        "--target",
+        type=str,
+        default="",
+        help="nvidia-smi binary, Prometheus/DCGM metrics URL, or replay telemetry file.",
+    )
+    parser.add_argument("--host", type=str, default="local", help="Host label attached to samples.")
+    parser.add_argument("--interval", type=float, default=1.0, help="Polling interval in seconds.")
+    parser.add_argument("--window", type=float, default=300.0, help="Scoring window in seconds.")
+    parser.add_argument("--report-every", type=float, default=10.0, help="Seconds between score reports.")
+    parser.add_argument("--duration", type=float, default=0.0, help="Stop after N seconds (0 = run until Ctrl-C).")
+    parser.add_argument("--capacity", type=int, default=3600, help="Ring buffer capacity in polls.")
+    args = parser.parse_args()
+
+    source = source_from_spec(args.source, args.target or None)
+    ring = SampleRing(capacity=args.capacity)
+    collector = Collector(source, ring=ring, interval_sec=args.interval, host=args.host)
+
+    deadline = time.monotonic() + args.duration if args.duration > 0 else None
+    collector.start()
+    try:
+        while collector.running and (deadline is None or time.monotonic() < deadline):
+            wait = args.report_every
+            if deadline is not None:
+                wait = min(wait, max(0.0, deadline - time.monotonic()))
+            time.sleep(wait)
+            if not len(ring):
+                continue
+            scenario = ring.to_scenario(window_sec=args.window, host=args.host)
+            score = calculate_efficiency_score(scenario)
+            print(
+                json.dumps(
+                    {
+                        "host": args.host,
+                        "timestamp": time.time(),
+                        "gpus": len(scenario["gpus"]),
+                        "score": score.score,
+                        "grade": score.grade,
+                        "polls": collector.stats.polls,
+                        "errors": collector.stats.errors,
+                        "last_error": collector.stats.last_error,
+                    },
+                    ensure_ascii=False,
+                ),
+                flush=True,
+            )
+    except KeyboardInterrupt:
+        pass
+    finally:
+        collector.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from infralens.benchmark import (
+    BENCHMARK_STAGES,
+    DEFAULT_OUT_PATH,
+    format_results_table,
+    run_benchmarks,
+    write_benchmark_records,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark each InfraLens pipeline stage on seeded synthetic fleets and append results as JSONL."
+    )
+    parser.add_argument("--sizes", type=str, default="64,512,4096", help="Comma-separated fleet sizes in GPUs.")
+    parser.add_argument(
+        "--stages", type=str, default=",".join(BENCHMARK_STAGES), help="Comma-separated stages to run."
+    )
+    parser.add_argument("--iterations", type=int, default=5, help="Timed iterations per stage.")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed warmup iterations per stage.")
+    parser.add_argument("--seed", type=int, default=0, help="Synthetic fleet/workload seed.")
+    parser.add_argument("--out", type=str, default=DEFAULT_OUT_PATH, help="Output JSONL log path.")
+    parser.add_argument("--phase", type=str, default="", help="Optional phase label (before/after).")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+    results = run_benchmarks(
+        sizes=sizes,
+        stages=stages,
+        iterations=args.iterations,
+        warmup=args.warmup,
+        seed=args.seed,
+        progress=lambda r: print(f"{r.stage} @ {r.gpus} GPUs: p50 {r.p50_sec * 1000:.2f} ms", file=sys.stderr),
+    )
+    _, output = write_benchmark_records(results, out_path=args.out, phase=args.phase, seed=args.seed)
+    print(format_results_table(results))
+    print(f"appended to {output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,65 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from infralens.batch import analyze_host_bundle, analyze_host_bundles, discover_host_bundles, host_analysis_to_dict
+
+EXAMPLES = Path(__file__).resolve().parent.parent / "examples"
+
+
+class BatchAnalysisTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        root = Path(self._tmp.name)
+        csv_bytes = (EXAMPLES / "nvidia_smi_sample_noheader.csv").read_bytes()
+
+        node_a = root / "node-a"
+        node_a.mkdir()
+        (node_a / "nvidia_smi.csv").write_bytes(csv_bytes)
+        (node_a / "nvidia_smi_topo_m.txt").write_bytes((EXAMPLES / "nvidia_smi_topo_m_sample.txt").read_bytes())
+        (node_a / "numactl_hardware.txt").write_bytes((EXAMPLES / "numactl_hardware_sample.txt").read_bytes())
+
+        (root / "node-b.csv").write_bytes((EXAMPLES / "nvidia_smi_sample.csv").read_bytes())
+        (root / "node-c.csv").write_text("\n")  # broken capture
+        (root / "notes.md").write_text("ignored")
+        self.root = root
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_discovers_directory_and_flat_layouts(self):
+        bundles = discover_host_bundles(self.root)
+        self.assertEqual([b.host for b in bundles], ["node-a", "node-b", "node-c"])
+        self.assertIsNotNone(bundles[0].topo_path)
+        self.assertIsNotNone(bundles[0].numactl_path)
+        self.assertIsNone(bundles[1].topo_path)
+
+    def test_flat_names_keep_dotted_hosts_and_marker_suffixes(self):
+        csv_bytes = (EXAMPLES / "nvidia_smi_sample.csv").read_bytes()
+        (self.root / "node1.example.com.csv").write_bytes(csv_bytes)
+        (self.root / "node1.example.com.topo.txt").write_bytes((EXAMPLES / "nvidia_smi_topo_m_sample.txt").read_bytes())
+        (self.root / "node2.example.com.csv").write_bytes(csv_bytes)
+        (self.root / "topo-01.csv").write_bytes(csv_bytes)
+        bundles = {b.host: b for b in discover_host_bundles(self.root)}
+        self.assertIn("node1.example.com", bundles)
+        self.assertIn("node2.example.com", bundles)
+        self.assertTrue(bundles["node1.example.com"].topo_path.endswith("node1.example.com.topo.txt"))
+        self.assertIsNone(bundles["node2.example.com"].topo_path)
+        self.assertTrue(bundles["topo-01"].telemetry_path.endswith("topo-01.csv"))
+
+    def test_parallel_results_are_ordered_and_errors_isolated(self):
+        bundles = discover_host_bundles(self.root)
+        results = analyze_host_bundles(bundles, jobs=2)
+        self.assertEqual([r.host for r in results], ["node-a", "node-b", "node-c"])
+        self.assertIsNone(results[0].error)
+        self.assertEqual(results[0].gpu_count, 4)
+        self.assertTrue(results[0].templates)
+        self.assertIn("ValueError", results[2].error)
+
+        serial = [analyze_host_bundle(b) for b in bundles]
+        self.assertEqual([r.score for r in results], [r.score for r in serial])
+        self.assertEqual(host_analysis_to_dict(results[1])["score"]["score"], serial[1].score.score)
+
+
+if __name__ == "__main__":
+    unittest.main()
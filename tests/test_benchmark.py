@@ -0,0 +1,97 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from infralens.benchmark import BENCHMARK_STAGES, percentile, run_benchmarks, write_benchmark_records
+from infralens.parsers import parse_uploaded_telemetry
+from infralens.synthetic import (
+    NODE_SHAPES,
+    host_workloads,
+    scenario_to_nvidia_smi_csv,
+    synthetic_fleet,
+    synthetic_workloads,
+)
+
+
+class SyntheticFleetTests(unittest.TestCase):
+    def test_generator_is_seeded_and_sized(self):
+        for size in (1, 7, 64, 512):
+            fleet = synthetic_fleet(size, seed=3)
+            self.assertEqual(sum(len(s["gpus"]) for s in fleet.values()), size)
+        self.assertEqual(synthetic_fleet(64, seed=3), synthetic_fleet(64, seed=3))
+        self.assertNotEqual(synthetic_fleet(64, seed=3), synthetic_fleet(64, seed=4))
+
+    def test_hosts_follow_their_node_shape_topology(self):
+        fleet = synthetic_fleet(512, seed=1, mismatch_rate=0.0)
+        for scenario in fleet.values():
+            shape = NODE_SHAPES.get(scenario["model"])
+            if shape is None:
+                continue
+            groups = {}
+            for g in scenario["gpus"]:
+                groups.setdefault(g["nvlink_group"], []).append(g["id"])
+                self.assertEqual(g["numa_node"], g["cpu_socket"])
+                self.assertLessEqual(g["vram_used_gb"], scenario["total_vram_gb"])
+            self.assertTrue(all(len(m) == shape.nvlink_group_size for m in groups.values()))
+            self.assertEqual(len({g["numa_node"] for g in scenario["gpus"]}), shape.numa_nodes)
+
+    def test_workloads_fill_fleet_and_fit_hosts(self):
+        fleet = synthetic_fleet(128, seed=2)
+        workloads = synthetic_workloads(fleet, seed=2, fill_ratio=0.75)
+        requested = sum(w.gpu_demand for w in workloads)
+        self.assertGreaterEqual(requested, 96)
+        self.assertEqual(len({w.name for w in workloads}), len(workloads))
+        for host, jobs in host_workloads(workloads, fleet).items():
+            self.assertLessEqual(sum(w.gpu_demand for w in jobs), len(fleet[host]["gpus"]))
+
+    def test_csv_round_trips_through_parser(self):
+        scenario = next(iter(synthetic_fleet(8, seed=5).values()))
+        parsed = parse_uploaded_telemetry("x.csv", scenario_to_nvidia_smi_csv(scenario).encode())
+        self.assertEqual([g["id"] for g in parsed["gpus"]], [g["id"] for g in scenario["gpus"]])
+        self.assertEqual(parsed["total_vram_gb"], scenario["total_vram_gb"])
+        self.assertEqual(
+            [g["nvlink_group"] for g in parsed["gpus"]], [g["nvlink_group"] for g in scenario["gpus"]]
+        )
+
+
+class BenchmarkSuiteTests(unittest.TestCase):
+    def test_percentile_nearest_rank(self):
+        values = [float(v) for v in range(1, 101)]
+        self.assertEqual(percentile(values, 0.50), 50.0)
+        self.assertEqual(percentile(values, 0.95), 95.0)
+        self.assertEqual(percentile(values, 0.99), 99.0)
+        self.assertEqual(percentile([], 0.5), 0.0)
+
+    @patch("infralens.report._enable_unicode_font", return_value=(False, "Helvetica"))
+    def test_every_stage_reports_distribution_and_memory(self, _mock_font):
+        results = run_benchmarks(sizes=[16], iterations=3, warmup=0, seed=1)
+        self.assertEqual([r.stage for r in results], list(BENCHMARK_STAGES))
+        for r in results:
+            self.assertEqual(r.gpus, 16)
+            self.assertEqual(len(r.samples_sec), 3)
+            self.assertLessEqual(r.p50_sec, r.p95_sec)
+            self.assertLessEqual(r.p95_sec, r.p99_sec)
+            self.assertGreater(r.throughput_gpus_per_sec, 0)
+            self.assertGreater(r.peak_mem_bytes, 0)
+
+    def test_unknown_stage_is_rejected(self):
+        with self.assertRaises(ValueError):
+            run_benchmarks(sizes=[8], stages=["compile"])
+
+    def test_records_append_as_jsonl(self):
+        results = run_benchmarks(sizes=[8], stages=["score", "rules"], iterations=2, warmup=0)
+        with tempfile.TemporaryDirectory() as tmp:
+            out = Path(tmp) / "logs" / "bench.jsonl"
+            write_benchmark_records(results, out_path=str(out), phase="before")
+            write_benchmark_records(results, out_path=str(out), phase="after")
+            lines = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+        self.assertEqual([r["phase"] for r in lines], ["before", "after"])
+        self.assertEqual(lines[0]["kind"], "benchmark")
+        self.assertEqual([r["stage"] for r in lines[0]["results"]], ["score", "rules"])
+        self.assertEqual(len(lines[0]["results"][0]["samples_sec"]), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
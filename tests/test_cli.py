@@ -0,0 +1,82 @@
+import io
+import json
+import subprocess
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from unittest.mock import patch
+
+from infralens.cli import main
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+EXAMPLES = ROOT_DIR / "examples"
+
+
+def _run(argv, stdin_bytes=None):
+    out, err = io.StringIO(), io.StringIO()
+    stdin = io.TextIOWrapper(io.BytesIO(stdin_bytes or b""))
+    with redirect_stdout(out), redirect_stderr(err), patch("sys.stdin", stdin):
+        code = main(argv)
+    return code, out.getvalue(), err.getvalue()
+
+
+class CliTests(unittest.TestCase):
+    def test_cli_module_does_not_import_analysis_stack(self):
+        probe = (
+            "import sys, infralens.cli; "
+            "print(sorted(m for m in ('pandas', 'numpy', 'fpdf', 'streamlit', 'infralens.batch') if m in sys.modules))"
+        )
+        proc = subprocess.run(
+            [sys.executable, "-c", probe], capture_output=True, text=True, check=True, cwd=str(ROOT_DIR)
+        )
+        self.assertEqual(proc.stdout.strip(), "[]")
+
+    def test_analyze_directory_as_ndjson_in_parallel(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / "node-a.csv").write_bytes((EXAMPLES / "nvidia_smi_sample.csv").read_bytes())
+            (root / "node-b.csv").write_bytes((EXAMPLES / "nvidia_smi_sample_noheader.csv").read_bytes())
+            code, out, err = _run(["analyze", str(root), "--format", "ndjson", "--jobs", "2"])
+        self.assertEqual(code, 0, err)
+        records = [json.loads(line) for line in out.splitlines()]
+        self.assertEqual([r["host"] for r in records], ["node-a", "node-b"])
+        self.assertTrue(all(r["score"]["score"] > 0 and r["templates"] for r in records))
+        self.assertIn("analyzed 2 host(s)", err)
+
+    def test_single_file_keeps_dotted_host_name(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "node1.example.com.csv"
+            path.write_bytes((EXAMPLES / "nvidia_smi_sample.csv").read_bytes())
+            code, out, _ = _run(["analyze", str(path), "--quiet"])
+        self.assertEqual(code, 0)
+        self.assertEqual(json.loads(out)[0]["host"], "node1.example.com")
+
+    def test_analyze_stdin_detects_json(self):
+        payload = json.dumps(
+            {"gpus": [{"index": 0, "utilization.gpu": 20, "memory.used": 1000, "memory.total": 81920}]}
+        ).encode()
+        code, out, _ = _run(["analyze", "-", "--stdin-name", "node-x", "--quiet"], stdin_bytes=payload)
+        self.assertEqual(code, 0)
+        records = json.loads(out)
+        self.assertEqual(records[0]["host"], "node-x")
+        self.assertEqual(records[0]["gpu_count"], 1)
+
+    def test_failures_and_missing_inputs_set_exit_code(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            broken = Path(tmp) / "broken.csv"
+            broken.write_text("\n")
+            code, out, _ = _run(["analyze", str(broken), "--quiet", "--compact"])
+            self.assertEqual(code, 1)
+            self.assertIn("ValueError", json.loads(out)[0]["error"])
+
+            out_path = Path(tmp) / "out" / "result.json"
+            code, _, err = _run(["analyze", str(Path(tmp) / "nope.csv"), "--out", str(out_path)])
+            self.assertEqual(code, 2)
+            self.assertIn("nope.csv", err)
+            self.assertFalse(out_path.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
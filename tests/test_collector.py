@@ -0,0 +1,147 @@
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from infralens.collector import (
+    Collector,
+    NvidiaSmiSource,
+    ReplaySource,
+    SampleBatch,
+    SampleRing,
+    parse_prometheus_text,
+    source_from_spec,
+)
+from infralens.scoring import calculate_efficiency_score
+
+EXAMPLES = Path(__file__).resolve().parents[1] / "examples"
+REPLAY_FIXTURE = EXAMPLES / "nvidia_smi_timeseries_sample.csv"
+
+DCGM_TEXT = """\
+# HELP DCGM_FI_DEV_GPU_UTIL GPU utilization (in %).
+# TYPE DCGM_FI_DEV_GPU_UTIL gauge
+DCGM_FI_DEV_GPU_UTIL{gpu="0",UUID="GPU-a",Hostname="node-1",modelName="NVIDIA A100-SXM4-80GB"} 87
+DCGM_FI_DEV_GPU_UTIL{gpu="1",UUID="GPU-b",Hostname="node-1"} 12
+DCGM_FI_DEV_FB_USED{gpu="0",UUID="GPU-a",Hostname="node-1"} 40960
+DCGM_FI_DEV_FB_FREE{gpu="0",UUID="GPU-a",Hostname="node-1"} 40960
+DCGM_FI_DEV_FB_USED{gpu="1",UUID="GPU-b",Hostname="node-1"} 1024
+DCGM_FI_DEV_FB_FREE{gpu="1",UUID="GPU-b",Hostname="node-1"} 80896
+DCGM_FI_DEV_SM_CLOCK{gpu="0",UUID="GPU-a",Hostname="node-1"} 1410
+"""
+
+
+class FakeClock:
+    def __init__(self, start=1000.0):
+        self.now = start
+
+    def __call__(self):
+        self.now += 1.0
+        return self.now
+
+
+class CollectorTests(unittest.TestCase):
+    def test_replay_fixture_is_split_into_frames(self):
+        source = ReplaySource(REPLAY_FIXTURE, loop=False)
+        self.assertEqual(len(source.frames), 6)
+        frames = [source.poll() for _ in range(6)]
+        self.assertTrue(all(len(f) == 4 for f in frames))
+        self.assertNotIn("timestamp", frames[0][0])
+        self.assertTrue(source.exhausted)
+        self.assertEqual(source.poll(), [])
+
+    def test_run_once_feeds_ring_that_scoring_reads(self):
+        ring = SampleRing(capacity=100)
+        collector = Collector(ReplaySource(REPLAY_FIXTURE), ring=ring, host="node-1", clock=FakeClock())
+        for _ in range(6):
+            collector.run_once()
+
+        scenario = ring.to_scenario(host="node-1")
+        self.assertEqual(len(scenario["gpus"]), 4)
+        self.assertEqual(scenario["gpus"][0]["samples"], 6)
+        self.assertEqual(scenario["total_vram_gb"], 80)
+        self.assertEqual(collector.stats.samples, 24)
+        self.assertGreater(calculate_efficiency_score(scenario).score, 0)
+
+    def test_ring_evicts_oldest_and_windows_by_time(self):
+        ring = SampleRing(capacity=3)
+        for ts in range(5):
+            ring.push(SampleBatch(timestamp=float(ts), host="h", rows=[{"index": 0, "utilization_gpu": ts * 10}]))
+        self.assertEqual(len(ring), 3)
+        self.assertEqual([b.timestamp for b in ring.snapshot()], [2.0, 3.0, 4.0])
+        self.assertEqual([b.timestamp for b in ring.snapshot(window_sec=1)], [3.0, 4.0])
+        self.assertEqual(ring.to_scenario(window_sec=1)["gpus"][0]["gpu_util"], 35.0)
+
+    def test_empty_ring_raises(self):
+        with self.assertRaises(ValueError):
+            SampleRing().to_scenario()
+
+    def test_source_errors_are_counted_not_raised(self):
+        class Broken:
+            name = "broken"
+
+            def poll(self):
+                raise OSError("no device")
+
+        collector = Collector(Broken())
+        self.assertIsNone(collector.run_once())
+        self.assertEqual(collector.stats.errors, 1)
+        self.assertIn("no device", collector.stats.last_error)
+
+    def test_background_thread_polls_on_cadence(self):
+        collector = Collector(ReplaySource(REPLAY_FIXTURE), interval_sec=0.01)
+        with collector:
+            time.sleep(0.15)
+        self.assertFalse(collector.running)
+        self.assertGreaterEqual(collector.stats.polls, 5)
+        self.assertEqual(len(collector.ring), collector.stats.polls)
+
+    def test_background_thread_stops_when_replay_is_exhausted(self):
+        collector = Collector(ReplaySource(REPLAY_FIXTURE, loop=False), interval_sec=0.001).start()
+        deadline = time.monotonic() + 2.0
+        while collector.running and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertFalse(collector.running)
+        self.assertEqual(len(collector.ring), 6)
+
+    def test_parse_prometheus_dcgm_text(self):
+        rows = parse_prometheus_text(DCGM_TEXT)
+        self.assertEqual([r["index"] for r in rows], ["0", "1"])
+        self.assertEqual(rows[0]["utilization_gpu"], "87")
+        self.assertEqual(rows[0]["memory_total"], 81920.0)
+        self.assertEqual(rows[0]["host"], "node-1")
+        self.assertEqual(rows[0]["model_name"], "NVIDIA A100-SXM4-80GB")
+
+        ring = SampleRing()
+        ring.push(SampleBatch(timestamp=1.0, host="node-1", rows=rows))
+        scenario = ring.to_scenario()
+        self.assertEqual(scenario["gpus"][0]["vram_used_gb"], 40.0)
+        self.assertEqual(scenario["total_vram_gb"], 80)
+        self.assertEqual(scenario["model"], "NVIDIA A100-SXM4-80GB")
+
+    def test_nvidia_smi_source_parses_query_output(self):
+        completed = type("Completed", (), {"stdout": "0, 88, 70200, 81920, NVIDIA H100 80GB HBM3\n1, 12, 1024, 81920, NVIDIA H100 80GB HBM3\n"})()
+        with patch("infralens.collector.subprocess.run", return_value=completed) as run:
+            rows = NvidiaSmiSource(timeout_sec=1.0).poll()
+        cmd = run.call_args.args[0]
+        self.assertIn("--format=csv,noheader,nounits", cmd)
+        self.assertEqual(
+            rows[1],
+            {
+                "index": "1",
+                "utilization_gpu": "12",
+                "memory_used": "1024",
+                "memory_total": "81920",
+                "name": "NVIDIA H100 80GB HBM3",
+            },
+        )
+
+    def test_source_from_spec(self):
+        self.assertIsInstance(source_from_spec("replay", str(REPLAY_FIXTURE)), ReplaySource)
+        with self.assertRaises(ValueError):
+            source_from_spec("prometheus")
+        with self.assertRaises(ValueError):
+            source_from_spec("snmp", "x")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import json
+import unittest
+from unittest.mock import patch
+
+from infralens import schema
+from infralens.parsers import (
+    TelemetryAggregator,
+    _build_scenario_from_columns,
+    _build_scenario_from_rows,
+    _gpu_fields_from_row,
+    _read_csv_columns,
+    _rows_field_mapping,
+    parse_uploaded_telemetry,
+)
+from infralens.schema import AliasRegistry, compile_field_mapping
+from infralens.timeseries import TelemetryStore
+
+SITE_CSV = "host, slot, busy_pct, fb_used_mib, fb_total_mib\nn1, 0, 35, 20480, 81920\nn1, 1, 90, 61440, 81920\n"
+
+
+class AliasRegistryTests(unittest.TestCase):
+    def test_mapping_lists_present_columns_in_priority_order(self):
+        mapping = compile_field_mapping(["memory_used_mib", "gpu_util", "memory_used", "vram_used_gb", "timestamp"])
+        self.assertEqual(mapping.columns("memory_used_mib"), ("memory_used", "memory_used_mib"))
+        self.assertEqual(mapping.columns("gpu_util"), ("gpu_util",))
+        self.assertEqual(mapping.columns("numa_node"), ())
+
+    def test_nvlink_explicit_only_for_nvlink_columns(self):
+        self.assertTrue(compile_field_mapping(["index", "nvlink"]).nvlink_explicit)
+        self.assertFalse(compile_field_mapping(["index", "topology_group"]).nvlink_explicit)
+        self.assertFalse(compile_field_mapping(["index"]).nvlink_explicit)
+
+    def test_compile_is_cached_per_header(self):
+        registry = AliasRegistry()
+        header = ("index", "utilization_gpu", "memory_used")
+        before = registry.compile(header)
+        self.assertIs(before, registry.compile(list(header)))
+        registry.register("gpu_util", "busy")
+        self.assertIsNot(before, registry.compile(header))
+
+    def test_register_normalizes_and_orders_aliases(self):
+        registry = AliasRegistry({"gpu_util": ["Busy %"]})
+        self.assertEqual(registry.aliases("gpu_util")[-1], "busy")
+        registry.register("gpu_util", "SM Active", first=True)
+        self.assertEqual(registry.aliases("gpu_util")[0], "sm_active")
+        self.assertIn("sm_active", registry.known_columns())
+        with self.assertRaises(ValueError):
+            registry.register("gpu_temperature", "temp")
+
+    def test_row_paths_compile_once_per_batch(self):
+        rows = [{"index": str(i), "utilization_gpu": "50", "memory_used": "1024"} for i in range(50)]
+        registry = AliasRegistry()
+        with patch.object(schema, "default_registry", return_value=registry), patch.object(
+            registry, "compile", wraps=registry.compile
+        ) as compile_:
+            _build_scenario_from_rows(rows, "t")
+            aggregator = TelemetryAggregator()
+            aggregator.add_rows(iter(rows))
+            TelemetryStore().extend_rows(rows)
+        self.assertEqual(compile_.call_count, 3)
+        self.assertEqual(aggregator.rows_seen, 50)
+
+    def test_batch_mapping_matches_per_row_mapping(self):
+        rows = [
+            {"gpu": "3", "util": "70 %", "vram_used_gb": "12.5", "nvlink_group": "B"},
+            {"gpu": "4", "memory_used": "2048", "nvlink_group": "A"},
+        ]
+        mapping = _rows_field_mapping(rows)
+        for row in rows:
+            self.assertEqual(_gpu_fields_from_row(row, 0, mapping), _gpu_fields_from_row(row, 0, compile_field_mapping(row)))
+
+
+class SiteAliasTests(unittest.TestCase):
+    def setUp(self):
+        self.registry = AliasRegistry(
+            {
+                "id": ["slot"],
+                "gpu_util": ["busy_pct"],
+                "memory_used_mib": ["fb_used_mib"],
+                "memory_total_mib": ["fb_total_mib"],
+            }
+        )
+
+    def test_site_aliases_drive_columnar_parse(self):
+        table = _read_csv_columns(SITE_CSV, self.registry)
+        self.assertEqual(sorted(table.cells), ["busy_pct", "fb_total_mib", "fb_used_mib", "slot"])
+        scenario = _build_scenario_from_columns(table, "site", self.registry)
+        self.assertEqual([g["gpu_util"] for g in scenario["gpus"]], [35.0, 90.0])
+        self.assertEqual([g["vram_used_gb"] for g in scenario["gpus"]], [20.0, 60.0])
+
+    def test_unknown_columns_are_ignored_without_site_aliases(self):
+        table = _read_csv_columns(SITE_CSV, AliasRegistry())
+        self.assertEqual(table.cells, {})
+        scenario = _build_scenario_from_columns(table, "site", AliasRegistry())
+        self.assertEqual([g["gpu_util"] for g in scenario["gpus"]], [0.0, 0.0])
+
+    def test_config_section_extends_default_registry(self):
+        aliases = {"gpu_util": ["busy_pct"], "id": ["slot"], "memory_used_mib": ["fb_used_mib"]}
+        with patch.object(schema, "get_column_aliases", return_value=aliases):
+            schema.reset_default_registry()
+            try:
+                scenario = parse_uploaded_telemetry("site.csv", SITE_CSV.encode())
+                payload = json.dumps([{"slot": 4, "busy_pct": 12}]).encode()
+                from_json = parse_uploaded_telemetry("site.json", payload)
+            finally:
+                schema.reset_default_registry()
+        self.assertEqual([g["gpu_util"] for g in scenario["gpus"]], [35.0, 90.0])
+        self.assertEqual((from_json["gpus"][0]["id"], from_json["gpus"][0]["gpu_util"]), (4, 12.0))
+
+    def test_shipped_config_maps_dcgm_field_names(self):
+        text = "DCGM_FI_DEV_GPU_UTIL,DCGM_FI_DEV_FB_USED,DCGM_FI_DEV_FB_TOTAL\n40,10240,81920\n"
+        scenario = parse_uploaded_telemetry("dcgm.csv", text.encode())
+        self.assertEqual((scenario["gpus"][0]["gpu_util"], scenario["gpus"][0]["vram_used_gb"]), (40.0, 10.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
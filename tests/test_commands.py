@@ -1,9 +1,15 @@
 import unittest
+from pathlib import Path
 
-from infralens.commands import ExecutionConfig, build_execution_templates
-from infralens.data import default_workloads, sample_scenarios
+from infralens.commands import ExecutionConfig, build_execution_templates, format_cpu_list
+from infralens.data import Workload, default_workloads, sample_scenarios, workloads_for_scenario
+from infralens.i18n import localize_recommendation
+from infralens.parsers import _parse_cpu_affinity_to_set, parse_uploaded_telemetry
 from infralens.rules import build_placement_recommendation
 
+EXAMPLES = Path(__file__).resolve().parent.parent / "examples"
+NUMACTL = (EXAMPLES / "numactl_hardware_sample.txt").read_text()
+
 
 class CommandTemplateTests(unittest.TestCase):
     def test_manual_cpu_set_and_extra_args_are_applied(self):
@@ -54,6 +60,75 @@ class CommandTemplateTests(unittest.TestCase):
             sample = next(t for t in templates if "# MIG profile:" in t.docker_cmd)
             self.assertIn("\n", sample.docker_cmd)
 
+    def _numa_templates(self, cfg=None):
+        name = "Mid-Market Training - H100 8-GPU"
+        scenario = dict(sample_scenarios()[name])
+        scenario["node_cpus"] = parse_uploaded_telemetry("x.csv", b"0,10,1000,81920", numactl_text=NUMACTL)["node_cpus"]
+        workloads = workloads_for_scenario(name)
+        rec = build_placement_recommendation(scenario, workloads, 60)
+        return scenario, rec, build_execution_templates(scenario, workloads, rec, exec_cfg=cfg)
+
+    def test_numactl_upload_is_carried_in_scenario(self):
+        raw = (EXAMPLES / "nvidia_smi_sample.csv").read_bytes()
+        scenario = parse_uploaded_telemetry("x.csv", raw, numactl_text=NUMACTL)
+        self.assertEqual(format_cpu_list(scenario["node_cpus"]["1"]), "24-47,72-95")
+        self.assertNotIn("node_cpus", parse_uploaded_telemetry("x.csv", raw))
+
+    def test_cpu_sets_are_numa_local_sized_and_disjoint(self):
+        scenario, rec, templates = self._numa_templates()
+        node_cpus = {int(k): set(v) for k, v in scenario["node_cpus"].items()}
+        numa_of = {g["id"]: g["numa_node"] for g in scenario["gpus"]}
+        gpus_of = {
+            i.workload: i.data.get("target_gpus") or [i.data["host_gpu"]]
+            for i in rec.items
+            if i.code in ("move_training_nvlink", "consolidate_inference_mig")
+        }
+        mig_profile = {i.workload: i.data.get("profile") for i in rec.items if i.code == "consolidate_inference_mig"}
+        seen: set[int] = set()
+        for t in templates:
+            cpus = _parse_cpu_affinity_to_set(t.taskset_cmd.split("taskset -c ", 1)[1].split(" ", 1)[0])
+            local = set().union(*(node_cpus[numa_of[g]] for g in gpus_of[t.workload]))
+            self.assertTrue(cpus <= local, t.workload)
+            self.assertFalse(cpus & seen, t.workload)
+            seen |= cpus
+            # 48 CPUs per node over 4 GPUs: 12 per GPU; a MIG instance gets its
+            # compute share of those, rounded up to whole core pairs.
+            profile = mig_profile.get(t.workload)
+            expected = -(-(12 * int(profile[0]) // 7) // 2) * 2 if profile else 12 * len(gpus_of[t.workload])
+            self.assertEqual(len(cpus), expected, t.workload)
+            nodes = ",".join(str(n) for n in sorted({numa_of[g] for g in gpus_of[t.workload]}))
+            self.assertIn(f"--cpunodebind={nodes} --membind={nodes}", t.numactl_cmd)
+
+    def test_multi_gpu_inference_pins_every_gpu(self):
+        scenario = sample_scenarios()["Mid-Market Training - H100 8-GPU"]
+        workloads = [Workload("inf2", "inference", 2, 40)]
+        rec = build_placement_recommendation(scenario, workloads, 60)
+        item = rec.items[0]
+        self.assertEqual(item.code, "place_inference_multi_gpu")
+        self.assertEqual(len(item.data["target_gpus"]), 2)
+        gpu_csv = ",".join(str(g) for g in item.data["target_gpus"])
+        self.assertIn(str(item.data["target_gpus"]), localize_recommendation(rec, "ko").items[0].action)
+        template = build_execution_templates(scenario, workloads, rec)[0]
+        self.assertIn(f"CUDA_VISIBLE_DEVICES={gpu_csv} ", template.numactl_cmd)
+        self.assertIn(f'--gpus "device={gpu_csv}"', template.docker_cmd)
+
+    def test_oversubscribed_node_falls_back_with_a_warning(self):
+        scenario, rec, templates = self._numa_templates(ExecutionConfig(cpus_per_gpu=20))
+        node0 = format_cpu_list(scenario["node_cpus"]["0"])
+        by_name = {t.workload: t for t in templates}
+        # Four GPUs on node 0 want 80 CPUs; the node has 48.
+        train = by_name["training-main-01"]
+        for cmd in (train.numactl_cmd, train.taskset_cmd, train.docker_cmd):
+            self.assertTrue(cmd.startswith("# WARNING: NUMA node 0 had 48 of the 80 CPUs"), cmd)
+        self.assertIn(f"taskset -c {node0} ", train.taskset_cmd)
+        self.assertIn(f'--cpuset-cpus="{node0}"', train.docker_cmd)
+        self.assertNotIn("WARNING", by_name["training-main-02"].taskset_cmd)
+
+    def test_manual_cpu_set_overrides_numactl_topology(self):
+        _, _, templates = self._numa_templates(ExecutionConfig(cpu_set_mode="manual", manual_cpu_set="2-5"))
+        self.assertTrue(all("taskset -c 2-5 " in t.taskset_cmd for t in templates))
+        self.assertEqual(format_cpu_list([5, 1, 2, 3, 9]), "1-3,5,9")
+
 
 if __name__ == "__main__":
     unittest.main()
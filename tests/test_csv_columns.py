@@ -0,0 +1,117 @@
+import csv
+import io
+import random
+import unittest
+
+from infralens.parsers import (
+    _build_scenario_from_columns,
+    _build_scenario_from_rows,
+    _normalize_col,
+    _read_csv_columns,
+    parse_uploaded_telemetry,
+)
+
+# Header spellings seen in nvidia-smi / DCGM exports plus site-specific extras.
+FIELD_HEADERS = {
+    "id": ["index", "gpu_id", "GPU"],
+    "util": ["utilization.gpu [%]", "gpu_util", "util"],
+    "used_mib": ["memory.used [MiB]", "fb_memory_usage_used", "vram_used_mib"],
+    "total_mib": ["memory.total [MiB]", "memory_total_mib"],
+    "used_gb": ["vram_used_gb", "memory_used_gb"],
+    "total_gb": ["vram_total_gb"],
+    "network": ["network_io_score", "network_score"],
+    "numa": ["numa_node", "numa"],
+    "socket": ["cpu_socket", "socket"],
+    "nvlink": ["nvlink_group", "topology_group"],
+}
+NOISE_HEADERS = ["timestamp", "name", "temperature.gpu", "power.draw [W]"]
+
+
+def _cell(field, rng):
+    roll = rng.random()
+    if roll < 0.08:
+        return ""
+    if roll < 0.12:
+        return rng.choice(["[N/A]", "N/A", "-", "abc"])
+    if field == "id":
+        return str(rng.randint(0, 15))
+    if field == "util":
+        return f"{rng.uniform(0, 100):.1f} %"
+    if field in ("used_mib", "total_mib"):
+        return f"{rng.randint(0, 81920):,} MiB" if rng.random() < 0.3 else str(rng.randint(0, 81920))
+    if field in ("used_gb", "total_gb"):
+        return f"{rng.uniform(0, 141):.2f}"
+    if field == "network":
+        return f"{rng.uniform(0, 1):.3f}"
+    if field in ("numa", "socket"):
+        return rng.choice(["0", "1", "1.0", "-1"])
+    return rng.choice(["A", "B", "0", "nv-1"])
+
+
+def _random_csv(rng):
+    headers = []
+    for field, spellings in FIELD_HEADERS.items():
+        for spelling in rng.sample(spellings, rng.randint(0, len(spellings))):
+            headers.append((field, spelling))
+    headers += [(None, h) for h in rng.sample(NOISE_HEADERS, rng.randint(0, 2))]
+    if sum(1 for f, _ in headers if f) < 2:
+        headers = [("id", "index"), ("util", "utilization.gpu [%]")] + headers
+    rng.shuffle(headers)
+    lines = [", ".join(h for _, h in headers)]
+    for _ in range(rng.randint(1, 40)):
+        cells = [_cell(f, rng) if f else "x" for f, _ in headers]
+        if rng.random() < 0.05:
+            cells = cells[: max(1, len(cells) - 2)]  # short row
+        lines.append(",".join(f'"{c}"' if "," in c else c for c in cells))
+    return "\n".join(lines)
+
+
+def _rows_reference(text):
+    reader = csv.reader(io.StringIO(text))
+    header = [_normalize_col(c.strip()) for c in next(reader)]
+    rows = []
+    for raw in reader:
+        cells = [c.strip() for c in raw]
+        if not any(cells):
+            continue
+        cells += [""] * (len(header) - len(cells))
+        row = {}
+        for name, value in zip(header, cells):
+            row.setdefault(name, value)
+        rows.append(row)
+    return rows
+
+
+class ColumnarCsvTests(unittest.TestCase):
+    def test_matches_row_parser_on_random_exports(self):
+        rng = random.Random(17)
+        for _ in range(300):
+            text = _random_csv(rng)
+            expected = _build_scenario_from_rows(_rows_reference(text), "t")
+            self.assertEqual(_build_scenario_from_columns(_read_csv_columns(text), "t"), expected, text)
+
+    def test_only_alias_columns_are_kept(self):
+        text = "timestamp, name, index, utilization.gpu [%], memory.used [MiB], power.draw [W]\nt, H100, 0, 50 %, 1024 MiB, 300 W\n"
+        table = _read_csv_columns(text)
+        self.assertEqual(sorted(table.cells), ["index", "memory_used_mib", "name", "utilization_gpu"])
+        self.assertEqual(table.row_count, 1)
+
+    def test_repeated_headers_and_blank_lines_are_skipped(self):
+        block = "index,utilization.gpu,memory.used,memory.total\n0,10,1024,81920\n1,20,2048,81920\n"
+        scenario = parse_uploaded_telemetry("x.csv", (block + "\n\n" + block).encode())
+        self.assertEqual([g["id"] for g in scenario["gpus"]], [0, 1, 0, 1])
+
+    def test_cells_are_stripped(self):
+        text = "index, utilization.gpu, memory.used, memory.total, nvlink_group\n0, 50, 1024, 81920, A \n"
+        scenario = parse_uploaded_telemetry("x.csv", text.encode())
+        self.assertEqual(scenario["gpus"][0]["nvlink_group"], "A")
+
+    def test_header_only_and_empty_inputs(self):
+        with self.assertRaises(ValueError):
+            parse_uploaded_telemetry("x.csv", b"index,utilization.gpu,memory.used,memory.total\n")
+        with self.assertRaises(ValueError):
+            _read_csv_columns("\n , \n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import random
+import unittest
+
+import pandas as pd
+
+from infralens.data import sample_scenarios
+from infralens.fleet import build_gpu_table, calculate_fleet_scores
+from infralens.scoring import calculate_efficiency_score
+
+
+def _random_scenario(rng: random.Random, gpu_count: int) -> dict:
+    return {
+        "name": "random",
+        "total_vram_gb": rng.choice([24, 48, 80, 141]),
+        "gpus": [
+            {
+                "id": i,
+                "gpu_util": round(rng.uniform(0, 100), 2),
+                "vram_used_gb": round(rng.uniform(0, 24), 2),
+                "network_io_score": round(rng.uniform(0.2, 1.0), 2),
+                "numa_node": rng.randint(0, 1),
+                "cpu_socket": rng.randint(0, 1),
+                "nvlink_group": rng.choice("AB"),
+            }
+            for i in range(gpu_count)
+        ],
+    }
+
+
+class FleetScoringTests(unittest.TestCase):
+    def assert_matches(self, expected, actual):
+        self.assertEqual(actual.score, expected.score)
+        self.assertEqual(actual.grade, expected.grade)
+        self.assertEqual(actual.profile, expected.profile)
+        self.assertAlmostEqual(actual.gpu_score, expected.gpu_score, places=12)
+        self.assertAlmostEqual(actual.numa_score, expected.numa_score, places=12)
+        self.assertAlmostEqual(actual.network_score, expected.network_score, places=12)
+
+    def test_per_host_scores_match_scalar_function_for_presets(self):
+        scenarios = sample_scenarios()
+        for profile in ("default", "training", "inference"):
+            result = calculate_fleet_scores(build_gpu_table(scenarios), profile=profile)
+            self.assertEqual(list(result.hosts), list(scenarios))
+            for name, scenario in scenarios.items():
+                self.assert_matches(calculate_efficiency_score(scenario, profile=profile), result.hosts[name])
+
+    def test_random_fleet_with_host_profiles_and_dataframe_input(self):
+        rng = random.Random(7)
+        scenarios = {f"node-{i:03d}": _random_scenario(rng, rng.choice([1, 2, 4, 8])) for i in range(200)}
+        host_profiles = {name: rng.choice(["default", "training", "inference"]) for name in scenarios}
+
+        table = pd.DataFrame(build_gpu_table(scenarios))
+        result = calculate_fleet_scores(table, host_profiles=host_profiles)
+        for name, scenario in scenarios.items():
+            expected = calculate_efficiency_score(scenario, profile=host_profiles[name])
+            self.assert_matches(expected, result.hosts[name])
+
+    def test_fleet_score_equals_single_merged_scenario(self):
+        scenarios = {
+            "a": sample_scenarios()["H200 8-GPU Server"],
+            "b": dict(sample_scenarios()["H200 8-GPU Server"], name="copy"),
+        }
+        merged = dict(scenarios["a"], gpus=scenarios["a"]["gpus"] + scenarios["b"]["gpus"])
+        result = calculate_fleet_scores(build_gpu_table(scenarios))
+        self.assert_matches(calculate_efficiency_score(merged), result.fleet)
+
+    def test_half_boundary_scores_round_like_scalar_function(self):
+        # Summation order alone moves this host's total across x.5.
+        rows = [(25, 0, 0.2, 1, 0), (25, 80, 0.2, 0, 1), (100, 20, 0.45, 0, 0)]
+        scenario = {
+            "name": "edge",
+            "total_vram_gb": 80,
+            "gpus": [
+                {"id": i, "gpu_util": u, "vram_used_gb": v, "network_io_score": n, "numa_node": a, "cpu_socket": b, "nvlink_group": "A"}
+                for i, (u, v, n, a, b) in enumerate(rows)
+            ],
+        }
+        result = calculate_fleet_scores(build_gpu_table({"edge": scenario}))
+        self.assert_matches(calculate_efficiency_score(scenario), result.hosts["edge"])
+        self.assert_matches(calculate_efficiency_score(scenario), result.fleet)
+
+    def test_missing_column_raises_value_error(self):
+        table = build_gpu_table(sample_scenarios())
+        del table["network_io_score"]
+        with self.assertRaises(ValueError):
+            calculate_fleet_scores(table)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import random
+import time
+import unittest
+from itertools import combinations
+
+from infralens.data import Workload
+from infralens.gpu_subset import GpuSubsetSearch
+from infralens.placement import solve_placement
+from infralens.rules import build_placement_recommendation
+
+
+def _search(penalty, numa, util, mismatch=None):
+    n = len(numa)
+    return GpuSubsetSearch(
+        penalty,
+        numa=numa,
+        util=util,
+        mismatch=mismatch or [False] * n,
+        span_weight=10.0,
+        numa_weight=2.0,
+        util_weight=1.0,
+        mismatch_weight=0.5,
+    )
+
+
+def _islands(n, size):
+    return [[0.0 if i == j or i // size == j // size else 0.97 for j in range(n)] for i in range(n)]
+
+
+class GpuSubsetSearchTests(unittest.TestCase):
+    def test_matches_brute_force_on_random_hosts(self):
+        rng = random.Random(22)
+        for _ in range(300):
+            n = rng.randint(1, 12)
+            k = rng.randint(1, n)
+            penalty = [[0.0] * n for _ in range(n)]
+            for i, j in combinations(range(n), 2):
+                penalty[i][j] = penalty[j][i] = rng.choice([0.0, 0.0, 0.5, 0.9, 0.97])
+            search = _search(
+                penalty,
+                [rng.randint(0, 2) for _ in range(n)],
+                [rng.choice([0, 10, 50, 90]) for _ in range(n)],
+                [rng.random() < 0.2 for _ in range(n)],
+            )
+            pool = sorted(rng.sample(range(n), rng.randint(k, n)))
+            result = search.solve(k, pool)
+            expected = min(search.cost(c) for c in combinations(pool, k))
+            self.assertTrue(result.optimal)
+            self.assertEqual(len(result.members), k)
+            self.assertTrue(set(result.members) <= set(pool))
+            self.assertAlmostEqual(result.cost, expected, places=9)
+
+    def test_prefers_idle_connected_gpus_on_one_numa_node(self):
+        # Quads 0-3 / 4-7 on NUMA 0 / 1; GPU 1 is busy.
+        search = _search(_islands(8, 4), [0] * 4 + [1] * 4, [5, 95, 5, 5, 0, 0, 0, 40])
+        self.assertEqual(search.solve(3, range(8)).members, (4, 5, 6))
+        self.assertEqual(search.solve(3, [0, 1, 2, 3, 7]).members, (0, 2, 3))
+
+    def test_twins_and_memo_keep_repeat_queries_cheap(self):
+        search = _search(_islands(8, 8), [0] * 8, [0.0] * 8)
+        self.assertEqual(len(set(search.twin)), 1)
+        first = search.solve(4, range(8))
+        self.assertLessEqual(first.nodes_explored, 8)
+        self.assertIs(search.solve(4, list(reversed(range(8)))), first)
+        self.assertIsNone(search.solve(9, range(8)))
+
+    def test_large_domain_is_time_bounded(self):
+        rng = random.Random(64)
+        n = 128
+        penalty = [[0.0 if i == j or i // 8 == j // 8 else (0.6 if i // 64 == j // 64 else 0.97) for j in range(n)] for i in range(n)]
+        search = _search(penalty, [i // 64 for i in range(n)], [rng.uniform(0, 100) for _ in range(n)])
+        t0 = time.perf_counter()
+        result = search.solve(24, range(n), time_budget_sec=0.02)
+        elapsed = time.perf_counter() - t0
+        self.assertEqual(len(result.members), 24)
+        self.assertLess(elapsed, 0.5)
+        self.assertEqual(len({i // 64 for i in result.members}), 1)
+
+    def test_placement_item_reports_link_metrics(self):
+        gpus = [
+            {
+                "id": i,
+                "gpu_util": [90, 10, 10, 10, 10, 10, 10, 10][i],
+                "vram_used_gb": 10.0,
+                "network_io_score": 0.8,
+                "numa_node": i // 4,
+                "cpu_socket": i // 4,
+                "nvlink_group": "A",
+            }
+            for i in range(8)
+        ]
+        links = [["X" if i == j else ("NV12" if i // 4 == j // 4 else "SYS") for j in range(8)] for i in range(8)]
+        scenario = {
+            "name": "h",
+            "total_vram_gb": 80,
+            "gpus": gpus,
+            "topology": {"gpu_ids": list(range(8)), "links": links, "numa": [i // 4 for i in range(8)]},
+        }
+        job = Workload(name="train", kind="training", gpu_demand=4, vram_gb=160)
+        self.assertEqual(solve_placement(scenario, [job]).assignments[0].gpu_ids, [4, 5, 6, 7])
+        item = build_placement_recommendation(scenario, [job], current_score=60).items[0]
+        self.assertEqual(item.code, "move_training_nvlink")
+        self.assertEqual(item.data["target_gpus"], [4, 5, 6, 7])
+        self.assertEqual(item.data["aggregate_bandwidth_gbps"], 6 * 300.0)
+        self.assertEqual(item.data["min_link_gbps"], 300.0)
+        self.assertEqual(item.data["numa_nodes"], [1])
+        self.assertEqual(item.data["mean_util"], 10.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import ast
+import re
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+
+# Cumulative `-X importtime` budget for the lightweight modules. pandas alone
+# is several hundred ms, so pulling it (or numpy/fpdf) back in blows this.
+IMPORT_BUDGET_SEC = 0.25
+HEAVY_MODULES = ("pandas", "numpy", "fpdf", "openai", "anthropic", "google.generativeai", "streamlit")
+LIGHT_MODULES = (
+    "infralens.scoring",
+    "infralens.rules",
+    "infralens.parsers",
+    "infralens.report",
+    "infralens.llm",
+    "infralens.pipeline",
+    "infralens.cli",
+)
+
+
+def _import_profile(module: str) -> tuple[float, list[str]]:
+    probe = f"import sys, {module}; print([m for m in {HEAVY_MODULES!r} if m in sys.modules])"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=str(ROOT_DIR),
+    )
+    cumulative_us = 0
+    for line in proc.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|\s*(\S+)$", line)
+        if match and match.group(2) == module:
+            cumulative_us = int(match.group(1))
+    loaded = ast.literal_eval(proc.stdout.strip().splitlines()[-1])
+    return cumulative_us / 1e6, loaded
+
+
+class ImportTimeTests(unittest.TestCase):
+    def test_light_modules_do_not_load_heavy_dependencies(self):
+        for module in LIGHT_MODULES:
+            with self.subTest(module=module):
+                _, loaded = _import_profile(module)
+                self.assertEqual(loaded, [], f"{module} imports {loaded} at module load")
+
+    def test_scoring_import_time_budget(self):
+        # Best of three to keep scheduler noise out of the measurement.
+        elapsed = min(_import_profile("infralens.scoring")[0] for _ in range(3))
+        self.assertGreater(elapsed, 0.0)
+        self.assertLess(elapsed, IMPORT_BUDGET_SEC, f"import infralens.scoring took {elapsed * 1000:.1f}ms")
+
+    def test_heavy_dependencies_load_on_first_use(self):
+        probe = (
+            "import sys\n"
+            "import infralens.report as report\n"
+            "before = 'fpdf' in sys.modules\n"
+            "base = report.PDFReport.__mro__[1].__module__.split('.')[0]\n"
+            "print(before, 'fpdf' in sys.modules, base)\n"
+        )
+        proc = subprocess.run(
+            [sys.executable, "-c", probe], capture_output=True, text=True, check=True, cwd=str(ROOT_DIR)
+        )
+        self.assertEqual(proc.stdout.split(), ["False", "True", "fpdf"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+import asyncio
+import sys
+import threading
+import time
+import types
+import unittest
+from unittest.mock import patch
+
+from infralens import llm
+from infralens.rules import Finding, PlacementItem, RecommendationResult
+
+
+def _inputs():
+    findings = [Finding(category="NUMA", severity="high", message="GPU 1 mismatch", code="numa_mismatch")]
+    rec = RecommendationResult(
+        items=[PlacementItem(workload="train", action="Move to GPUs [0, 1]")],
+        expected_util_before=50,
+        expected_util_after=80,
+        expected_training_gain_pct=35,
+        expected_latency_drop_pct=20,
+    )
+    return findings, rec
+
+
+class StubProvider:
+    def __init__(self, delay: float = 0.0, slow_marker: str | None = None):
+        self.delay = delay
+        self.slow_marker = slow_marker
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, provider, api_key, model, prompt):
+        with self._lock:
+            self.calls += 1
+        delay = self.delay
+        if self.slow_marker and self.slow_marker in prompt:
+            delay = 1.0
+        time.sleep(delay)
+        return f"stub:{model}:{prompt.split('.')[0]}"
+
+
+class AsyncNarrativeTests(unittest.TestCase):
+    def setUp(self):
+        env = patch.dict("os.environ", {"INFRALENS_NARRATIVE_CACHE": "off"})
+        env.start()
+        self.addCleanup(env.stop)
+
+    def test_prompts_run_concurrently(self):
+        findings, rec = _inputs()
+        stub = StubProvider(delay=0.3)
+        with patch("infralens.llm._invoke_model", side_effect=stub):
+            t0 = time.perf_counter()
+            (analysis, a_src), (narrative, r_src) = llm.generate_narratives(
+                findings, 70, "C", rec, language="en", api_key="k", model="m"
+            )
+            elapsed = time.perf_counter() - t0
+        self.assertEqual(stub.calls, 2)
+        self.assertLess(elapsed, 0.55)
+        self.assertEqual((a_src, r_src), ("openai", "openai"))
+        self.assertIn("optimization expert", analysis)
+        self.assertIn("infra architect", narrative)
+
+    def test_deadline_falls_back_per_call(self):
+        findings, rec = _inputs()
+        stub = StubProvider(delay=0.0, slow_marker="infra architect")
+        with patch("infralens.llm._invoke_model", side_effect=stub):
+            t0 = time.perf_counter()
+            (analysis, a_src), (narrative, r_src) = llm.generate_narratives(
+                findings, 70, "C", rec, language="en", api_key="k", timeout_sec=0.2
+            )
+            elapsed = time.perf_counter() - t0
+        self.assertLess(elapsed, 0.6)
+        self.assertEqual(a_src, "openai")
+        self.assertEqual(r_src, "fallback:openai:timeout")
+        self.assertEqual(narrative, llm._fallback_recommendation_text(rec, "en"))
+
+    def test_missing_key_and_errors_use_fallback(self):
+        findings, rec = _inputs()
+        with patch.dict("os.environ", {"OPENAI_API_KEY": ""}):
+            (analysis, a_src), _ = llm.generate_narratives(findings, 70, "C", rec, language="en")
+        self.assertEqual(a_src, "fallback:openai:missing_api_key")
+        self.assertEqual(analysis, llm._fallback_analysis_text(findings, 70, "C", "en"))
+
+        with patch("infralens.llm._invoke_model", side_effect=RuntimeError("boom")):
+            _, (_, r_src) = llm.generate_narratives(findings, 70, "C", rec, api_key="k")
+        self.assertEqual(r_src, "fallback:openai:RuntimeError")
+
+    def test_works_inside_running_event_loop(self):
+        findings, rec = _inputs()
+
+        async def _run():
+            return llm.generate_narratives(findings, 70, "C", rec, api_key="k")
+
+        with patch("infralens.llm._invoke_model", side_effect=StubProvider()):
+            (_, a_src), _ = asyncio.run(_run())
+        self.assertEqual(a_src, "openai")
+
+    def test_clients_are_pooled_per_provider_and_key(self):
+        built = []
+
+        def _fake_build(provider, api_key):
+            built.append((provider, api_key))
+            return object()
+
+        llm.clear_client_pool()
+        with patch("infralens.llm._build_client", side_effect=_fake_build):
+            first = llm._get_client("openai", "k1")
+            self.assertIs(llm._get_client("openai", "k1"), first)
+            llm._get_client("anthropic", "k1")
+        llm.clear_client_pool()
+        self.assertEqual(built, [("openai", "k1"), ("anthropic", "k1")])
+
+    def test_google_calls_use_their_own_key(self):
+        state = {"key": None}
+        seen = []
+
+        class _Model:
+            def __init__(self, name):
+                self.name = name
+
+            def generate_content(self, prompt):
+                seen.append((prompt, state["key"]))
+                return types.SimpleNamespace(text=f"ok:{self.name}")
+
+        genai = types.ModuleType("google.generativeai")
+        genai.configure = lambda api_key: state.update(key=api_key)
+        genai.GenerativeModel = _Model
+        genai.list_models = lambda: [types.SimpleNamespace(name=state["key"])]
+        google = types.ModuleType("google")
+        google.generativeai = genai
+
+        llm.clear_client_pool()
+        with patch.dict(sys.modules, {"google": google, "google.generativeai": genai}):
+            for key in ("key-a", "key-b", "key-a"):
+                self.assertEqual(llm._invoke_model("google", key, "gemini-x", f"from {key}"), "ok:gemini-x")
+            listed = [m.name for m in llm._get_client("google", "key-b").list_models()]
+        llm.clear_client_pool()
+        self.assertEqual(seen, [("from key-a", "key-a"), ("from key-b", "key-b"), ("from key-a", "key-a")])
+        self.assertEqual(listed, ["key-b"])
+
+
+if __name__ == "__main__":
+    unittest.main()
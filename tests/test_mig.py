@@ -0,0 +1,140 @@
+import random
+import time
+import unittest
+from unittest.mock import patch
+
+from infralens.commands import build_execution_templates
+from infralens.data import Workload, sample_scenarios, workloads_for_scenario
+from infralens.mig import (
+    MIG_PROFILES,
+    MigProfile,
+    compute_fraction_of,
+    mig_model_for,
+    plan_mig,
+    plan_mig_partitions,
+    profile_for,
+)
+from infralens.parsers import parse_uploaded_telemetry
+from infralens.rules import build_placement_recommendation
+
+
+def _host(model: str, total: float, gpus: int = 8, utils=None) -> dict:
+    return {
+        "name": "host",
+        "model": model,
+        "total_vram_gb": total,
+        "gpus": [
+            {"id": i, "gpu_util": (utils or [10.0] * gpus)[i], "numa_node": i * 2 // gpus, "cpu_socket": i * 2 // gpus}
+            for i in range(gpus)
+        ],
+    }
+
+
+def _jobs(*sizes):
+    return [Workload(name=f"inf-{i}", kind="inference", gpu_demand=1, vram_gb=v) for i, v in enumerate(sizes)]
+
+
+class MigPlannerTests(unittest.TestCase):
+    def assert_legal(self, plan):
+        for layout in plan.layouts:
+            by_name = {p.name: p for p in MIG_PROFILES[layout.model]}
+            used = 0
+            for inst in layout.instances:
+                placement = next(pl for pl in by_name[inst.profile].placements if (pl & -pl).bit_length() - 1 == inst.start)
+                self.assertFalse(used & placement)
+                used |= placement
+            self.assertEqual(used, layout.used_mask)
+            self.assertLessEqual(sum(by_name[i.profile].compute_slices for i in layout.instances), 7)
+
+    def test_model_detection_and_profile_choice(self):
+        self.assertEqual(mig_model_for(sample_scenarios()["H200 8-GPU Server"]), "H200-141GB")
+        self.assertEqual(mig_model_for({"model": "A100-SXM", "total_vram_gb": 40}), "A100-40GB")
+        self.assertIsNone(mig_model_for(sample_scenarios()["L40s 4-GPU Server"]))
+        self.assertEqual(profile_for("H100-80GB", 12).name, "1g.20gb")
+        self.assertEqual(profile_for("H100-80GB", 40).name, "3g.40gb")
+        self.assertEqual(profile_for("A100-40GB", 5).name, "1g.5gb")
+        self.assertIsNone(profile_for("H100-80GB", 90))
+
+    def test_fills_one_gpu_with_legal_mixed_layout(self):
+        # 3g + 2g + 1g + 1g uses all eight memory slices only if the 3g sits
+        # at start 4, whatever order the jobs arrive in.
+        plan = plan_mig(_host("H100-SXM", 80), _jobs(8, 35, 20, 9))
+        self.assertEqual(plan.gpus_used, 1)
+        self.assertTrue(plan.optimal)
+        self.assert_legal(plan)
+        self.assertEqual(sorted(plan.layouts[0].profiles), ["1g.10gb", "1g.10gb", "1g.20gb", "3g.40gb"])
+        seven = plan_mig(_host("H100-SXM", 80), _jobs(*[10] * 8))
+        self.assertEqual([len(l.instances) for l in seven.layouts], [7, 1])
+
+    def test_reserved_and_unsupported_gpus_are_skipped(self):
+        plan = plan_mig(_host("A100-SXM", 80, gpus=3, utils=[5.0, 50.0, 20.0]), _jobs(40, 90, 10), reserved_gpus=[0])
+        self.assertEqual({inst.gpu_id for inst in plan.instances.values()}, {2})
+        self.assertEqual(plan.unplaced, ["inf-1"])
+        l4 = plan_mig(sample_scenarios()["SMB Starter - L4 1-GPU Inference"], _jobs(8))
+        self.assertEqual((l4.gpus_used, l4.unplaced), (0, ["inf-0"]))
+
+    def test_fleet_of_hundreds_of_gpus_is_fast_and_dense(self):
+        rng = random.Random(23)
+        models = [("H100-SXM", 80), ("H200-SXM", 141), ("A100-SXM", 80), ("A100-PCIe", 40)]
+        scenarios = {}
+        for h in range(80):
+            model, total = rng.choice(models)
+            scenarios[f"node-{h:03d}"] = _host(model, total, utils=[rng.uniform(0, 100) for _ in range(8)])
+        jobs = _jobs(*[rng.choice([4, 8, 10, 16, 24, 35, 40, 70]) for _ in range(1500)])
+        t0 = time.perf_counter()
+        plan = plan_mig_partitions(scenarios, jobs)
+        self.assertLess(time.perf_counter() - t0, 0.5)
+        self.assertEqual(plan.unplaced, [])
+        self.assertLessEqual(plan.gpus_used, 640)
+        self.assert_legal(plan)
+
+        h100 = {f"node-{h:03d}": _host("H100-SXM", 80) for h in range(80)}
+        dense = plan_mig_partitions(h100, jobs[:1000])
+        self.assertEqual(dense.unplaced, [])
+        self.assertLessEqual(dense.gpus_used, dense.lower_bound * 1.03)
+
+    def test_recommendation_emits_layouts_and_mig_templates(self):
+        name = "Mid-Market Training - H100 8-GPU"
+        scenario = sample_scenarios()[name]
+        workloads = workloads_for_scenario(name)
+        rec = build_placement_recommendation(scenario, workloads, 60)
+        mig_items = [i for i in rec.items if i.code == "consolidate_inference_mig"]
+        self.assertEqual(len(mig_items), 2)
+        training = {g for i in rec.items if i.code == "move_training_nvlink" for g in i.data["target_gpus"]}
+        self.assertNotIn(mig_items[0].data["host_gpu"], training)
+        self.assertEqual(len(rec.mig_layouts), 1)
+        layout = rec.mig_layouts[0]
+        self.assertEqual(sorted(layout["profiles"]), sorted(i.data["profile"] for i in mig_items))
+        self.assertIn("-cgi", layout["commands"][-1])
+        vram = {w.name: w.vram_gb for w in workloads}
+        for i in mig_items:
+            self.assertEqual(layout["profiles"][i.data["mig_index"]], i.data["profile"])
+            self.assertGreaterEqual(profile_for("H100-80GB", vram[i.workload]).memory_gb, vram[i.workload])
+
+        templates = {t.workload: t for t in build_execution_templates(scenario, workloads, rec)}
+        item = mig_items[0]
+        docker = templates[item.workload].docker_cmd
+        self.assertIn(f'--gpus "device={item.data["host_gpu"]}:{item.data["mig_index"]}"', docker)
+        self.assertIn(f"# MIG profile: {item.data['profile']}", docker)
+
+    def test_compute_fraction_follows_the_model_catalog(self):
+        self.assertAlmostEqual(compute_fraction_of("3g.40gb", "H100-80GB"), 3 / 7)
+        small = (MigProfile("1g.6gb", 1, 6, (0b1,)), MigProfile("4g.24gb", 4, 24, (0b1111,)))
+        with patch.dict(MIG_PROFILES, {"T-24GB": small}):
+            self.assertEqual(compute_fraction_of("1g.6gb", "T-24GB"), 0.25)
+
+    def test_uploaded_nvidia_smi_csv_reaches_a_mig_layout(self):
+        header = "index, name, utilization.gpu [%], memory.used [MiB], memory.total [MiB]\n"
+        rows = "".join(f"{i}, NVIDIA H100 80GB HBM3, 10 %, 1024 MiB, 81559 MiB\n" for i in range(4))
+        scenario = parse_uploaded_telemetry("nvidia_smi.csv", (header + rows).encode())
+        self.assertEqual(scenario["model"], "NVIDIA H100 80GB HBM3")
+        self.assertEqual(mig_model_for(scenario), "H100-80GB")
+        rec = build_placement_recommendation(scenario, _jobs(10, 20), 60)
+        self.assertEqual(len(rec.mig_layouts), 1)
+        self.assertEqual(rec.mig_layouts[0]["model"], "H100-80GB")
+        docker = build_execution_templates(scenario, _jobs(10, 20), rec)[0].docker_cmd
+        self.assertIn(f'--gpus "device={rec.mig_layouts[0]["gpu_id"]}:', docker)
+
+
+if __name__ == "__main__":
+    unittest.main()
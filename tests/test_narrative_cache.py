@@ -0,0 +1,115 @@
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from infralens import llm
+from infralens.rules import Finding, PlacementItem, RecommendationResult
+
+
+def _findings(util: int = 40):
+    return [
+        Finding(
+            category="GPU_UTIL",
+            severity="medium",
+            message="localized text",
+            code="low_gpu_util",
+            data={"count": 2, "threshold": util},
+        )
+    ]
+
+
+def _rec():
+    return RecommendationResult(
+        items=[PlacementItem(workload="train", action="Move", code="move_training_nvlink", data={"target_gpus": [0, 1]})],
+        expected_util_before=50,
+        expected_util_after=80,
+        expected_training_gain_pct=35,
+        expected_latency_drop_pct=20,
+    )
+
+
+class NarrativeCacheTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.cache = llm.NarrativeCache(Path(self._tmp.name) / "n.sqlite3", ttl_sec=60, max_entries=3)
+
+    def test_analysis_hit_and_miss_are_reported(self):
+        with patch("infralens.llm._invoke_model", return_value="llm text") as invoke:
+            first = llm.generate_bottleneck_analysis(_findings(), 60, "C", "en", api_key="k", cache=self.cache)
+            second = llm.generate_bottleneck_analysis(_findings(), 60, "C", "en", api_key="k", cache=self.cache)
+            other_lang = llm.generate_bottleneck_analysis(_findings(), 60, "C", "ko", api_key="k", cache=self.cache)
+            other_model = llm.generate_bottleneck_analysis(
+                _findings(), 60, "C", "en", api_key="k", model="gpt-4o", cache=self.cache
+            )
+        self.assertEqual(first, ("llm text", "openai:cache_miss"))
+        self.assertEqual(second, ("llm text", "openai:cache_hit"))
+        self.assertEqual(other_lang[1], "openai:cache_miss")
+        self.assertEqual(other_model[1], "openai:cache_miss")
+        self.assertEqual(invoke.call_count, 3)
+
+    def test_key_follows_rendered_messages_and_actions(self):
+        # Site rules may put their only variable part in the message.
+        with patch("infralens.llm._invoke_model", side_effect=["two", "three"]) as invoke:
+            first = _findings(40)
+            first[0].message = "2 GPUs span NVLink groups"
+            second = _findings(40)
+            second[0].message = "3 GPUs span NVLink groups"
+            a = llm.generate_bottleneck_analysis(first, 60, "C", "en", api_key="k", cache=self.cache)
+            b = llm.generate_bottleneck_analysis(second, 60, "C", "en", api_key="k", cache=self.cache)
+        self.assertEqual((a[0], b[0]), ("two", "three"))
+        self.assertEqual(invoke.call_count, 2)
+
+        moved = _rec()
+        moved.items[0].action = "Move to GPU 2,3"
+        keys = {
+            llm.narrative_cache_key("recommendation", llm._prompt_cache_inputs(llm._recommendation_prompt(r, "en")), "openai", "m")
+            for r in (_rec(), moved)
+        }
+        self.assertEqual(len(keys), 2)
+
+    def test_recommendation_and_async_paths_share_the_cache(self):
+        with patch("infralens.llm._invoke_model", return_value="rec text") as invoke:
+            first = llm.generate_recommendation_narrative(_rec(), "en", api_key="k", cache=self.cache)
+            (_, a_src), (rec_text, r_src) = llm.generate_narratives(
+                _findings(), 60, "C", _rec(), language="en", api_key="k", cache=self.cache
+            )
+        self.assertEqual(first[1], "openai:cache_miss")
+        self.assertEqual((rec_text, r_src), ("rec text", "openai:cache_hit"))
+        self.assertEqual(a_src, "openai:cache_miss")
+        self.assertEqual(invoke.call_count, 2)
+
+    def test_fallbacks_are_not_cached(self):
+        with patch("infralens.llm._invoke_model", side_effect=RuntimeError("down")):
+            _, source = llm.generate_bottleneck_analysis(_findings(), 60, "C", "en", api_key="k", cache=self.cache)
+        self.assertEqual(source, "fallback:openai:RuntimeError")
+        self.assertEqual(len(self.cache), 0)
+
+    def test_ttl_expiry_and_lru_eviction(self):
+        for key in ("a", "b", "c"):
+            self.cache.put(key, key)
+            time.sleep(0.01)
+        self.cache.get("a")
+        time.sleep(0.01)
+        self.cache.put("d", "d")
+        self.assertEqual(len(self.cache), 3)
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(self.cache.get("a"), "a")
+
+        expired = llm.NarrativeCache(Path(self._tmp.name) / "ttl.sqlite3", ttl_sec=0.0)
+        expired.put("x", "value")
+        time.sleep(0.01)
+        self.assertIsNone(expired.get("x"))
+
+    def test_default_cache_can_be_disabled_by_env(self):
+        with patch.dict("os.environ", {"INFRALENS_NARRATIVE_CACHE": "off"}):
+            self.assertIsNone(llm.default_narrative_cache())
+        path = str(Path(self._tmp.name) / "default.sqlite3")
+        with patch.dict("os.environ", {"INFRALENS_NARRATIVE_CACHE": path}):
+            self.assertEqual(str(llm.default_narrative_cache().path), path)
+
+
+if __name__ == "__main__":
+    unittest.main()
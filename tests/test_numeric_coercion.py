@@ -0,0 +1,94 @@
+import math
+import random
+import struct
+import unittest
+
+from infralens.parsers import _to_float, _to_float_array
+
+SAMPLES = [
+    "",
+    " ",
+    "0",
+    "-0",
+    "42",
+    "007",
+    "3.14",
+    ".5",
+    "1.",
+    "-.5",
+    "88 %",
+    "70200 MiB",
+    "70,200 MiB",
+    "1,234,567.89",
+    "[N/A]",
+    "N/A",
+    "[Not Supported]",
+    "-",
+    ".",
+    "--1",
+    "1-2",
+    "1.2.3",
+    "1e5",
+    "2.5E-3",
+    "nan",
+    "inf",
+    "+7",
+    " 12 W ",
+    "0x1F",
+    "٣",  # non-ASCII digit is stripped like any other symbol
+    "1" * 400,
+    "GPU-3",
+    "00000000:1B:00.0",
+]
+
+
+def _same(a, b):
+    if a is None or (isinstance(a, float) and math.isnan(a)):
+        return b is None or (isinstance(b, float) and math.isnan(b))
+    if b is None:
+        return False
+    return struct.pack("<d", a) == struct.pack("<d", float(b))
+
+
+def _random_cell(rng):
+    alphabet = "0123456789.,-+ %[]/NAMiBWe\t"
+    return "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 10)))
+
+
+class NumericCoercionParityTests(unittest.TestCase):
+    def assertParity(self, values):
+        got = _to_float_array(values).tolist()
+        self.assertEqual(len(got), len(values))
+        for value, number in zip(values, got):
+            expected = _to_float(value)
+            self.assertTrue(_same(expected, number), f"{value!r}: scalar={expected!r} vector={number!r}")
+
+    def test_known_cells(self):
+        self.assertParity(SAMPLES)
+
+    def test_each_cell_alone(self):
+        # Bulk conversion must not depend on neighbours (fallback path per cell).
+        for value in SAMPLES:
+            self.assertParity([value])
+            self.assertParity([value, "12 MiB"])
+
+    def test_random_cells(self):
+        rng = random.Random(18)
+        for _ in range(200):
+            self.assertParity([_random_cell(rng) for _ in range(rng.randint(1, 50))])
+
+    def test_random_decimals_round_identically(self):
+        rng = random.Random(19)
+        values = [f"{rng.uniform(-1e6, 1e6):.{rng.randint(0, 17)}f} MiB" for _ in range(5000)]
+        self.assertParity(values)
+
+    def test_non_string_and_multiline_inputs(self):
+        self.assertParity([1, 2.5, None, "3 %", float("nan")])
+        self.assertParity(["10\n20", "5 MiB", ""])
+
+    def test_empty_column(self):
+        self.assertEqual(_to_float_array([]).shape, (0,))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from infralens import parse_cache
+from infralens.parse_cache import TelemetryParseCache, parse_uploaded_telemetry_cached, telemetry_cache_key
+from infralens.parsers import parse_uploaded_telemetry
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+EXAMPLES = ROOT_DIR / "examples"
+
+
+class TelemetryParseCacheTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.cache = TelemetryParseCache(Path(self._tmp.name) / "telemetry")
+        self.raw = (EXAMPLES / "nvidia_smi_sample.csv").read_bytes()
+
+    def test_hit_returns_identical_scenario(self):
+        expected = parse_uploaded_telemetry("node.csv", self.raw)
+        first = parse_uploaded_telemetry_cached("node.csv", self.raw, cache=self.cache)
+        with patch("infralens.parse_cache.parse_uploaded_telemetry") as parse:
+            second = parse_uploaded_telemetry_cached("node.csv", self.raw, cache=self.cache)
+        parse.assert_not_called()
+        self.assertEqual(first, expected)
+        self.assertEqual(second, expected)
+        self.assertEqual([type(v) for v in second["gpus"][0].values()], [type(v) for v in expected["gpus"][0].values()])
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_hit_is_a_fresh_copy(self):
+        parse_uploaded_telemetry_cached("node.csv", self.raw, cache=self.cache)
+        scenario = parse_uploaded_telemetry_cached("node.csv", self.raw, cache=self.cache)
+        scenario["gpus"][0]["gpu_util"] = -1
+        again = parse_uploaded_telemetry_cached("node.csv", self.raw, cache=self.cache)
+        self.assertNotEqual(again["gpus"][0]["gpu_util"], -1)
+
+    def test_key_covers_bytes_name_and_topology_inputs(self):
+        base = telemetry_cache_key("a.csv", self.raw)
+        self.assertEqual(base, telemetry_cache_key("a.csv", bytes(self.raw)))
+        self.assertNotEqual(base, telemetry_cache_key("b.csv", self.raw))
+        self.assertNotEqual(base, telemetry_cache_key("a.csv", self.raw + b"\n"))
+        self.assertNotEqual(base, telemetry_cache_key("a.csv", self.raw, topo_text=""))
+        self.assertNotEqual(
+            telemetry_cache_key("a.csv", self.raw, topo_text="x", numactl_text="y"),
+            telemetry_cache_key("a.csv", self.raw, topo_text="xy", numactl_text=""),
+        )
+
+    def test_size_bound_evicts_least_recently_used(self):
+        cache = TelemetryParseCache(Path(self._tmp.name) / "small", max_bytes=10**9)
+        for i in range(3):
+            parse_uploaded_telemetry_cached(f"n{i}.csv", self.raw, cache=cache)
+        keys = {i: telemetry_cache_key(f"n{i}.csv", self.raw) for i in range(3)}
+        for i, key in keys.items():
+            meta = cache.path / f"{key}.json"
+            os.utime(meta, (1000 + i, 1000 + i))
+        cache.get(keys[0])  # touch: n1 becomes the oldest entry
+        entry_size = cache.size_bytes() // 3
+        cache.max_bytes = entry_size * 2
+        self.assertEqual(cache.evict(), 1)
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertIsNotNone(cache.get(keys[0]))
+        self.assertIsNotNone(cache.get(keys[2]))
+
+    def test_corrupt_or_partial_entries_are_misses(self):
+        parse_uploaded_telemetry_cached("node.csv", self.raw, cache=self.cache)
+        key = telemetry_cache_key("node.csv", self.raw)
+        (self.cache.path / f"{key}.npy").write_bytes(b"garbage")
+        self.assertIsNone(self.cache.get(key))
+        (self.cache.path / f"{key}.json").unlink()
+        self.assertIsNone(self.cache.get(key))
+        self.assertEqual(
+            parse_uploaded_telemetry_cached("node.csv", self.raw, cache=self.cache),
+            parse_uploaded_telemetry("node.csv", self.raw),
+        )
+
+    def test_malformed_sidecar_is_a_miss(self):
+        expected = parse_uploaded_telemetry_cached("node.csv", self.raw, cache=self.cache)
+        key = telemetry_cache_key("node.csv", self.raw)
+        meta = self.cache.path / f"{key}.json"
+        for text in ('{"version": %d, "rows": 4}' % parse_cache.PARSE_CACHE_VERSION, "[1, 2]", '{"version": 1'):
+            meta.write_text(text)
+            self.assertIsNone(self.cache.get(key))
+        self.assertEqual(parse_uploaded_telemetry_cached("node.csv", self.raw, cache=self.cache), expected)
+
+    def test_unencodable_scenarios_are_not_stored(self):
+        scenario = {"name": "x", "total_vram_gb": 80, "gpus": [{"id": 0, "tags": ["a"]}]}
+        self.assertFalse(self.cache.put("k", scenario))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_env_switch_disables_default_cache(self):
+        with patch.dict(os.environ, {"INFRALENS_PARSE_CACHE": "off"}):
+            self.assertIsNone(parse_cache.default_parse_cache())
+        with patch.dict(os.environ, {"INFRALENS_PARSE_CACHE": str(Path(self._tmp.name) / "env")}):
+            cache = parse_cache.default_parse_cache()
+        self.assertEqual(cache.path, Path(self._tmp.name) / "env")
+
+
+if __name__ == "__main__":
+    unittest.main()
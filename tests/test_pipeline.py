@@ -0,0 +1,95 @@
+import copy
+import os
+import unittest
+from unittest.mock import patch
+
+from infralens.commands import ExecutionConfig, build_execution_templates
+from infralens.config import config_signature
+from infralens.data import default_workloads, sample_scenarios
+from infralens.pipeline import AnalysisPipeline, fingerprint
+
+
+class AnalysisPipelineTests(unittest.TestCase):
+    def setUp(self):
+        self._env = patch.dict(os.environ, {"INFRALENS_NARRATIVE_CACHE": "off"})
+        self._env.start()
+        self.scenario = copy.deepcopy(sample_scenarios()["H200 8-GPU Server"])
+        self.workloads = default_workloads()
+
+    def tearDown(self):
+        self._env.stop()
+
+    def test_fingerprint_is_stable_and_order_insensitive_for_dicts(self):
+        self.assertEqual(fingerprint({"a": 1, "b": [1, 2]}), fingerprint({"b": [1, 2], "a": 1}))
+        self.assertNotEqual(fingerprint(self.workloads), fingerprint(self.workloads[:-1]))
+
+    def test_second_run_with_same_inputs_reuses_every_stage(self):
+        pipeline = AnalysisPipeline()
+        first = pipeline.run(self.scenario, self.workloads, language="en")
+        self.assertEqual(
+            first.recomputed, ["profile", "score", "findings", "recommendation", "localized", "narratives"]
+        )
+
+        second = pipeline.run(copy.deepcopy(self.scenario), list(self.workloads), language="en")
+        self.assertEqual(second.recomputed, [])
+        self.assertEqual(second.score, first.score)
+        self.assertEqual(second.findings_raw, first.findings_raw)
+        self.assertEqual(second.recommendation_raw, first.recommendation_raw)
+
+    def test_mutating_a_result_does_not_poison_later_hits(self):
+        pipeline = AnalysisPipeline()
+        first = pipeline.run(self.scenario, self.workloads, language="en")
+        expected = copy.deepcopy(first.recommendation_raw)
+        first.recommendation_raw.items[0].data["target_gpus"] = [99]
+        first.findings_raw.clear()
+        second = pipeline.run(self.scenario, self.workloads, language="en")
+        self.assertEqual(second.recomputed, [])
+        self.assertEqual(second.recommendation_raw, expected)
+        self.assertTrue(second.findings_raw)
+
+    def test_rule_config_change_invalidates_scored_stages(self):
+        pipeline = AnalysisPipeline()
+        pipeline.run(self.scenario, self.workloads, language="en")
+        signature = config_signature()
+        signature["rule_thresholds"]["default"] = dict(signature["rule_thresholds"]["default"], low_util_threshold=99)
+        with patch("infralens.pipeline.config_signature", return_value=signature):
+            result = pipeline.run(self.scenario, self.workloads, language="en")
+        self.assertEqual(result.recomputed, ["score", "findings", "recommendation", "localized", "narratives"])
+
+    def test_language_change_only_recomputes_localized_stages(self):
+        pipeline = AnalysisPipeline()
+        first = pipeline.run(self.scenario, self.workloads, language="en")
+        second = pipeline.run(self.scenario, self.workloads, language="ko")
+        self.assertEqual(second.recomputed, ["localized", "narratives"])
+        self.assertEqual(second.recommendation_raw, first.recommendation_raw)
+        self.assertNotEqual(second.findings[0].message, first.findings[0].message)
+
+    def test_scenario_change_invalidates_downstream(self):
+        pipeline = AnalysisPipeline()
+        pipeline.run(self.scenario, self.workloads, language="en")
+        self.scenario["gpus"][0]["gpu_util"] = 1.0
+        result = pipeline.run(self.scenario, self.workloads, language="en")
+        self.assertEqual(result.recomputed[0], "score")
+        self.assertIn("findings", result.recomputed)
+
+    def test_execution_config_change_only_rebuilds_templates(self):
+        pipeline = AnalysisPipeline()
+        result = pipeline.run(self.scenario, self.workloads, language="en")
+        with patch("infralens.pipeline.build_execution_templates", wraps=build_execution_templates) as builder:
+            pipeline.templates(self.scenario, self.workloads, result, ExecutionConfig())
+            pipeline.templates(self.scenario, self.workloads, result, ExecutionConfig())
+            docker = pipeline.templates(self.scenario, self.workloads, result, ExecutionConfig(environment="docker"))
+        self.assertEqual(builder.call_count, 2)
+        self.assertTrue(docker[0].docker_cmd.startswith("docker run"))
+
+    def test_failed_provider_narratives_are_retried(self):
+        pipeline = AnalysisPipeline()
+        failed = (("fallback text", "fallback:openai:timeout"), ("fallback rec", "fallback:openai:timeout"))
+        with patch("infralens.pipeline.generate_narratives", return_value=failed) as gen:
+            pipeline.run(self.scenario, self.workloads, language="en", api_key="sk-test")
+            pipeline.run(self.scenario, self.workloads, language="en", api_key="sk-test")
+        self.assertEqual(gen.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
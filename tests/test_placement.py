@@ -0,0 +1,140 @@
+import random
+import time
+import unittest
+
+from infralens.data import Workload, default_workloads, sample_scenarios
+from infralens.i18n import localize_recommendation
+from infralens.placement import solve_fleet_placement, solve_placement
+from infralens.rules import build_placement_recommendation
+from infralens.synthetic import synthetic_fleet, synthetic_workloads
+
+
+def _host(gpu_count: int, capacity: float = 80) -> dict:
+    return {
+        "name": "host",
+        "total_vram_gb": capacity,
+        "gpus": [
+            {
+                "id": i,
+                "gpu_util": 40.0,
+                "vram_used_gb": 10.0,
+                "network_io_score": 0.8,
+                "numa_node": 0 if i < gpu_count // 2 else 1,
+                "cpu_socket": 0 if i < gpu_count // 2 else 1,
+                "nvlink_group": "A" if i < gpu_count // 2 else "B",
+            }
+            for i in range(gpu_count)
+        ],
+    }
+
+
+class PlacementSolverTests(unittest.TestCase):
+    def assert_conflict_free(self, plan, scenarios):
+        exclusive: set[tuple[str, int]] = set()
+        shared_load: dict[tuple[str, int], float] = {}
+        for a in plan.assignments:
+            for gpu_id in a.gpu_ids:
+                key = (a.host, gpu_id)
+                if len(a.gpu_ids) > 1 or a.kind == "training":
+                    self.assertNotIn(key, exclusive)
+                    self.assertNotIn(key, shared_load)
+                    exclusive.add(key)
+                else:
+                    self.assertNotIn(key, exclusive)
+                    shared_load[key] = shared_load.get(key, 0.0) + a.vram_per_gpu_gb
+                self.assertLessEqual(a.vram_per_gpu_gb, scenarios[a.host]["total_vram_gb"])
+        for (host, _), load in shared_load.items():
+            self.assertLessEqual(load, scenarios[host]["total_vram_gb"] + 1e-9)
+
+    def test_training_stays_inside_one_nvlink_group(self):
+        scenario = _host(8)
+        jobs = [
+            Workload(name="t4", kind="training", gpu_demand=4, vram_gb=80),
+            Workload(name="t2", kind="training", gpu_demand=2, vram_gb=40),
+        ]
+        plan = solve_placement(scenario, jobs)
+        groups = {g["id"]: g["nvlink_group"] for g in scenario["gpus"]}
+        self.assertEqual(plan.unplaced, [])
+        for a in plan.assignments:
+            self.assertEqual(len({groups[i] for i in a.gpu_ids}), 1)
+        self.assertFalse(set(plan.assignment_by_workload["t4"].gpu_ids) & set(plan.assignment_by_workload["t2"].gpu_ids))
+
+    def test_training_jobs_no_longer_share_the_primary_group(self):
+        scenario = sample_scenarios()["H200 8-GPU Server"]
+        plan = solve_placement(scenario, default_workloads())
+        used = [i for a in plan.assignments if a.kind == "training" for i in a.gpu_ids]
+        self.assertEqual(len(used), len(set(used)))
+        self.assertEqual(len(used), 8)
+
+    def test_inference_packing_respects_vram_capacity(self):
+        scenario = _host(2, capacity=24)
+        jobs = [Workload(name=f"inf-{i}", kind="inference", gpu_demand=1, vram_gb=10) for i in range(5)]
+        plan = solve_placement(scenario, jobs)
+        self.assertEqual(len(plan.assignments), 4)
+        self.assertEqual(len(plan.unplaced), 1)
+        self.assert_conflict_free(plan, {"host": scenario})
+
+    def test_unplaced_work_is_deferred_in_recommendation(self):
+        scenario = _host(2, capacity=24)
+        jobs = [Workload(name=f"inf-{i}", kind="inference", gpu_demand=1, vram_gb=20) for i in range(3)]
+        rec = build_placement_recommendation(scenario, jobs, current_score=60)
+        codes = [item.code for item in rec.items]
+        self.assertEqual(codes.count("consolidate_inference_mig"), 2)
+        self.assertEqual(codes.count("defer_unplaced"), 1)
+        hosts = {item.data["host_gpu"] for item in rec.items if item.code == "consolidate_inference_mig"}
+        self.assertEqual(hosts, {0, 1})
+        ko = localize_recommendation(rec, "ko")
+        self.assertIn("보류", ko.items[-1].action)
+
+    def test_job_larger_than_every_host_is_not_clipped(self):
+        scenario = sample_scenarios()["Mid-Market Training - H100 8-GPU"]
+        jobs = [
+            Workload(name="t16", kind="training", gpu_demand=16, vram_gb=160),
+            Workload(name="t2", kind="training", gpu_demand=2, vram_gb=40),
+        ]
+        plan = solve_placement(scenario, jobs)
+        self.assertEqual(plan.unplaced, ["t16"])
+        self.assertEqual(len(plan.assignment_by_workload["t2"].gpu_ids), 2)
+        rec = build_placement_recommendation(scenario, jobs, current_score=60)
+        codes = {item.workload: item.code for item in rec.items}
+        self.assertEqual(codes["t16"], "defer_unplaced")
+
+    def test_fleet_scale_within_time_budget(self):
+        rng = random.Random(7)
+        scenarios = {}
+        for h in range(100):
+            host = _host(8, capacity=rng.choice([48, 80, 141]))
+            for g in host["gpus"]:
+                g["gpu_util"] = round(rng.uniform(0, 100), 1)
+            scenarios[f"node-{h:03d}"] = host
+        jobs = []
+        for i in range(400):
+            if rng.random() < 0.4:
+                jobs.append(Workload(name=f"train-{i}", kind="training", gpu_demand=rng.choice([1, 2, 4, 8]), vram_gb=rng.choice([20, 60, 120])))
+            else:
+                jobs.append(Workload(name=f"infer-{i}", kind="inference", gpu_demand=1, vram_gb=rng.choice([6, 12, 24])))
+
+        t0 = time.perf_counter()
+        plan = solve_fleet_placement(scenarios, jobs, time_budget_sec=0.2)
+        elapsed = time.perf_counter() - t0
+
+        self.assertLess(elapsed, 5.0)
+        self.assertEqual(len(plan.assignments) + len(plan.unplaced), len(jobs))
+        self.assert_conflict_free(plan, scenarios)
+
+    def test_expired_budget_finishes_the_dive_first_fit(self):
+        fleet = synthetic_fleet(1024, seed=3)
+        jobs = synthetic_workloads(fleet, seed=3)
+        t0 = time.perf_counter()
+        rushed = solve_fleet_placement(fleet, jobs, time_budget_sec=0.0)
+        elapsed = time.perf_counter() - t0
+        searched = solve_fleet_placement(fleet, jobs, time_budget_sec=0.3)
+        self.assertFalse(rushed.search_complete)
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(rushed.unplaced, searched.unplaced)
+        self.assertLess(rushed.cost, searched.cost * 1.5)
+        self.assert_conflict_free(rushed, fleet)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import json
+import random
+import unittest
+
+from infralens.benchmark import percentile
+from infralens.metrics import measure_response_and_recommendation
+from infralens.quantiles import LatencyHistogram
+
+
+class LatencyHistogramTests(unittest.TestCase):
+    def test_quantiles_within_relative_error(self):
+        rng = random.Random(0)
+        values = [rng.lognormvariate(-6.0, 1.0) for _ in range(20000)]
+        hist = LatencyHistogram()
+        hist.record_many(values)
+        for q in (0.5, 0.95, 0.99):
+            exact = percentile(values, q)
+            self.assertAlmostEqual(hist.quantile(q), exact, delta=exact * 0.01)
+        self.assertEqual(hist.quantile(1.0), max(values))
+        self.assertEqual(hist.min, min(values))
+        self.assertAlmostEqual(hist.mean, sum(values) / len(values), places=9)
+
+    def test_memory_is_bounded_by_buckets(self):
+        hist = LatencyHistogram()
+        rng = random.Random(1)
+        for _ in range(50000):
+            hist.record(rng.uniform(0.001, 0.002))
+        self.assertEqual(hist.count, 50000)
+        self.assertLessEqual(len(hist.counts), 65)
+
+    def test_small_values_are_exact(self):
+        hist = LatencyHistogram(unit_sec=1.0)
+        hist.record_many([1, 2, 3, 4, 100])
+        self.assertEqual(hist.quantile(0.5), 3.0)
+        self.assertEqual(hist.quantile(0.8), 4.0)
+
+    def test_merge_matches_single_histogram(self):
+        rng = random.Random(2)
+        values = [rng.expovariate(200.0) for _ in range(3000)]
+        whole = LatencyHistogram()
+        whole.record_many(values)
+        parts = [LatencyHistogram() for _ in range(3)]
+        for i, v in enumerate(values):
+            parts[i % 3].record(v)
+        merged = LatencyHistogram.merged(parts)
+        self.assertEqual(merged.counts, whole.counts)
+        self.assertEqual(merged.summary(), whole.summary())
+        with self.assertRaises(ValueError):
+            merged.merge(LatencyHistogram(sub_bucket_bits=5))
+
+    def test_round_trips_through_json(self):
+        hist = LatencyHistogram()
+        hist.record_many([0.001, 0.002, 0.5])
+        restored = LatencyHistogram.from_dict(json.loads(json.dumps(hist.to_dict())))
+        self.assertEqual(restored.summary(), hist.summary())
+        self.assertEqual(list(restored.buckets()), list(hist.buckets()))
+
+    def test_empty_histogram(self):
+        hist = LatencyHistogram()
+        self.assertEqual(hist.quantile(0.95), 0.0)
+        self.assertEqual(hist.summary()["count"], 0)
+        self.assertTrue(hist)
+
+    def test_success_metrics_report_histograms(self):
+        result = measure_response_and_recommendation(iterations=1)
+        times = result["response_time_sec"]
+        for stage in ("score", "analysis_pipeline"):
+            self.assertLessEqual(times[f"{stage}_p50"], times[f"{stage}_p95"])
+            self.assertLessEqual(times[f"{stage}_p99"], times[f"{stage}_max"])
+            hist = LatencyHistogram.from_dict(result["latency_histograms"][stage])
+            self.assertGreater(hist.count, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
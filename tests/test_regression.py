@@ -0,0 +1,141 @@
+import json
+import random
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from infralens.quantiles import LatencyHistogram
+from infralens.regression import (
+    compare_runs,
+    compare_stage,
+    format_delta_table,
+    has_regression,
+    load_records,
+    pooled_samples,
+    select_phase,
+    stage_samples,
+)
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+
+
+def _noisy(center, n, seed, spread=0.03):
+    rng = random.Random(seed)
+    return [center * (1.0 + rng.uniform(-spread, spread)) for _ in range(n)]
+
+
+def _bench_record(phase, center, n=12, seed=0):
+    return {
+        "kind": "benchmark",
+        "phase": phase,
+        "results": [
+            {"stage": "score", "gpus": 64, "samples_sec": _noisy(center, n, seed)},
+            {"stage": "rules", "gpus": 64, "samples_sec": _noisy(0.002, n, seed + 1)},
+        ],
+    }
+
+
+class RegressionGateTests(unittest.TestCase):
+    def test_clear_slowdown_is_a_regression(self):
+        result = compare_stage("score", _noisy(0.010, 20, 1), _noisy(0.015, 20, 2), threshold=0.10)
+        self.assertEqual(result.status, "regression")
+        self.assertGreater(result.ci_low_pct, 10.0)
+        self.assertAlmostEqual(result.delta_pct, 50.0, delta=5.0)
+
+    def test_noise_within_threshold_passes(self):
+        result = compare_stage("score", _noisy(0.010, 20, 1, 0.2), _noisy(0.0105, 20, 2, 0.2), threshold=0.10)
+        self.assertEqual(result.status, "unchanged")
+        self.assertLessEqual(result.ci_low_pct, result.delta_pct)
+        self.assertGreaterEqual(result.ci_high_pct, result.delta_pct)
+
+    def test_speedup_and_small_samples(self):
+        self.assertEqual(compare_stage("s", _noisy(0.02, 10, 1), _noisy(0.01, 10, 2)).status, "improvement")
+        self.assertEqual(compare_stage("s", [0.01], [0.5]).status, "insufficient")
+
+    def test_bootstrap_is_seeded(self):
+        a, b = _noisy(0.01, 15, 1, 0.3), _noisy(0.011, 15, 2, 0.3)
+        self.assertEqual(compare_stage("s", a, b, seed=7), compare_stage("s", a, b, seed=7))
+
+    def test_benchmark_and_metric_records_yield_stage_samples(self):
+        bench = stage_samples(_bench_record("before", 0.01))
+        self.assertEqual(sorted(bench), ["rules@64", "score@64"])
+        self.assertEqual(len(bench["score@64"]), 12)
+
+        metric = {"phase": "after", "samples_sec": {"score": [0.1, 0.2], "analysis_pipeline": [0.3]}}
+        self.assertEqual(stage_samples(metric)["score"], [0.1, 0.2])
+        hist = LatencyHistogram()
+        hist.record_many([0.01, 0.01, 0.02])
+        histogram_record = {"phase": "after", "latency_histograms": {"score": hist.to_dict()}}
+        self.assertEqual(len(stage_samples(histogram_record)["score"]), 3)
+        legacy = {"phase": "after", "response_time_sec": {"score_avg": 0.1, "score_p95": 0.2}}
+        self.assertEqual(stage_samples(legacy), {"score": [0.1]})
+
+    def test_histograms_are_compared_by_bucket_counts(self):
+        def record(center, scale):
+            hist = LatencyHistogram()
+            for value in _noisy(center, 200, 3):
+                hist.record(value, count=scale)
+            return {"phase": "p", "latency_histograms": {"score": hist.to_dict()}}
+
+        # Five million samples per side would need gigabytes if expanded.
+        pooled = pooled_samples([record(0.010, 25_000), record(0.010, 25_000)])
+        slower = pooled_samples([record(0.013, 50_000)])
+        self.assertEqual(len(pooled["score"]), 10_000_000)
+        self.assertLess(len(pooled["score"].values), 500)
+        result = compare_stage("score", pooled["score"], slower["score"])
+        self.assertEqual(result.status, "regression")
+        self.assertEqual(result.baseline_n, 10_000_000)
+
+        small = pooled_samples([record(0.010, 1)])["score"]
+        expanded = [v for v, n in zip(small.values, small.counts) for _ in range(n)]
+        self.assertEqual(compare_stage("s", small, expanded, seed=3), compare_stage("s", expanded, expanded, seed=3))
+
+    def test_phase_selection_and_pooling(self):
+        records = [_bench_record("before", 0.01, seed=i) for i in range(3)] + [_bench_record("after", 0.01)]
+        self.assertEqual(len(select_phase(records, "before")), 1)
+        self.assertIs(select_phase(records, "before")[0], records[2])
+        pooled = pooled_samples(select_phase(records, "before", window=3))
+        self.assertEqual(len(pooled["score@64"]), 36)
+        self.assertEqual(select_phase(records, "missing"), [])
+
+    def test_compare_runs_only_common_stages_and_table(self):
+        baseline = {"a": _noisy(0.01, 10, 1), "b": _noisy(0.01, 10, 2)}
+        candidate = {"a": _noisy(0.02, 10, 3), "c": _noisy(0.01, 10, 4)}
+        comparisons = compare_runs(baseline, candidate)
+        self.assertEqual([c.stage for c in comparisons], ["a"])
+        self.assertTrue(has_regression(comparisons))
+        table = format_delta_table(comparisons)
+        self.assertIn("regression", table)
+        self.assertIn("a ", table.splitlines()[2])
+
+    def test_cli_exit_codes(self):
+        script = ROOT_DIR / "scripts" / "check_regression.py"
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "bench.jsonl"
+
+            def run(*records):
+                path.write_text("".join(json.dumps(r) + "\n" for r in records), encoding="utf-8")
+                return subprocess.run(
+                    [sys.executable, str(script), str(path), "--resamples", "200"],
+                    capture_output=True,
+                    text=True,
+                    check=False,
+                )
+
+            ok = run(_bench_record("before", 0.01, seed=1), _bench_record("after", 0.0101, seed=2))
+            self.assertEqual(ok.returncode, 0, ok.stderr)
+            self.assertIn("score@64", ok.stdout)
+
+            slow = run(_bench_record("before", 0.01, seed=1), _bench_record("after", 0.02, seed=2))
+            self.assertEqual(slow.returncode, 1)
+            self.assertIn("score@64", slow.stderr)
+
+            missing = run(_bench_record("before", 0.01))
+            self.assertEqual(missing.returncode, 2)
+            self.assertEqual(len(load_records(path)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,178 @@
+import random
+import unittest
+from collections import defaultdict
+from unittest.mock import patch
+
+from infralens.config import get_profile_map
+from infralens.data import Workload, default_workloads, sample_scenarios
+from infralens.rule_engine import compile_rules, reset_rule_timings, rule_timings
+from infralens.rules import detect_bottlenecks
+
+
+def _legacy_findings(scenario, workloads, profile):
+    # The hard-coded checks detect_bottlenecks used before the rule engine.
+    gpus = scenario["gpus"]
+    cfg_map = get_profile_map("rule_thresholds")
+    cfg = cfg_map.get(profile, cfg_map.get("default", {}))
+    low_th = int(cfg.get("low_util_threshold", 45))
+    low_frac = float(cfg.get("low_util_fraction", 0.25))
+    mig_util = int(cfg.get("mig_underused_util_threshold", 65))
+    mig_vram = float(cfg.get("mig_underused_vram_threshold_gb", 90))
+    train_req = int(cfg.get("requires_training_gpus", 4))
+
+    out = []
+    for g in gpus:
+        if g["numa_node"] != g["cpu_socket"]:
+            out.append(
+                (
+                    "numa_mismatch",
+                    f"GPU {g['id']} has NUMA mismatch (GPU NUMA {g['numa_node']} vs CPU socket {g['cpu_socket']}).",
+                    {"gpu_id": g["id"], "numa_node": g["numa_node"], "cpu_socket": g["cpu_socket"]},
+                )
+            )
+    low = [g for g in gpus if g["gpu_util"] < low_th]
+    if len(low) >= max(1, int(round(len(gpus) * low_frac))):
+        out.append(
+            (
+                "low_gpu_util",
+                f"{len(low)} GPU(s) show low utilization (<{low_th}%), indicating potential under-allocation.",
+                {"count": len(low), "threshold": low_th},
+            )
+        )
+    if any(w.kind == "inference" for w in workloads):
+        if any(g["gpu_util"] < mig_util and g["vram_used_gb"] < mig_vram for g in gpus):
+            out.append(
+                (
+                    "mig_opportunity",
+                    "Inference workloads are running on underused full GPUs; MIG partitioning can improve density.",
+                    {"gpu_util_threshold": mig_util, "vram_used_threshold_gb": mig_vram},
+                )
+            )
+    groups = defaultdict(list)
+    for g in gpus:
+        groups[g["nvlink_group"]].append(g["id"])
+    if len(groups) >= 2 and any(w.kind == "training" and w.gpu_demand >= train_req for w in workloads):
+        out.append(
+            (
+                "nvlink_spread_training",
+                "Multi-GPU training workload detected. Keeping GPUs within one NVLink group is recommended.",
+                None,
+            )
+        )
+    if not out:
+        out.append(("healthy", "No major bottlenecks detected from the provided sample telemetry.", None))
+    return out
+
+
+def _random_scenario(rng):
+    return {
+        "name": "random",
+        "total_vram_gb": 80,
+        "gpus": [
+            {
+                "id": i,
+                "gpu_util": rng.choice([rng.randint(0, 100), round(rng.uniform(0, 100), 2)]),
+                "vram_used_gb": round(rng.uniform(0, 120), 1),
+                "network_io_score": 0.7,
+                "numa_node": rng.randint(0, 1),
+                "cpu_socket": rng.randint(0, 1),
+                "nvlink_group": rng.choice("AB"),
+            }
+            for i in range(rng.randint(0, 16))
+        ],
+    }
+
+
+class RuleEngineTests(unittest.TestCase):
+    def tearDown(self):
+        compile_rules.cache_clear()
+
+    def assert_parity(self, scenario, workloads, profile):
+        actual = [(f.code, f.message, f.data) for f in detect_bottlenecks(scenario, workloads, profile=profile)]
+        self.assertEqual(actual, _legacy_findings(scenario, workloads, profile))
+
+    def test_builtin_rules_match_legacy_checks_on_presets(self):
+        for scenario in sample_scenarios().values():
+            for profile in ("default", "training", "inference"):
+                self.assert_parity(scenario, default_workloads(), profile)
+
+    def test_builtin_rules_match_legacy_checks_on_random_scenarios(self):
+        rng = random.Random(11)
+        for _ in range(300):
+            workloads = [
+                Workload(name=f"w{i}", kind=rng.choice(["training", "inference"]), gpu_demand=rng.randint(1, 8), vram_gb=10)
+                for i in range(rng.randint(0, 3))
+            ]
+            self.assert_parity(_random_scenario(rng), workloads, rng.choice(["default", "training", "inference"]))
+
+    def test_rules_are_compiled_once_per_profile(self):
+        compile_rules.cache_clear()
+        scenario = sample_scenarios()["H200 8-GPU Server"]
+        for _ in range(3):
+            detect_bottlenecks(scenario, default_workloads(), profile="training")
+        info = compile_rules.cache_info()
+        self.assertEqual(info.misses, 1)
+        self.assertEqual(info.hits, 2)
+
+    def test_site_specific_rule_with_shared_clauses(self):
+        specs = [
+            {
+                "code": "hot_gpu",
+                "category": "GPU_UTIL",
+                "severity": "low",
+                "scope": "gpu",
+                "params": {"hot": {"default": 90, "type": "int"}},
+                "when": [["gpu_util", ">=", "$hot"]],
+                "message": "GPU {id} is above {hot}% utilization.",
+                "data": {"gpu_id": "id"},
+            },
+            {
+                "code": "hot_and_full",
+                "category": "GPU_UTIL",
+                "severity": "medium",
+                "scope": "count",
+                "params": {"hot": {"default": 90, "type": "int"}},
+                "when": [["gpu_util", ">=", "$hot"], ["vram_used_gb", ">", "total_vram_gb"]],
+                "message": "{count} hot GPU(s) exceed capacity.",
+            },
+        ]
+        scenario = {
+            "name": "site",
+            "total_vram_gb": 24,
+            "gpus": [
+                {"id": 0, "gpu_util": 95, "vram_used_gb": 30, "numa_node": 0, "cpu_socket": 0, "nvlink_group": "A"},
+                {"id": 1, "gpu_util": 20, "vram_used_gb": 30, "numa_node": 0, "cpu_socket": 0, "nvlink_group": "A"},
+            ],
+        }
+        with patch("infralens.rule_engine.get_rule_specs", return_value=specs):
+            compile_rules.cache_clear()
+            ruleset = compile_rules("default")
+            findings = detect_bottlenecks(scenario, [], profile="default")
+
+        self.assertEqual(len(ruleset.clauses), 2)
+        self.assertEqual([f.code for f in findings], ["hot_gpu", "hot_and_full"])
+        self.assertEqual(findings[0].message, "GPU 0 is above 90% utilization.")
+        self.assertEqual(findings[0].data, {"gpu_id": 0})
+        self.assertEqual(findings[1].message, "1 hot GPU(s) exceed capacity.")
+
+    def test_invalid_rule_is_rejected_at_compile_time(self):
+        specs = [{"code": "bad", "scope": "gpu", "when": [["gpu_util", "~", 3]]}]
+        with patch("infralens.rule_engine.get_rule_specs", return_value=specs):
+            compile_rules.cache_clear()
+            with self.assertRaisesRegex(ValueError, "bad"):
+                compile_rules("default")
+
+    def test_per_rule_timing_counters(self):
+        reset_rule_timings()
+        scenario = sample_scenarios()["H200 8-GPU Server"]
+        detect_bottlenecks(scenario, default_workloads())
+        detect_bottlenecks(scenario, default_workloads())
+        timings = rule_timings()
+        self.assertEqual(set(timings), {"numa_mismatch", "low_gpu_util", "mig_opportunity", "nvlink_spread_training"})
+        for timing in timings.values():
+            self.assertEqual(timing.calls, 2)
+            self.assertGreaterEqual(timing.total_sec, 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
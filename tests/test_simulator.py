@@ -0,0 +1,120 @@
+import time
+import unittest
+
+from infralens.data import Workload
+from infralens.rules import build_placement_recommendation
+from infralens.simulator import Placement, PlacementSimulator, naive_placement
+
+
+def _host(links=None, mismatch=(), utils=None) -> dict:
+    # Eight GPUs; even ids share one NVLink island and odd ids the other, so a
+    # scheduler that takes the lowest ids spans the slow SYS links.
+    if links is None:
+        links = [["X" if i == j else ("NV12" if i % 2 == j % 2 else "SYS") for j in range(8)] for i in range(8)]
+    return {
+        "name": "host",
+        "total_vram_gb": 80,
+        "gpus": [
+            {
+                "id": i,
+                "gpu_util": (utils or [10.0] * 8)[i],
+                "vram_used_gb": 10.0,
+                "network_io_score": 0.8,
+                "numa_node": i % 2,
+                "cpu_socket": 1 - i % 2 if i in mismatch else i % 2,
+                "nvlink_group": "AB"[i % 2],
+            }
+            for i in range(8)
+        ],
+        "topology": {"gpu_ids": list(range(8)), "links": links, "numa": [i % 2 for i in range(8)]},
+    }
+
+
+TRAIN = Workload(name="train", kind="training", gpu_demand=4, vram_gb=160)
+INFER = [Workload(name=f"inf-{i}", kind="inference", gpu_demand=1, vram_gb=20) for i in range(2)]
+
+
+class PlacementSimulatorTests(unittest.TestCase):
+    def test_nvlink_set_outruns_sys_spanning_set(self):
+        sim = PlacementSimulator(_host(), [TRAIN])
+        fast = sim.evaluate({"train": Placement((0, 2, 4, 6))}).projections["train"]
+        slow = sim.evaluate({"train": Placement((0, 1, 2, 3))}).projections["train"]
+        self.assertGreater(fast.throughput, 3.0)
+        self.assertGreater(fast.throughput, 5 * slow.throughput)
+        self.assertLess(slow.compute_fraction, fast.compute_fraction)
+
+    def test_numa_mismatch_only_hurts_unpinned_jobs(self):
+        sim = PlacementSimulator(_host(mismatch=(0,)), [TRAIN])
+        pinned = sim.evaluate({"train": Placement((0, 2, 4, 6))}).training_throughput
+        loose = sim.evaluate({"train": Placement((0, 2, 4, 6), pinned=False)}).training_throughput
+        self.assertLess(loose, pinned)
+        odd = [sim.evaluate({"train": Placement((1, 3, 5, 7), pinned=p)}).training_throughput for p in (True, False)]
+        self.assertEqual(odd[0], odd[1])
+
+    def test_contention_and_mig_slices_shape_latency(self):
+        sim = PlacementSimulator(_host(utils=[80.0] + [0.0] * 7), INFER)
+        shared = sim.evaluate({"inf-0": Placement((1,)), "inf-1": Placement((1,))})
+        spread = sim.evaluate({"inf-0": Placement((1,)), "inf-1": Placement((2,))})
+        busy = sim.evaluate({"inf-0": Placement((0,)), "inf-1": Placement((2,))})
+        self.assertLess(spread.mean_latency, shared.mean_latency)
+        self.assertLess(spread.mean_latency, busy.mean_latency)
+        small = sim.evaluate({"inf-0": Placement((1,), mig_slices=1), "inf-1": Placement((1,), mig_slices=1)})
+        large = sim.evaluate({"inf-0": Placement((1,), mig_slices=4), "inf-1": Placement((1,), mig_slices=3)})
+        self.assertLess(large.mean_latency, small.mean_latency)
+        self.assertEqual(sim.evaluate({"inf-0": Placement((1,))}).unplaced, ["inf-1"])
+
+    def test_ranks_thousands_of_candidates_per_second(self):
+        workloads = [TRAIN, Workload(name="pair", kind="training", gpu_demand=2, vram_gb=60), *INFER]
+        sim = PlacementSimulator(_host(), workloads)
+        good = {"train": Placement((0, 2, 4, 6)), "pair": Placement((1, 3)), "inf-0": Placement((5,)), "inf-1": Placement((7,))}
+        bad = {"train": Placement((0, 1, 2, 3)), "pair": Placement((4, 5)), "inf-0": Placement((6,)), "inf-1": Placement((6,))}
+        partial = {"train": Placement((0, 2, 4, 6))}
+        candidates = [bad, partial, good] * 1000
+        t0 = time.perf_counter()
+        ranked = sim.rank(candidates)
+        self.assertLess(time.perf_counter() - t0, 1.5)
+        self.assertEqual(ranked[0][0] % 3, 2)
+        self.assertEqual(ranked[-1][0] % 3, 1)
+
+    def test_recommendation_reports_projected_gains(self):
+        scenario = _host()
+        workloads = [TRAIN, *INFER]
+        self.assertEqual(naive_placement(scenario, workloads)["train"].gpu_ids, (0, 1, 2, 3))
+        rec = build_placement_recommendation(scenario, workloads, current_score=60)
+        item = next(i for i in rec.items if i.code == "move_training_nvlink")
+        self.assertIn(item.data["target_gpus"], ([0, 2, 4, 6], [1, 3, 5, 7]))
+        self.assertGreater(rec.expected_training_gain_pct, 100)
+        self.assertEqual(item.data["projected_throughput_gain_pct"], rec.expected_training_gain_pct)
+        self.assertGreater(rec.expected_util_after, rec.expected_util_before)
+        self.assertLessEqual(rec.expected_util_after - rec.expected_util_before, 30)
+
+    def test_projections_compare_only_jobs_placed_on_both_sides(self):
+        # The first-fit baseline serves the inference job and cannot fit the
+        # pair; the recommendation does the opposite. Neither side's extra
+        # work may show up as a gain.
+        scenario = _host()
+        scenario["gpus"] = scenario["gpus"][:2]
+        del scenario["topology"]
+        workloads = [INFER[0], Workload(name="pair", kind="training", gpu_demand=2, vram_gb=100)]
+        self.assertEqual(list(naive_placement(scenario, workloads)), ["inf-0"])
+        rec = build_placement_recommendation(scenario, workloads, current_score=60)
+        self.assertEqual([i.code for i in rec.items], ["move_training_nvlink", "defer_unplaced"])
+        self.assertEqual(rec.expected_latency_drop_pct, 0)
+        self.assertEqual(rec.expected_training_gain_pct, 0)
+        self.assertEqual(rec.expected_util_after, rec.expected_util_before)
+        self.assertIsNone(rec.items[0].data["projected_throughput_gain_pct"])
+
+    def test_mig_upgrades_stop_at_the_job_sm_need(self):
+        scenario = {**_host(), "model": "H100-80GB"}
+        small = Workload(name="small", kind="inference", gpu_demand=1, vram_gb=10)
+        rec = build_placement_recommendation(scenario, [small], current_score=60)
+        self.assertEqual(rec.items[0].data["profile"], "1g.10gb")
+        # 20GB models want two of seven slices each: no instance outgrows that.
+        jobs = [Workload(name=f"mid-{i}", kind="inference", gpu_demand=1, vram_gb=20) for i in range(3)]
+        rec = build_placement_recommendation(scenario, jobs, current_score=60)
+        self.assertEqual(sorted(i.data["profile"] for i in rec.items), ["2g.20gb"] * 3)
+        self.assertEqual(PlacementSimulator(scenario, jobs).mig_slices_needed(jobs[0]), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import io
+import tempfile
+import unittest
+from pathlib import Path
+
+from infralens.parsers import iter_telemetry_chunks, parse_telemetry_stream, parse_uploaded_telemetry
+
+EXAMPLES = Path(__file__).resolve().parent.parent / "examples"
+BASE_KEYS = ["id", "gpu_util", "vram_used_gb", "network_io_score", "numa_node", "cpu_socket", "nvlink_group"]
+
+
+class StreamingParserTests(unittest.TestCase):
+    def _base(self, scenario: dict) -> dict:
+        base = {
+            "name": scenario["name"],
+            "total_vram_gb": scenario["total_vram_gb"],
+            "gpus": [{k: g[k] for k in BASE_KEYS} for g in scenario["gpus"]],
+        }
+        for key in ("topology", "node_cpus"):
+            if key in scenario:
+                base[key] = scenario[key]
+        return base
+
+    def test_snapshot_files_match_upload_parser(self):
+        for name in ("nvidia_smi_sample.csv", "nvidia_smi_sample_noheader.csv"):
+            path = EXAMPLES / name
+            expected = parse_uploaded_telemetry(name, path.read_bytes())
+            streamed = parse_telemetry_stream(path)
+            self.assertEqual(self._base(streamed), expected)
+            self.assertTrue(all(g["samples"] == 1 for g in streamed["gpus"]))
+
+    def test_explicit_zero_numa_node_is_kept(self):
+        path = EXAMPLES / "nvidia_smi_sample.csv"
+        scenario = parse_telemetry_stream(path)
+        self.assertEqual([(g["numa_node"], g["cpu_socket"]) for g in scenario["gpus"][:2]], [(0, 0), (0, 0)])
+
+    def test_topology_overrides_are_applied(self):
+        path = EXAMPLES / "nvidia_smi_sample_noheader.csv"
+        topo = (EXAMPLES / "nvidia_smi_topo_m_sample.txt").read_text()
+        numa = (EXAMPLES / "numactl_hardware_sample.txt").read_text()
+        expected = parse_uploaded_telemetry(path.name, path.read_bytes(), topo_text=topo, numactl_text=numa)
+        streamed = parse_telemetry_stream(path, topo_text=topo, numactl_text=numa)
+        self.assertEqual(self._base(streamed), expected)
+
+    def test_time_series_is_folded_per_gpu(self):
+        lines = ["timestamp, index, utilization.gpu [%], memory.used [MiB], memory.total [MiB]"]
+        for second in range(100):
+            lines.append(f"2024/01/01 00:00:{second % 60:02d}.000, 0, {second} %, {1024 * (second + 1)} MiB, 81920 MiB")
+            lines.append(f"2024/01/01 00:00:{second % 60:02d}.000, 1, 50 %, 2048 MiB, 81920 MiB")
+        lines.insert(101, lines[0])  # repeated header from a concatenated capture
+        raw = io.BytesIO("\n".join(lines).encode("utf-8"))
+
+        scenario = parse_telemetry_stream(raw, name="week", chunk_size=7)
+        self.assertEqual(scenario["total_vram_gb"], 80)
+        gpu0, gpu1 = scenario["gpus"]
+        self.assertEqual(gpu0["samples"], 100)
+        self.assertEqual(gpu0["gpu_util"], 49.5)
+        self.assertEqual(gpu0["gpu_util_p50"], 49.0)
+        self.assertEqual(gpu0["gpu_util_p95"], 94.0)
+        self.assertEqual(gpu0["vram_peak_gb"], 100.0)
+        self.assertEqual(gpu0["vram_used_gb"], 50.5)
+        self.assertEqual(gpu1["gpu_util_p95"], 50.0)
+        self.assertEqual([g["nvlink_group"] for g in scenario["gpus"]], ["A", "B"])
+        self.assertFalse(raw.closed)
+
+    def test_chunks_are_bounded(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "log.csv"
+            path.write_text("\n".join(f"{i % 8},{i % 100},1000,81920" for i in range(1000)))
+            sizes = [len(c) for c in iter_telemetry_chunks(path, chunk_size=64)]
+        self.assertTrue(all(s <= 64 for s in sizes))
+        self.assertEqual(sum(sizes), 1000)
+
+    def test_empty_stream_raises(self):
+        with self.assertRaises(ValueError):
+            parse_telemetry_stream(io.StringIO("\n\n"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+
+import numpy as np
+
+from infralens.data import Workload
+from infralens.rules import detect_bottlenecks
+from infralens.scoring import calculate_efficiency_score
+from infralens.timeseries import TelemetryStore, parse_timestamp, window_seconds
+
+
+def _filled_store(seconds: int = 7200) -> TelemetryStore:
+    store = TelemetryStore(capacity=16)
+    for t in range(seconds):
+        for gpu in range(4):
+            # GPU 3 is busy for the first hour and nearly idle afterwards.
+            util = 90.0 if gpu != 3 or t < 3600 else 10.0
+            store.append("node-a", gpu, float(t), util, 40.0 + gpu, vram_total_gb=80.0,
+                         numa_node=gpu // 2, cpu_socket=gpu // 2, nvlink_group="A")
+    return store
+
+
+class TelemetryStoreTests(unittest.TestCase):
+    def test_window_aggregates_follow_recent_samples(self):
+        store = _filled_store()
+        last_5m = store.window("node-a", "5m")
+        self.assertEqual(last_5m[3]["samples"], 300)
+        self.assertEqual(last_5m[3]["gpu_util"], 10.0)
+        full = store.window("node-a", "1h", end=3599.0)
+        self.assertEqual(full[3]["gpu_util"], 90.0)
+        self.assertEqual(full[1]["vram_peak_gb"], 41.0)
+
+    def test_windowed_scenario_feeds_scoring_and_rules(self):
+        store = _filled_store()
+        recent = store.to_scenario("node-a", "5m")
+        earlier = store.to_scenario("node-a", "1h", end=3599.0)
+        self.assertEqual(recent["total_vram_gb"], 80)
+        self.assertLess(
+            calculate_efficiency_score(recent).gpu_score,
+            calculate_efficiency_score(earlier).gpu_score,
+        )
+        workloads = [Workload(name="infer", kind="inference", gpu_demand=1, vram_gb=8)]
+        codes = {f.code for f in detect_bottlenecks(recent, workloads)}
+        self.assertIn("mig_opportunity", codes)
+
+    def test_rolling_mean_matches_naive_computation(self):
+        store = TelemetryStore()
+        rng = np.random.default_rng(3)
+        values = rng.uniform(0, 100, size=500)
+        for t, v in enumerate(values):
+            store.append("h", 0, float(t), float(v), 1.0)
+        rolled = store.rolling("h", 0, window=60)
+        naive = [values[max(0, i - 59) : i + 1].astype(np.float32).mean() for i in range(len(values))]
+        np.testing.assert_allclose(rolled["gpu_util"], naive, rtol=1e-5)
+        self.assertEqual(int(rolled["samples"][-1]), 60)
+
+    def test_downsample_reduces_storage(self):
+        store = _filled_store(seconds=3600)
+        small = store.downsample("1m")
+        self.assertEqual(len(small), 60 * 4)
+        self.assertLess(small.nbytes * 50, store.nbytes)
+        self.assertAlmostEqual(small.window("node-a", "1h")[0]["gpu_util"], 90.0)
+
+    def test_out_of_order_samples_and_rows_without_timestamps(self):
+        store = TelemetryStore()
+        store.append("h", 0, 10.0, 50.0, 1.0)
+        store.append("h", 0, 5.0, 10.0, 1.0)
+        self.assertEqual(store.window("h", 6, end=10.0)[0]["gpu_util"], 30.0)
+
+        rows = [{"index": "0", "utilization_gpu": "20"}, {"index": "1", "utilization_gpu": "40"}] * 3
+        other = TelemetryStore()
+        self.assertEqual(other.extend_rows(rows, host="x"), 6)
+        scenario = other.to_scenario("x", "1m")
+        self.assertEqual([g["samples"] for g in scenario["gpus"]], [3, 3])
+        self.assertEqual([g["nvlink_group"] for g in scenario["gpus"]], ["A", "B"])
+
+    def test_timestamp_and_window_parsing(self):
+        self.assertEqual(parse_timestamp("1970/01/01 00:01:00.500"), 60.5)
+        self.assertEqual(parse_timestamp("120"), 120.0)
+        self.assertIsNone(parse_timestamp("not a time"))
+        self.assertEqual(window_seconds("1h"), 3600.0)
+        self.assertEqual(window_seconds("30s"), 30.0)
+        with self.assertRaises(ValueError):
+            window_seconds("abc")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import json
+import unittest
+from pathlib import Path
+
+from infralens.data import Workload
+from infralens.parsers import parse_uploaded_telemetry
+from infralens.placement import solve_placement
+from infralens.topology import TopologyGraph, parse_topology_matrix
+
+EXAMPLES = Path(__file__).resolve().parent.parent / "examples"
+
+# Two NV12 pairs on one socket each, PCIe in between; tab-separated like the
+# real `nvidia-smi topo -m` output, including NIC columns and a legend.
+DGX_LIKE = (
+    "\tGPU0\tGPU1\tGPU2\tGPU3\tNIC0\tCPU Affinity\tNUMA Affinity\tGPU NUMA ID\n"
+    "GPU0\t X \tNV12\tPXB\tSYS\tPIX\t0-23\t0\t\tN/A\n"
+    "GPU1\tNV12\t X \tPXB\tSYS\tPIX\t0-23\t0\t\tN/A\n"
+    "GPU2\tPXB\tPXB\t X \tNV4\tSYS\t24-47\t1\t\tN/A\n"
+    "GPU3\tSYS\tSYS\tNV4\t X \tSYS\t24-47\t1\t\tN/A\n"
+    "NIC0\tPIX\tPIX\tSYS\tSYS\t X \n"
+    "\nLegend:\n\n  X    = Self\n  SYS  = Connection traversing PCIe as well as the SMP interconnect\n"
+)
+
+
+def _scenario(utils, groups, numas):
+    return {
+        "name": "host",
+        "total_vram_gb": 80,
+        "gpus": [
+            {
+                "id": i,
+                "gpu_util": u,
+                "vram_used_gb": 10.0,
+                "network_io_score": 0.8,
+                "numa_node": n,
+                "cpu_socket": n,
+                "nvlink_group": g,
+            }
+            for i, (u, g, n) in enumerate(zip(utils, groups, numas))
+        ],
+    }
+
+
+class TopologyGraphTests(unittest.TestCase):
+    def test_parses_full_link_matrix(self):
+        graph = parse_topology_matrix(DGX_LIKE)
+        self.assertEqual(graph.gpu_ids, (0, 1, 2, 3))
+        self.assertEqual(graph.links.dtype.name, "uint8")
+        self.assertEqual([graph.link(0, j) for j in range(4)], ["X", "NV12", "PXB", "SYS"])
+        self.assertEqual(graph.link(2, 3), "NV4")
+        self.assertEqual(graph.bandwidth_gbps(0, 1), 300.0)
+        self.assertEqual(graph.bandwidth_gbps(2, 3), 100.0)
+        self.assertLess(graph.bandwidth_gbps(0, 3), graph.bandwidth_gbps(0, 2))
+        self.assertEqual(graph.hops[0, 3], 6)
+        self.assertEqual(graph.gpus_on_numa(1), [2, 3])
+        self.assertEqual(graph.nvlink_components(), [[0, 1], [2, 3]])
+
+    def test_space_aligned_sample_and_non_matrix_inputs(self):
+        graph = parse_topology_matrix((EXAMPLES / "nvidia_smi_topo_m_sample.txt").read_text())
+        self.assertEqual(graph.nvlink_components(), [[0, 1], [2, 3]])
+        self.assertEqual(graph.numa.tolist(), [0, 0, 1, 1])
+        self.assertIsNone(parse_topology_matrix((EXAMPLES / "nvidia_smi_topo_m_sample.json").read_text()))
+        self.assertIsNone(parse_topology_matrix(""))
+
+    def test_dict_round_trip_is_json_safe(self):
+        graph = parse_topology_matrix(DGX_LIKE)
+        payload = json.loads(json.dumps(graph.to_dict()))
+        again = TopologyGraph.from_dict(payload)
+        self.assertEqual(again.gpu_ids, graph.gpu_ids)
+        self.assertEqual(again.links.tolist(), graph.links.tolist())
+        self.assertEqual(again.bandwidth.tolist(), graph.bandwidth.tolist())
+
+    def test_best_clique_prefers_aggregate_bandwidth(self):
+        graph = parse_topology_matrix(DGX_LIKE)
+        self.assertEqual(graph.best_clique(2), (0, 1))
+        self.assertEqual(graph.best_clique(2, candidates=[1, 2, 3]), (2, 3))
+        self.assertEqual(graph.best_clique(3), (0, 1, 2))
+        self.assertEqual(graph.best_clique(5), ())
+
+    def test_label_fallback_matches_group_model(self):
+        scenario = _scenario([10] * 4, ["A", "A", "B", "B"], [0, 0, 1, 1])
+        graph = TopologyGraph.for_scenario(scenario)
+        self.assertEqual(graph.nvlink_components(), [[0, 1], [2, 3]])
+        self.assertEqual(graph.span_cost([0, 1]), 0.0)
+        self.assertAlmostEqual(graph.span_cost([0, 2]), 1.0 - 8.0 / 25.0, places=6)
+
+    def test_upload_carries_topology_into_scenario(self):
+        raw = (EXAMPLES / "nvidia_smi_sample.csv").read_bytes()
+        topo = (EXAMPLES / "nvidia_smi_topo_m_sample.txt").read_text()
+        scenario = parse_uploaded_telemetry("x.csv", raw, topo_text=topo)
+        self.assertEqual(scenario["topology"]["links"][0][1], "NV12")
+        self.assertNotIn("topology", parse_uploaded_telemetry("x.csv", raw))
+
+    def test_placement_uses_real_link_costs(self):
+        # Labels put all four GPUs in one group; only the matrix shows that
+        # 0-1 talk over a host bridge while 2-3 share NVLink.
+        scenario = _scenario([10, 10, 30, 30], ["A"] * 4, [0, 0, 1, 1])
+        job = [Workload(name="t", kind="training", gpu_demand=2, vram_gb=40)]
+        self.assertEqual(solve_placement(scenario, job).assignments[0].gpu_ids, [0, 1])
+        links = [["X", "PHB", "SYS", "SYS"], ["PHB", "X", "SYS", "SYS"], ["SYS", "SYS", "X", "NV12"], ["SYS", "SYS", "NV12", "X"]]
+        scenario["topology"] = {"gpu_ids": [0, 1, 2, 3], "links": links, "numa": [0, 0, 1, 1]}
+        self.assertEqual(solve_placement(scenario, job).assignments[0].gpu_ids, [2, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from infralens import tracing
+from infralens.data import sample_scenarios, workloads_for_scenario
+from infralens.llm import _invoke_model
+from infralens.parsers import parse_uploaded_telemetry
+from infralens.rules import build_placement_recommendation, detect_bottlenecks
+from infralens.scoring import calculate_efficiency_score
+from infralens.tracing import disable_tracing, enable_tracing, reset_trace, span, trace_breakdown, traced
+
+
+class TracingTests(unittest.TestCase):
+    def setUp(self):
+        disable_tracing()
+        reset_trace()
+
+    def tearDown(self):
+        disable_tracing()
+        reset_trace()
+
+    def test_disabled_spans_are_shared_noops(self):
+        self.assertIs(span("a"), span("b", host="x"))
+        with span("a") as s:
+            s.set(k=1)
+        self.assertEqual(trace_breakdown(), [])
+
+    def test_nested_spans_track_parent_and_self_time(self):
+        enable_tracing()
+
+        @traced("outer")
+        def outer():
+            with span("inner"):
+                pass
+            return 7
+
+        self.assertEqual(outer(), 7)
+        self.assertEqual(outer.__name__, "outer")
+        rows = {r["stage"]: r for r in trace_breakdown()}
+        self.assertEqual(rows["outer"]["calls"], 1)
+        self.assertEqual(rows["inner"]["calls"], 1)
+        self.assertLessEqual(rows["outer"]["self_sec"], rows["outer"]["total_sec"])
+
+    def test_errors_are_counted_and_reraised(self):
+        enable_tracing()
+        with self.assertRaises(RuntimeError):
+            with span("boom"):
+                raise RuntimeError("x")
+        self.assertEqual(trace_breakdown()[0]["errors"], 1)
+
+    def test_jsonl_export(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "trace" / "spans.jsonl"
+            enable_tracing(path)
+            with span("outer", host="h1"):
+                with span("inner"):
+                    pass
+            disable_tracing()
+            spans = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+        self.assertEqual([s["name"] for s in spans], ["inner", "outer"])
+        self.assertEqual(spans[0]["parent_id"], spans[1]["span_id"])
+        self.assertIsNone(spans[1]["parent_id"])
+        self.assertEqual(spans[1]["attrs"], {"host": "h1"})
+
+    @patch("infralens.llm._get_client")
+    def test_hot_paths_are_instrumented(self, mock_client):
+        mock_client.return_value.GenerativeModel.return_value.generate_content.return_value.text = "ok"
+        enable_tracing()
+        name, scenario = next(iter(sample_scenarios().items()))
+        workloads = workloads_for_scenario(name)
+        score = calculate_efficiency_score(scenario)
+        detect_bottlenecks(scenario, workloads)
+        build_placement_recommendation(scenario, workloads, score.score)
+        parse_uploaded_telemetry("x.csv", b"index,utilization.gpu,memory.used,memory.total\n0,50,1000,81920\n")
+        _invoke_model("gemini", "k", "m", "prompt")
+        stages = {r["stage"] for r in trace_breakdown()}
+        self.assertTrue({"score", "rules", "placement", "parse", "llm"} <= stages)
+
+    def test_env_configuration(self):
+        with patch.dict("os.environ", {tracing.TRACE_ENV: "off"}):
+            tracing.configure_from_env()
+            self.assertFalse(tracing.tracing_enabled())
+        with patch.dict("os.environ", {tracing.TRACE_ENV: "on"}):
+            tracing.configure_from_env()
+            self.assertTrue(tracing.tracing_enabled())
+
+
+if __name__ == "__main__":
+    unittest.main()